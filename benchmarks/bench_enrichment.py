@@ -0,0 +1,107 @@
+"""Load test for the enrichment lookups against the local OMDb/TMDb stand-in.
+
+Starts benchmarks/fake_enrichment_apis.py in-process (or uses one already running,
+with --omdb-url / --tmdb-url), points sync_enrichment at it with the response
+cache off, and runs full-tier lookups for a batch of synthetic titles through
+the same ordered_map / token-bucket path sync_enrichment uses, once per worker
+count. No database is touched and no API quota is spent.
+
+Usage (from repo root):
+    python benchmarks/bench_enrichment.py
+    python benchmarks/bench_enrichment.py --movies 400 --workers 1 8 32 --latency-ms 120 --error-rate 0.02
+    python benchmarks/bench_enrichment.py --rate-limit 40 --tmdb-rate 50   # exercise 429 handling
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault('OMDB_API_KEY', 'bench')
+os.environ.setdefault('TMDB_API_KEY', 'bench')
+
+from benchmarks.fake_enrichment_apis import FakeEnrichmentAPIs  # noqa: E402
+from src.database import http_client  # noqa: E402
+from src.database import sync_enrichment as se  # noqa: E402
+from src.database.crawl_report import REPORT  # noqa: E402
+from src.database.enrichment_engine import TokenBucket, ordered_map  # noqa: E402
+
+
+def candidates(n: int) -> list[se._Candidate]:
+    return [se._Candidate(id=i, title=f'Bench Film {i}', lookup=f'Bench Film {i}',
+                          year=str(1960 + i % 60))
+            for i in range(n)]
+
+
+def run(n_movies: int, workers: int, omdb_rate: float, tmdb_rate: float) -> dict:
+    se._LIMITERS['omdb'] = TokenBucket(omdb_rate)
+    se._LIMITERS['tmdb'] = TokenBucket(tmdb_rate)
+    http_client.reset_metrics()
+    REPORT.reset()
+    hits = errors = 0
+    start = time.perf_counter()
+    for _, result in ordered_map(se._lookup, candidates(n_movies), workers=workers):
+        if isinstance(result, BaseException):
+            errors += 1
+        elif result.fields:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    hosts = http_client.host_metrics()
+    return {
+        'elapsed': elapsed,
+        'hits': hits,
+        'errors': errors,
+        'requests': sum(m['requests'] for m in hosts.values()),
+        'retries': sum(m['retries'] for m in hosts.values()),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Load-test enrichment lookups against a local OMDb/TMDb stand-in')
+    p.add_argument('--movies', type=int, default=200)
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32])
+    p.add_argument('--latency-ms', type=float, default=50.0)
+    p.add_argument('--jitter-ms', type=float, default=20.0)
+    p.add_argument('--error-rate', type=float, default=0.0)
+    p.add_argument('--miss-rate', type=float, default=0.05)
+    p.add_argument('--rate-limit', type=float, default=None, metavar='PER_S',
+                   help='Stand-in answers 429 above this many requests/s per API')
+    p.add_argument('--omdb-rate', type=float, default=0, help='Client OMDb token bucket (default: 0 = off)')
+    p.add_argument('--tmdb-rate', type=float, default=0, help='Client TMDb token bucket (default: 0 = off)')
+    p.add_argument('--omdb-url', default=None, help='Use a stand-in already running at this OMDb URL')
+    p.add_argument('--tmdb-url', default=None, help='... and this TMDb URL')
+    args = p.parse_args(argv)
+
+    server = None
+    if args.omdb_url and args.tmdb_url:
+        se.OMDB_BASE_URL, se.TMDB_BASE_URL = args.omdb_url, args.tmdb_url.rstrip('/')
+    else:
+        server = FakeEnrichmentAPIs(
+            latency_s=args.latency_ms / 1000, jitter_s=args.jitter_ms / 1000,
+            error_rate=args.error_rate, miss_rate=args.miss_rate,
+            rate_limit_per_s=args.rate_limit, seed=0,
+        ).start()
+        se.OMDB_BASE_URL, se.TMDB_BASE_URL = server.omdb_url, server.tmdb_url
+    se._HTTP_CACHE.mode = 'off'
+
+    print(f"{'workers':>7} {'movies':>6} {'s':>7} {'movies/s':>9} {'req':>6} {'retries':>7} "
+          f"{'hits':>5} {'errors':>6}")
+    try:
+        for workers in args.workers:
+            r = run(args.movies, workers, args.omdb_rate, args.tmdb_rate)
+            print(f"{workers:>7} {args.movies:>6} {r['elapsed']:>7.2f} {args.movies / r['elapsed']:>9.1f} "
+                  f"{r['requests']:>6} {r['retries']:>7} {r['hits']:>5} {r['errors']:>6}")
+    finally:
+        if server is not None:
+            server.stop()
+            print(f'stand-in: {dict(server.stats)}')
+
+
+if __name__ == '__main__':
+    main()
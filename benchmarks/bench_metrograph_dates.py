@@ -0,0 +1,121 @@
+"""Scaling benchmark for Metrograph showtime date parsing.
+
+Builds synthetic calendars of growing size (benchmarks/spider_pages.py) and times:
+
+  - the date/time stage alone, on the calendar's (date_text, day_number, time)
+    labels: the old eight-format strptime cascade against
+    scrapers.showtime_dates.parse_showtime (memo cleared before each run);
+  - MetrographSpider.parse end to end.
+
+Per-showtime cost should stay flat as the calendar grows, i.e. total time is linear.
+
+Usage (from repo root):
+    python benchmarks/bench_metrograph_dates.py
+    python benchmarks/bench_metrograph_dates.py --films 10 100 1000 --shows 28
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scrapy.http import HtmlResponse  # noqa: E402
+
+from benchmarks import spider_pages  # noqa: E402
+from scrapers.showtime_dates import _parse_parts, parse_showtime  # noqa: E402
+from scrapers.spiders.metrograph_spider import MetrographSpider  # noqa: E402
+
+_LEGACY_FORMATS = [
+    "%b %d %I:%M%p", "%B %d %I:%M%p", "%a %b %d %I:%M%p", "%A %B %d %I:%M%p",
+    "%b %d %I:%M %p", "%B %d %I:%M %p", "%a %b %d %I:%M %p", "%A %B %d %I:%M %p",
+]
+
+
+def legacy_parse(date_text, day_number, time_text):
+    """The strptime cascade MetrographSpider.parse used before showtime_dates."""
+    parts = date_text.split()
+    month_part = parts[1] if len(parts) > 1 else parts[0]
+    if day_number:
+        candidates = [f"{month_part} {day_number} {time_text}",
+                      f"{parts[0]} {month_part} {day_number} {time_text}"]
+    else:
+        candidates = [f"{date_text} {time_text}"]
+    parsed = None
+    for cand in candidates:
+        for fmt in _LEGACY_FORMATS:
+            try:
+                parsed = datetime.strptime(cand, fmt)
+                break
+            except Exception:
+                continue
+        if parsed:
+            break
+    if not parsed:
+        return None
+    today = datetime.today()
+    year = today.year + 1 if parsed.month < today.month else today.year
+    return parsed.replace(year=year)
+
+
+def calendar_labels(response) -> list[tuple[str, str, str]]:
+    labels = []
+    for block in response.css('div.showtimes'):
+        for heading, day_div in zip(block.css('h5.sr-only, h6'), block.css('div.film_day')):
+            labels.append((
+                heading.xpath('normalize-space(text())').get(),
+                heading.css('span.day-number::text').get(),
+                day_div.css('a').xpath('normalize-space(text())').get(),
+            ))
+    return labels
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Benchmark Metrograph date parsing at scale')
+    p.add_argument('--films', type=int, nargs='+', default=[10, 50, 250, 1000])
+    p.add_argument('--shows', type=int, default=14, help='Showtimes per film (default: 14)')
+    p.add_argument('--repeat', type=int, default=3)
+    args = p.parse_args(argv)
+
+    print(f"{'films':>6} {'shows':>7} {'legacy us/show':>15} {'regex us/show':>14} "
+          f"{'speedup':>8} {'parse() ms':>11} {'parse() us/show':>16}")
+    for n_films in args.films:
+        body = spider_pages.metrograph_listing(n_films, args.shows)
+        response = HtmlResponse(url='https://metrograph.com/film/', body=body, encoding='utf-8')
+        labels = calendar_labels(response)
+        today = date.today()
+
+        def run_regex():
+            _parse_parts.cache_clear()
+            for d, n, t in labels:
+                parse_showtime(d, n, t, today)
+
+        def run_legacy():
+            for d, n, t in labels:
+                legacy_parse(d, n, t)
+
+        legacy = _best_of(run_legacy, args.repeat)
+        regex = _best_of(run_regex, args.repeat)
+        spider = MetrographSpider()
+        full = _best_of(lambda: list(spider.parse(response)), args.repeat)
+        n = len(labels)
+        print(f"{n_films:>6} {n:>7} {legacy / n * 1e6:>15.2f} {regex / n * 1e6:>14.2f} "
+              f"{legacy / regex:>7.1f}x {full * 1000:>11.1f} {full / n * 1e6:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
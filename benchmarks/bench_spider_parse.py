@@ -0,0 +1,173 @@
+"""Parse-throughput benchmarks for every spider callback.
+
+Runs each callback offline against synthetic pages at increasing sizes and, when
+given a recordings directory (see scrapers/recording.py), against every recorded
+response as-is and enlarged by ``--scale`` factors. No network, no DB.
+
+Usage (from repo root):
+    python benchmarks/bench_spider_parse.py                              # synthetic pages
+    python benchmarks/bench_spider_parse.py --recordings data/recordings # + recorded pages
+    python benchmarks/bench_spider_parse.py --only metrograph.parse --scale 1 4 16
+    python benchmarks/bench_spider_parse.py --json bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scrapy.http import HtmlResponse, Request, TextResponse  # noqa: E402
+
+from benchmarks import spider_pages  # noqa: E402
+from scrapers.recording import build_response, iter_recordings  # noqa: E402
+from scrapers.spiders.angelika_spider import AngelikaSpider  # noqa: E402
+from scrapers.spiders.film_forum_spider import FilmForumSpider  # noqa: E402
+from scrapers.spiders.ifc_center_spider import IFCCenterSpider  # noqa: E402
+from scrapers.spiders.metrograph_spider import MetrographSpider  # noqa: E402
+
+SPIDERS = {
+    'film_forum': FilmForumSpider,
+    'ifc_center': IFCCenterSpider,
+    'metrograph': MetrographSpider,
+    'angelika': AngelikaSpider,
+}
+
+
+def _detail_meta(spider_name: str, n_shows: int) -> dict:
+    """Listing-page meta a detail callback expects, with n_shows showtimes."""
+    dt = datetime.datetime.combine(datetime.date.today(), datetime.time(19, 30))
+    if spider_name == 'film_forum':
+        return {'showtimes': [(datetime.date.today(), '7:30')] * n_shows}
+    showtimes = [{'show_time': dt, 'ticket_link': 'https://t/1'}] * n_shows
+    if spider_name == 'ifc_center':
+        return {'items': showtimes, 'title': 'Stalker', 'slug': 'stalker'}
+    return {'showtimes': showtimes, 'title': 'Stalker', 'image_url': None, 'director1': 'A',
+            'director2': None, 'year': '1979', 'runtime': 161, 'format': '35MM'}
+
+
+_ANGELIKA_META = {'cinema': 'ANGELIKA NEW YORK', 'cinema_slug': 'nyc'}
+
+# (spider, callback) -> (page builder taking a scale, meta builder taking a scale)
+SYNTHETIC: dict[tuple[str, str], tuple[Callable[[int], str], Callable[[int], dict]]] = {
+    ('film_forum', 'parse'): (lambda n: spider_pages.film_forum_listing(n), lambda n: {}),
+    ('film_forum', 'parse_film'): (lambda n: spider_pages.film_forum_detail(),
+                                   lambda n: _detail_meta('film_forum', n)),
+    ('ifc_center', 'parse'): (lambda n: spider_pages.ifc_listing(n), lambda n: {}),
+    ('ifc_center', 'parse_film'): (lambda n: spider_pages.ifc_detail(),
+                                   lambda n: _detail_meta('ifc_center', n)),
+    ('metrograph', 'parse'): (lambda n: spider_pages.metrograph_listing(n), lambda n: {}),
+    ('metrograph', 'parse_film'): (lambda n: spider_pages.metrograph_detail(),
+                                   lambda n: _detail_meta('metrograph', n)),
+    ('angelika', 'parse'): (lambda n: spider_pages.angelika_films(n), lambda n: dict(_ANGELIKA_META)),
+}
+
+
+def _response(url: str, body: str | bytes, meta: dict, json_body: bool = False):
+    request = Request(url, meta=meta)
+    cls = TextResponse if json_body else HtmlResponse
+    return cls(url=url, body=body, encoding='utf-8', request=request)
+
+
+def time_callback(spider_name: str, callback: str, response, min_time_s: float = 0.5) -> dict:
+    """Run one callback repeatedly on one response; report ms/page and outputs/s."""
+    spider = SPIDERS[spider_name]()
+    fn = getattr(spider, callback)
+    outputs = len(list(fn(response)))  # warm-up, and the per-page output count
+    runs = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time_s or runs < 3:
+        for _ in fn(response):
+            pass
+        runs += 1
+        elapsed = time.perf_counter() - start
+    per_page = elapsed / runs
+    return {
+        'case': f'{spider_name}.{callback}',
+        'page_bytes': len(response.body),
+        'outputs': outputs,
+        'runs': runs,
+        'ms_per_page': round(per_page * 1000, 3),
+        'outputs_per_s': round(outputs / per_page, 1) if per_page else 0.0,
+    }
+
+
+def synthetic_cases(scales: list[int], only: set[str] | None):
+    for (spider_name, callback), (page, meta) in SYNTHETIC.items():
+        case = f'{spider_name}.{callback}'
+        if only and case not in only:
+            continue
+        for scale in scales:
+            body = page(scale * 10)
+            response = _response(f'https://bench.invalid/{spider_name}', body, meta(scale * 10),
+                                 json_body=spider_name == 'angelika')
+            yield 'synthetic', scale * 10, spider_name, callback, response
+
+
+def recorded_cases(root: Path, scales: list[int], only: set[str] | None):
+    for spider_name in SPIDERS:
+        for record in iter_recordings(root, spider_name):
+            callback = record['callback']
+            case = f'{spider_name}.{callback}'
+            if (only and case not in only) or not hasattr(SPIDERS[spider_name], callback):
+                continue
+            for scale in scales:
+                meta = dict(record['meta'])
+                if callback == 'parse_film':
+                    meta.update(_detail_meta(spider_name, 3 * scale))
+                    body = record['body']
+                elif callback == 'parse':
+                    body = spider_pages.enlarge(spider_name, record['body'], scale)
+                else:
+                    body = record['body']
+                grown = {**record, 'body': body}
+                response = build_response(grown, request=Request(record['request_url'], meta=meta))
+                yield 'recorded', scale, spider_name, callback, response
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description='Benchmark spider parse callbacks offline')
+    p.add_argument('--recordings', type=Path, default=None,
+                   help='Directory written by --record; benchmarks every recorded response')
+    p.add_argument('--scale', type=int, nargs='+', default=[1, 4, 16],
+                   help='Enlargement factors (synthetic pages use 10x this many films)')
+    p.add_argument('--only', nargs='+', default=None, metavar='SPIDER.CALLBACK',
+                   help='Restrict to these cases, e.g. metrograph.parse')
+    p.add_argument('--min-time', type=float, default=0.5,
+                   help='Minimum seconds to spend timing each case (default: 0.5)')
+    p.add_argument('--json', type=Path, default=None, help='Also write results as JSON')
+    return p
+
+
+def main(argv=None) -> list[dict]:
+    args = _build_parser().parse_args(argv)
+    only = set(args.only) if args.only else None
+
+    cases = list(synthetic_cases(args.scale, only))
+    if args.recordings:
+        cases += list(recorded_cases(args.recordings, args.scale, only))
+
+    results = []
+    print(f"{'case':<24} {'source':<10} {'scale':>6} {'KiB':>8} {'outputs':>8} {'ms/page':>10} {'outputs/s':>11}")
+    for source, scale, spider_name, callback, response in cases:
+        r = time_callback(spider_name, callback, response, args.min_time)
+        r.update(source=source, scale=scale)
+        results.append(r)
+        print(f"{r['case']:<24} {source:<10} {scale:>6} {r['page_bytes'] / 1024:>8.1f} "
+              f"{r['outputs']:>8} {r['ms_per_page']:>10.3f} {r['outputs_per_s']:>11.1f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Micro-benchmark for src/database/title_normalization.py.
+
+Times producing every normalized form (whitespace, display, API lookup, matching)
+for a stream of scraped titles in which each distinct title recurs, as it does
+across a crawl, enrichment, dedup and backfill:
+
+  - legacy: the uncached helpers as _prepare_item and dedup called them before
+    normalize_title (NFKC and all three suffix regexes on every call);
+  - cold:   normalize_title with its memos cleared first (so every distinct
+    title is a miss once);
+  - warm:   normalize_title with the memos already filled.
+
+Usage (from repo root):
+    python benchmarks/bench_title_normalization.py
+    python benchmarks/bench_title_normalization.py --distinct 50 500 5000 --repeat-titles 40
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.database.title_normalization import (  # noqa: E402
+    _BRACKET_SUFFIX, _FORMAT_SUFFIX, _METROGRAPH_PRECEDED_BY_RE, _METROGRAPH_SELECTS_RE,
+    _PAREN_SUFFIX, _PRESENTS_PREFIX_RE, clear_normalization_caches, normalize_title,
+)
+
+_WORDS = ('night', 'river', 'LA', 'JETÉE', 'house', 'of', 'the', 'CROOKLYN', 'Vertigo',
+          'storm', 'blue', 'Ran', 'summer', 'in', 'Tokyo', 'WALL', 'story')
+_PREFIXES = ('', '', '', 'Metrograph presents: ', "Spike Lee's ", 'Criterion selects ')
+_SUFFIXES = ('', '', '', ' [35mm]', ' (Open Captioning)', ' in 70mm', ' preceded by Meshes')
+_CINEMAS = ('METROGRAPH', 'FILM FORUM', 'IFC CENTER', 'ANGELIKA NEW YORK')
+
+
+def legacy_forms(raw: str, cinema: str) -> tuple[str, str, str, str]:
+    """Every form, computed the pre-memo way. The Film Forum all-caps run
+    extraction is left out, so legacy timings are if anything flattering."""
+    def ws(t):
+        return ' '.join(unicodedata.normalize('NFKC', t).split())
+
+    def strip(t):
+        t = ws((t or '').strip())
+        t = _PAREN_SUFFIX.sub('', t).strip()
+        t = _BRACKET_SUFFIX.sub('', t).strip()
+        return _FORMAT_SUFFIX.sub('', t).strip()
+
+    title = ws(raw)
+    display = strip(title)
+    t = _PRESENTS_PREFIX_RE.sub('', strip(display)).strip()
+    if 'METROGRAPH' in cinema.upper():
+        t = _METROGRAPH_SELECTS_RE.sub('', t).strip()
+        t = _METROGRAPH_PRECEDED_BY_RE.sub('', t).strip()
+    if 'FILM FORUM' in cinema.upper():
+        t = t.replace('’', "'").replace('‘', "'")
+    return title, display, t, strip(raw).lower()
+
+
+def title_stream(n_distinct: int, repeats: int, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    distinct = [
+        (rng.choice(_PREFIXES) + ' '.join(rng.choices(_WORDS, k=rng.randint(1, 4)))
+         + rng.choice(_SUFFIXES) + ('\xa0' if rng.random() < 0.1 else ''), rng.choice(_CINEMAS))
+        for _ in range(n_distinct)
+    ]
+    stream = distinct * repeats
+    rng.shuffle(stream)
+    return stream
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Benchmark title normalization and its memo')
+    p.add_argument('--distinct', type=int, nargs='+', default=[50, 500, 5000],
+                   help='Distinct titles per stream')
+    p.add_argument('--repeat-titles', type=int, default=20,
+                   help='Times each distinct title recurs in the stream (default: 20)')
+    p.add_argument('--repeat', type=int, default=5)
+    args = p.parse_args(argv)
+
+    print(f"{'distinct':>8} {'calls':>7} {'legacy us':>10} {'cold us':>8} {'warm us':>8} "
+          f"{'cold x':>7} {'warm x':>7}")
+    for n in args.distinct:
+        stream = title_stream(n, args.repeat_titles)
+
+        def run_legacy():
+            for raw, cinema in stream:
+                legacy_forms(raw, cinema)
+
+        def run_cold():
+            clear_normalization_caches()
+            for raw, cinema in stream:
+                normalize_title(raw, cinema)
+
+        def run_warm():
+            for raw, cinema in stream:
+                normalize_title(raw, cinema)
+
+        legacy = _best_of(run_legacy, args.repeat)
+        cold = _best_of(run_cold, args.repeat)
+        warm = _best_of(run_warm, args.repeat)
+        calls = len(stream)
+        print(f"{n:>8} {calls:>7} {legacy / calls * 1e6:>10.2f} {cold / calls * 1e6:>8.2f} "
+              f"{warm / calls * 1e6:>8.2f} {legacy / cold:>6.1f}x {legacy / warm:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""Local stand-in for the OMDb and TMDb endpoints sync_enrichment calls, for load tests.
+
+One port serves the subset of both APIs that the ``_call_*`` helpers use:
+
+  GET /omdb/?t=TITLE[&y=YEAR]                          OMDb title search
+  GET /omdb/?i=IMDB_ID                                 OMDb id lookup (ratings tier)
+  GET /tmdb/3/find/IMDB_ID?external_source=imdb_id     TMDb /find
+  GET /tmdb/3/search/movie?query=TITLE[&year=YEAR]     TMDb /search/movie
+  GET /tmdb/3/movie/ID[?append_to_response=videos,translations]
+
+Answers are derived from a hash of the title, so a title always maps to the same
+IMDb / TMDb ids across runs, and ``miss_rate`` of titles are unknown to both APIs.
+Every response can be slowed (``latency_s`` plus up to ``jitter_s``), failed with
+a 503 (``error_rate``), or refused with 429 and ``Retry-After`` once an API gets
+more than ``rate_limit_per_s`` requests in a second.
+
+Point the enrichment sync at it with
+
+    python benchmarks/fake_enrichment_apis.py --port 8765 --latency-ms 80 --error-rate 0.01
+    OMDB_BASE_URL=http://127.0.0.1:8765/omdb/ TMDB_BASE_URL=http://127.0.0.1:8765/tmdb/3 \\
+    OMDB_API_KEY=x TMDB_API_KEY=x \\
+        python src/database/sync_enrichment.py --apply --cache-mode off
+
+or time the lookups alone, without a database, with benchmarks/bench_enrichment.py.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_GENRES = ('Drama', 'Comedy', 'Documentary', 'Horror', 'Romance', 'Thriller', 'Animation')
+_ID_SPACE = 9_000_000
+
+
+def _title_id(title: str, year: str | None = None) -> int:
+    key = f"{' '.join(title.casefold().split())}|{year or ''}"
+    return 1_000_000 + int(hashlib.sha1(key.encode('utf-8')).hexdigest()[:12], 16) % _ID_SPACE
+
+
+def _imdb_id(movie_id: int) -> str:
+    return f'tt{movie_id:07d}'
+
+
+def _omdb_body(movie_id: int, title: str, year: str | None) -> dict:
+    rng = random.Random(movie_id)
+    return {
+        'Title': title,
+        'Year': year or str(1950 + movie_id % 75),
+        'imdbID': _imdb_id(movie_id),
+        'imdbRating': f'{rng.uniform(3, 9.5):.1f}',
+        'imdbVotes': f'{rng.randint(50, 2_000_000):,}',
+        'Metascore': str(rng.randint(20, 99)),
+        'Ratings': [{'Source': 'Rotten Tomatoes', 'Value': f'{rng.randint(5, 100)}%'}],
+        'Response': 'True',
+    }
+
+
+def _tmdb_details(movie_id: int, append: set[str]) -> dict:
+    rng = random.Random(movie_id)
+    body = {
+        'id': movie_id,
+        'imdb_id': _imdb_id(movie_id),
+        'original_title': f'Film {movie_id}',
+        'genres': [{'id': i, 'name': g} for i, g in enumerate(rng.sample(_GENRES, 2))],
+        'origin_country': ['US'],
+        'original_language': 'en',
+        'spoken_languages': [{'iso_639_1': 'en'}],
+        'tagline': 'A tagline.',
+        'overview': 'An overview. ' * 20,
+        'runtime': rng.randint(70, 180),
+        'belongs_to_collection': None,
+        'poster_path': f'/{movie_id}.jpg',
+        'release_date': f'{1950 + movie_id % 75}-{1 + movie_id % 12:02d}-{1 + movie_id % 28:02d}',
+    }
+    if 'videos' in append:
+        body['videos'] = {'results': [
+            {'site': 'YouTube', 'type': 'Trailer', 'official': True, 'key': f'yt{movie_id}'},
+        ]}
+    if 'translations' in append:
+        body['translations'] = {'translations': [
+            {'iso_639_1': 'zh', 'iso_3166_1': 'CN', 'data': {'title': f'电影 {movie_id}'}},
+        ]}
+    return body
+
+
+class FakeEnrichmentAPIs:
+    """A threaded HTTP server impersonating OMDb and TMDb; usable as a context manager.
+
+    ``stats`` counts requests per endpoint and the 429s, injected errors and
+    misses served.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_s: float = 0.0,
+                 jitter_s: float = 0.0, error_rate: float = 0.0, miss_rate: float = 0.0,
+                 rate_limit_per_s: float | None = None, retry_after_s: int = 1,
+                 seed: int | None = None):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.error_rate = error_rate
+        self.miss_rate = miss_rate
+        self.rate_limit_per_s = rate_limit_per_s
+        self.retry_after_s = retry_after_s
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows: dict[str, tuple[int, int]] = {}   # api -> (second, requests in it)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def omdb_url(self) -> str:
+        return f'{self.url}/omdb/'
+
+    @property
+    def tmdb_url(self) -> str:
+        return f'{self.url}/tmdb/3'
+
+    def start(self) -> FakeEnrichmentAPIs:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> FakeEnrichmentAPIs:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── behaviour ────────────────────────────────────────────────────────────
+
+    def _is_miss(self, movie_id: int) -> bool:
+        return (movie_id % 10_000) < self.miss_rate * 10_000
+
+    def _over_limit(self, api: str) -> bool:
+        if not self.rate_limit_per_s:
+            return False
+        second = int(time.monotonic())
+        with self._lock:
+            start, count = self._windows.get(api, (second, 0))
+            if start != second:
+                start, count = second, 0
+            self._windows[api] = (start, count + 1)
+            return count + 1 > self.rate_limit_per_s
+
+    def _roll(self) -> tuple[float, bool]:
+        with self._lock:
+            return self._rng.uniform(0, self.jitter_s), self._rng.random() < self.error_rate
+
+    def respond(self, path: str, query: dict[str, str]) -> tuple[int, dict, dict]:
+        """(status, headers, body) for one request; sleeps for the configured latency."""
+        api = path.split('/')[1] if path.count('/') > 1 else ''
+        jitter, fail = self._roll()
+        if self.latency_s or jitter:
+            time.sleep(self.latency_s + jitter)
+        if self._over_limit(api):
+            self.stats['429'] += 1
+            return 429, {'Retry-After': str(self.retry_after_s)}, {'status_message': 'Too many requests'}
+        if fail:
+            self.stats['errors'] += 1
+            return 503, {}, {'status_message': 'Injected failure'}
+
+        if api == 'omdb':
+            return self._omdb(query)
+        if path.startswith('/tmdb/3/'):
+            return self._tmdb(path[len('/tmdb/3'):], query)
+        return 404, {}, {'status_message': 'Not found'}
+
+    def _omdb(self, query: dict[str, str]) -> tuple[int, dict, dict]:
+        if 'i' in query:
+            self.stats['omdb_by_id'] += 1
+            movie_id = int(query['i'][2:]) if re.fullmatch(r'tt\d+', query['i']) else 0
+            title = f'Film {movie_id}'
+        else:
+            self.stats['omdb'] += 1
+            title = query.get('t', '')
+            movie_id = _title_id(title, query.get('y'))
+        if not movie_id or self._is_miss(movie_id):
+            self.stats['misses'] += 1
+            return 200, {}, {'Response': 'False', 'Error': 'Movie not found!'}
+        return 200, {}, _omdb_body(movie_id, title, query.get('y'))
+
+    def _tmdb(self, path: str, query: dict[str, str]) -> tuple[int, dict, dict]:
+        if m := re.fullmatch(r'/find/tt(\d+)', path):
+            self.stats['tmdb_find'] += 1
+            movie_id = int(m.group(1))
+            results = [] if self._is_miss(movie_id) else [{'id': movie_id}]
+            return 200, {}, {'movie_results': results}
+        if path == '/search/movie':
+            self.stats['tmdb_search'] += 1
+            movie_id = _title_id(query.get('query', ''), query.get('year'))
+            results = [] if self._is_miss(movie_id) else [{'id': movie_id}]
+            return 200, {}, {'results': results, 'total_results': len(results)}
+        if m := re.fullmatch(r'/movie/(\d+)', path):
+            self.stats['tmdb_details'] += 1
+            movie_id = int(m.group(1))
+            if self._is_miss(movie_id):
+                return 404, {}, {'status_message': 'The resource you requested could not be found.'}
+            append = set(filter(None, query.get('append_to_response', '').split(',')))
+            return 200, {}, _tmdb_details(movie_id, append)
+        return 404, {}, {'status_message': 'Not found'}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate sends; with Nagle on, a keep-alive
+            # client's delayed ACK stalls each response ~40 ms, swamping latency_s.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                status, headers, body = server.respond(parts.path, query)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Serve a local stand-in for the OMDb and TMDb APIs')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--latency-ms', type=float, default=50.0, help='Base delay per response (default: 50)')
+    p.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random delay, up to this much')
+    p.add_argument('--error-rate', type=float, default=0.0, help='Fraction of responses that are 503s')
+    p.add_argument('--miss-rate', type=float, default=0.05,
+                   help='Fraction of titles neither API knows (default: 0.05)')
+    p.add_argument('--rate-limit', type=float, default=None, metavar='PER_S',
+                   help='Requests per second per API before answering 429 (default: unlimited)')
+    p.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with a 429')
+    p.add_argument('--seed', type=int, default=None)
+    args = p.parse_args(argv)
+
+    server = FakeEnrichmentAPIs(
+        host=args.host, port=args.port, latency_s=args.latency_ms / 1000,
+        jitter_s=args.jitter_ms / 1000, error_rate=args.error_rate, miss_rate=args.miss_rate,
+        rate_limit_per_s=args.rate_limit, retry_after_s=args.retry_after, seed=args.seed,
+    )
+    print(f'OMDB_BASE_URL={server.omdb_url}')
+    print(f'TMDB_BASE_URL={server.tmdb_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(dict(server.stats), sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
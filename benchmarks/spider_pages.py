@@ -0,0 +1,180 @@
+"""Synthetic spider pages, and enlargement of recorded ones, for the parse benchmarks.
+
+Each builder returns a page shaped like the live site as the spider's selectors
+see it, with ``n_films`` films and ``n_shows`` showtimes per film, so a benchmark
+can grow a page without recordings. ``enlarge()`` does the same to a recording
+from scrapers/recording.py by cloning its film blocks (or Angelika's film list).
+"""
+from __future__ import annotations
+
+import copy
+import datetime
+import json
+
+from lxml import html as lxml_html
+
+_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December']
+_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# XPath of the repeated per-film block on each listing page.
+FILM_BLOCK_XPATH = {
+    'film_forum': '//div[starts-with(@id, "tabs-")]/p',
+    'ifc_center': '//div[contains(@class, "daily-schedule")]/ul/li',
+    'metrograph': '//div[contains(@class, "homepage-in-theater-movie")]',
+}
+
+
+def _day(i: int) -> datetime.date:
+    return datetime.date.today() + datetime.timedelta(days=i % 7)
+
+
+def film_forum_listing(n_films: int, n_shows: int = 3) -> str:
+    panels = []
+    for tab in range(7):
+        films = ''.join(
+            f'<p><strong><a href="https://filmforum.org/film/film-{f}">FILM {f}</a></strong><br/>'
+            + ' '.join(f'<span>{1 + s % 9}:{(s * 15) % 60:02d}</span>' for s in range(n_shows))
+            + '</p>'
+            for f in range(n_films)
+        )
+        panels.append(f'<div id="tabs-{tab}">{films}</div>')
+    tabs = ''.join(f'<li class="{d.lower()}"><a href="#tabs-{i}">{d}</a></li>'
+                   for i, d in enumerate(_DAYS))
+    return (f'<html><body><ul aria-label="This week\'s showtimes at Film Forum">{tabs}</ul>'
+            f'{"".join(panels)}</body></html>')
+
+
+def film_forum_detail(n_paragraphs: int = 3) -> str:
+    paras = ''.join(f'<p>Synopsis paragraph {i} about the film and its makers.</p>'
+                    for i in range(n_paragraphs))
+    return f"""<html><body>
+      <h2 class="main-title">Days and Nights in the Forest</h2>
+      <div class="urgent"><p>NEW 4K RESTORATION!</p></div>
+      <div class="copy">
+        <p><strong>India, 1970<br/>Directed by Satyajit Ray<br/>Approx. 116 min.</strong></p>
+        {paras}
+        <h3>Reviews</h3><p>"A masterpiece." - Critic</p>
+      </div>
+      <ul class="slides"><li><img src="/poster.jpg"/></li></ul>
+      <a class="button medium blue" href="https://my.filmforum.org/events/x">Buy</a>
+    </body></html>"""
+
+
+def ifc_listing(n_films: int, n_shows: int = 3) -> str:
+    days = []
+    for d in range(7):
+        day = _day(d)
+        films = ''.join(
+            f'<li><div class="details"><h3><a href="https://www.ifccenter.com/films/film-{f}/">'
+            f'Film {f}</a></h3></div><ul class="times">'
+            + ''.join(f'<li><a href="https://tix.ifccenter.com/{f}/{s}">{1 + s % 11}:{(s * 5) % 60:02d} pm</a></li>'
+                      for s in range(n_shows))
+            + '</ul></li>'
+            for f in range(n_films)
+        )
+        days.append(f'<div class="daily-schedule"><h3>{day.strftime("%a %b %d")}</h3><ul>{films}</ul></div>')
+    return f'<html><body>{"".join(days)}</body></html>'
+
+
+def ifc_detail(n_paragraphs: int = 3) -> str:
+    paras = ''.join(f'<p>Synopsis paragraph {i}.</p>' for i in range(n_paragraphs))
+    return f"""<html><body>
+      <h1 class="title">Stalker</h1>
+      <p class="date-time">Sat Apr 25</p>
+      <ul class="schedule-list"><li>7:00 pm</li></ul>
+      {paras}
+      <ul class="film-details">
+        <li><strong>Director</strong> Andrei Tarkovsky</li>
+        <li><strong>Year</strong> 1979</li>
+        <li><strong>Running Time</strong> 161 minutes</li>
+        <li><strong>Format</strong> 35mm</li>
+      </ul>
+      <img class="film-featured wp-post-image" src="/stalker.jpg"/>
+    </body></html>"""
+
+
+def metrograph_listing(n_films: int, n_shows: int = 6) -> str:
+    today = datetime.date.today()
+    blocks = []
+    for f in range(n_films):
+        shows = []
+        for s in range(n_shows):
+            day = today + datetime.timedelta(days=s % 28)
+            label = f'{_DAYS[day.weekday()]} {_MONTHS[day.month - 1]}'
+            link = (f'<a title="Buy Tickets" href="https://t.metrograph.com/{f}/{s}">'
+                    if s % 4 else '<a title="Sold Out">')
+            shows.append(
+                f'<h5 class="sr-only">{label} <span class="day-number">{day.day}</span></h5>'
+                f'<div class="film_day">{link}{1 + s % 11}:{(s * 15) % 60:02d}pm</a></div>'
+            )
+        blocks.append(
+            f'<div class="col-sm-12 homepage-in-theater-movie">'
+            f'<h3 class="movie_title"><a href="/film/?vista_film_id={f}">Film {f}</a></h3>'
+            f'<img src="https://metrograph.com/{f}.jpg"/>'
+            f'<h5>Director: Director {f}</h5><h5>1979 / 161min / 35mm</h5>'
+            f'<div class="showtimes">{"".join(shows)}</div></div>'
+        )
+    return f'<html><body>{"".join(blocks)}</body></html>'
+
+
+def metrograph_detail(n_paragraphs: int = 3) -> str:
+    paras = ''.join(f'<p>Synopsis paragraph {i}.</p>' for i in range(n_paragraphs))
+    return f'<html><body><div class="movie-info"><h1>Stalker</h1>{paras}</div></body></html>'
+
+
+def angelika_films(n_films: int, n_shows: int = 6) -> str:
+    start = datetime.datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    films = []
+    for f in range(n_films):
+        times = [
+            {'date_time': (start + datetime.timedelta(hours=3 * s)).strftime('%Y-%m-%dT%H:%M:%S-04'),
+             'soldout': s % 5 == 0}
+            for s in range(n_shows)
+        ]
+        films.append({
+            'name': f'Film {f} (1979)',
+            'director': 'Andrei Tarkovsky, Someone Else',
+            'length': '161',
+            'synopsis': '<p>A guide leads two men through <em>the Zone</em>.</p>',
+            'moviePoster': f'film-{f}',
+            'movieSlug': f'film-{f}',
+            'youtube_id': 'abc',
+            'showdates': [{'showtypes': [
+                {'type': 'Standard', 'showtimes': times[::2]},
+                {'type': '35mm', 'showtimes': times[1::2]},
+            ]}],
+        })
+    return json.dumps({'nowShowing': {'data': {'movies': films}}})
+
+
+def enlarge(spider_name: str, body: bytes, factor: int) -> bytes:
+    """Clone every film block in a recorded listing page `factor` times."""
+    if factor <= 1:
+        return body
+    if spider_name == 'angelika':
+        data = json.loads(body)
+        movies = data['nowShowing']['data']['movies'] if isinstance(data, dict) else data
+        grown = []
+        for i in range(factor):
+            for m in movies:
+                clone = copy.deepcopy(m)
+                clone['name'] = f"{clone.get('name', '')} #{i}"
+                grown.append(clone)
+        if isinstance(data, dict):
+            data['nowShowing']['data']['movies'] = grown
+        else:
+            data = grown
+        return json.dumps(data).encode()
+
+    xpath = FILM_BLOCK_XPATH.get(spider_name)
+    if xpath is None:
+        return body
+    tree = lxml_html.fromstring(body)
+    for block in tree.xpath(xpath):
+        parent = block.getparent()
+        idx = parent.index(block)
+        for _ in range(factor - 1):
+            idx += 1
+            parent.insert(idx, copy.deepcopy(block))
+    return lxml_html.tostring(tree)
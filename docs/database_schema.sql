@@ -3212,6 +3212,63 @@ CREATE TABLE auth.webauthn_credentials (
 );
 
 
+--
+-- Name: crawl_runs; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.crawl_runs (
+    id bigint NOT NULL,
+    started_at timestamp with time zone NOT NULL,
+    finished_at timestamp with time zone NOT NULL,
+    mode text NOT NULL,
+    wall_time_s numeric,
+    report jsonb NOT NULL
+);
+
+
+--
+-- Name: crawl_runs_id_seq; Type: SEQUENCE; Schema: public; Owner: -
+--
+
+ALTER TABLE public.crawl_runs ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (
+    SEQUENCE NAME public.crawl_runs_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+
+--
+-- Name: enrichment_misses; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.enrichment_misses (
+    movie_id integer NOT NULL,
+    lookup_title text NOT NULL,
+    lookups jsonb NOT NULL,
+    attempts integer NOT NULL,
+    first_attempt_at timestamp with time zone NOT NULL,
+    last_attempt_at timestamp with time zone NOT NULL,
+    retry_after timestamp with time zone NOT NULL
+);
+
+
+--
+-- Name: film_detail_cache; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.film_detail_cache (
+    url text NOT NULL,
+    cinema text NOT NULL,
+    metadata jsonb NOT NULL,
+    fetched_at timestamp with time zone NOT NULL,
+    etag text,
+    last_modified text
+);
+
+
 --
 -- Name: movies; Type: TABLE; Schema: public; Owner: -
 --
@@ -3251,7 +3308,9 @@ CREATE TABLE public.movies (
     tmdb_trailer_url text,
     tmdb_title_zh text,
     enriched_at timestamp without time zone,
-    scraped_title_normalized text
+    scraped_title_normalized text,
+    ratings_refreshed_at timestamp without time zone,
+    metadata_refreshed_at timestamp without time zone
 );
 
 
@@ -3391,6 +3450,33 @@ CREATE SEQUENCE public.showtimes_id_seq
 ALTER SEQUENCE public.showtimes_id_seq OWNED BY public.showtimes.id;
 
 
+--
+-- Name: showtimes_archive; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.showtimes_archive (
+    id bigint NOT NULL,
+    crawled_at timestamp without time zone NOT NULL,
+    title character varying(255) NOT NULL,
+    show_time timestamp without time zone NOT NULL,
+    show_day character varying(20) NOT NULL,
+    ticket_link text,
+    director1 character varying(255),
+    director2 character varying(255),
+    year integer,
+    runtime integer,
+    format character varying(50) NOT NULL,
+    synopsis text,
+    cinema text NOT NULL,
+    movie_id integer,
+    image_url text,
+    details_link text,
+    special_attributes text,
+    trailer_url text,
+    swept_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
 --
 -- Name: messages; Type: TABLE; Schema: realtime; Owner: -
 --
@@ -3888,6 +3974,30 @@ ALTER TABLE ONLY auth.webauthn_credentials
     ADD CONSTRAINT webauthn_credentials_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: crawl_runs crawl_runs_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.crawl_runs
+    ADD CONSTRAINT crawl_runs_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: enrichment_misses enrichment_misses_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.enrichment_misses
+    ADD CONSTRAINT enrichment_misses_pkey PRIMARY KEY (movie_id);
+
+
+--
+-- Name: film_detail_cache film_detail_cache_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.film_detail_cache
+    ADD CONSTRAINT film_detail_cache_pkey PRIMARY KEY (url);
+
+
 --
 -- Name: movies movies_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -3920,6 +4030,14 @@ ALTER TABLE ONLY public.showtimes
     ADD CONSTRAINT showtimes_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: showtimes_archive showtimes_archive_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.showtimes_archive
+    ADD CONSTRAINT showtimes_archive_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: showtimes uq_showtimes_movie_time_cinema_format; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -4424,6 +4542,13 @@ CREATE UNIQUE INDEX webauthn_credentials_credential_id_key ON auth.webauthn_cred
 CREATE INDEX webauthn_credentials_user_id_idx ON auth.webauthn_credentials USING btree (user_id);
 
 
+--
+-- Name: idx_crawl_runs_started_at; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_crawl_runs_started_at ON public.crawl_runs USING btree (started_at DESC);
+
+
 --
 -- Name: idx_recommendation_logs_api_name; Type: INDEX; Schema: public; Owner: -
 --
@@ -4438,6 +4563,13 @@ CREATE INDEX idx_recommendation_logs_api_name ON public.recommendation_logs USIN
 CREATE INDEX idx_recommendation_logs_queried_at ON public.recommendation_logs USING btree (queried_at DESC);
 
 
+--
+-- Name: idx_showtimes_cinema_show_time_crawled_at; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_showtimes_cinema_show_time_crawled_at ON public.showtimes USING btree (cinema, show_time, crawled_at);
+
+
 --
 -- Name: idx_showtimes_movie_id; Type: INDEX; Schema: public; Owner: -
 --
@@ -4708,6 +4840,14 @@ ALTER TABLE ONLY auth.webauthn_credentials
     ADD CONSTRAINT webauthn_credentials_user_id_fkey FOREIGN KEY (user_id) REFERENCES auth.users(id) ON DELETE CASCADE;
 
 
+--
+-- Name: enrichment_misses enrichment_misses_movie_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.enrichment_misses
+    ADD CONSTRAINT enrichment_misses_movie_id_fkey FOREIGN KEY (movie_id) REFERENCES public.movies(id) ON DELETE CASCADE;
+
+
 --
 -- Name: showtimes fkey_showtimes_movie_id; Type: FK CONSTRAINT; Schema: public; Owner: -
 --
@@ -0,0 +1,200 @@
+"""Resumable crawls: one job directory per run, picked up again after a crash.
+
+    python scrapers/run_spider_and_embed.py --job-dir data/jobs
+
+With a job root, run_spider() resumes the newest unfinished run under it, or
+starts a new one, laid out as
+
+    <root>/<run_id>/manifest.json       run start time, per-spider status, written cinemas
+    <root>/<run_id>/<spider>/           Scrapy JOBDIR: pending request queue, dupefilter, spider state
+    <root>/<run_id>/<spider>.written    idempotency markers: item hash and movie id per committed film
+
+Scrapy's JOBDIR persists the scheduler queue and the seen-request fingerprints,
+so a restarted spider continues with the requests it had not yet made, and
+detail pages already fetched are not requested again. Spiders that finished in
+an earlier attempt are not rerun.
+
+CinemaScraperPipeline (via its crawl_job attribute) takes the run's original
+start time from the manifest, skips items whose marker is already recorded, and
+leaves sweeping to sweep_completed(): a cinema is swept, once, only after every
+spider declaring it has closed with reason 'finished', against the first
+attempt's start time, so rows written before a crash are not mistaken for stale.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psycopg2
+
+from src.database.crawl_report import REPORT
+
+LOGGER = logging.getLogger(__name__)
+
+
+def item_marker(item) -> str:
+    """Content hash of a FilmItem; an identical item in the same run is a replay."""
+    payload = repr((
+        item.cinema, item.title, item.year, item.details_link, item.image_url,
+        item.director1, item.director2, item.runtime, item.synopsis, item.trailer_url,
+        [tuple(s) for s in item.showtimes],
+    ))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class CrawlJob:
+
+    def __init__(self, path: Path, manifest: dict):
+        self.path = path
+        self.manifest = manifest
+        self._lock = threading.Lock()
+
+    @property
+    def run_id(self) -> str:
+        return self.manifest['run_id']
+
+    @property
+    def started_at(self) -> datetime:
+        return datetime.fromisoformat(self.manifest['started_at'])
+
+    @classmethod
+    def start_or_resume(cls, root: Path, spiders: dict[str, list[str]]) -> CrawlJob:
+        """Resume the newest unfinished run under root, else start a new one.
+
+        `spiders` maps each spider name to the cinemas it declares.
+        """
+        root = Path(root)
+        for manifest_path in sorted(root.glob('*/manifest.json'), reverse=True):
+            manifest = json.loads(manifest_path.read_text())
+            if manifest.get('completed_at') is None:
+                job = cls(manifest_path.parent, manifest)
+                for name, cinemas in spiders.items():
+                    job.manifest['spiders'].setdefault(name, _spider_entry(cinemas))
+                job._save()
+                LOGGER.info("Resuming crawl job %s (started %s)", job.run_id, job.started_at)
+                return job
+
+        started_at = datetime.now(timezone.utc)
+        run_id = started_at.strftime('%Y%m%d_%H%M%S_%f')
+        job = cls(root / run_id, {
+            'run_id': run_id,
+            'started_at': started_at.isoformat(),
+            'completed_at': None,
+            'spiders': {name: _spider_entry(cinemas) for name, cinemas in spiders.items()},
+        })
+        job.path.mkdir(parents=True, exist_ok=True)
+        job._save()
+        LOGGER.info("Started crawl job %s", run_id)
+        return job
+
+    def _save(self) -> None:
+        tmp = self.path / 'manifest.json.tmp'
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(tmp, self.path / 'manifest.json')
+
+    # -- spiders ---------------------------------------------------------------
+
+    def pending_spiders(self) -> list[str]:
+        return [name for name, s in self.manifest['spiders'].items() if s['status'] != 'finished']
+
+    def jobdir(self, spider_name: str) -> str:
+        return str(self.path / spider_name)
+
+    def spider_closed(self, spider_name: str, reason: str) -> None:
+        with self._lock:
+            entry = self.manifest['spiders'][spider_name]
+            entry['status'] = 'finished' if reason == 'finished' else 'interrupted'
+            entry['reason'] = reason
+            self._save()
+
+    def record_written(self, spider_name: str, cinemas: set[str]) -> None:
+        with self._lock:
+            entry = self.manifest['spiders'][spider_name]
+            entry['written_cinemas'] = sorted(set(entry['written_cinemas']) | cinemas)
+            self._save()
+
+    def sweepable_cinemas(self) -> set[str]:
+        """Written cinemas whose every declaring spider has finished and that are not yet swept."""
+        spiders = self.manifest['spiders'].values()
+        blocked = {
+            c for s in spiders if s['status'] != 'finished'
+            for c in (*s['cinemas'], *s['written_cinemas'])
+        }
+        written = {c for s in spiders for c in s['written_cinemas']}
+        swept = set(self.manifest.get('swept_cinemas', ()))
+        # TEST_MODE prefixes the cinema names written to the DB.
+        return {c for c in written - swept if c.removeprefix('TEST_') not in blocked and c not in blocked}
+
+    def mark_swept(self, cinemas: set[str]) -> None:
+        with self._lock:
+            self.manifest['swept_cinemas'] = sorted(set(self.manifest.get('swept_cinemas', ())) | cinemas)
+            self._save()
+
+    def finish_if_complete(self) -> bool:
+        """Mark the run complete and drop the Scrapy state once every spider
+        finished and every written cinema was swept."""
+        if self.pending_spiders() or self.sweepable_cinemas():
+            return False
+        with self._lock:
+            self.manifest['completed_at'] = datetime.now(timezone.utc).isoformat()
+            self._save()
+        for name in self.manifest['spiders']:
+            shutil.rmtree(self.path / name, ignore_errors=True)
+        LOGGER.info("Crawl job %s complete", self.run_id)
+        return True
+
+    # -- idempotency markers --------------------------------------------------------
+
+    def load_markers(self, spider_name: str) -> dict[str, int]:
+        """Marker -> movie id of every item this spider committed earlier in the run."""
+        path = self.path / f'{spider_name}.written'
+        if not path.exists():
+            return {}
+        markers = {}
+        for line in path.read_text().splitlines():
+            parts = line.split()
+            if len(parts) == 2:  # a torn last line from a crash is ignored
+                markers[parts[0]] = int(parts[1])
+        return markers
+
+    def add_marker(self, spider_name: str, marker: str, movie_id: int) -> None:
+        with open(self.path / f'{spider_name}.written', 'a') as f:
+            f.write(f'{marker} {movie_id}\n')
+
+
+def _spider_entry(cinemas: list[str]) -> dict:
+    return {'status': 'pending', 'reason': None, 'cinemas': list(cinemas), 'written_cinemas': []}
+
+
+def sweep_completed(job: CrawlJob, engine, mode: str = 'delete') -> dict[str, int]:
+    """Sweep every cinema whose spiders have all finished, once per run."""
+    from scrapers.pipelines import sweep_stale_showtimes
+
+    cinemas = job.sweepable_cinemas()
+    if not cinemas:
+        return {}
+    conn = engine.raw_connection()
+    cur = conn.cursor()
+    try:
+        counts = sweep_stale_showtimes(cur, cinemas, job.started_at, mode)
+        conn.commit()
+    except psycopg2.Error as e:
+        # Left unswept in the manifest, so the next resume of this run retries.
+        LOGGER.error("Sweep failed for %s: %s", sorted(cinemas), e)
+        conn.rollback()
+        return {}
+    finally:
+        cur.close()
+        conn.close()
+    job.mark_swept(cinemas)
+    verb = 'Archived' if mode == 'archive' else 'Swept'
+    for cinema, n in sorted(counts.items()):
+        LOGGER.info("%s %d stale future showtime(s) for %r", verb, n, cinema)
+    REPORT.incr('pipeline.swept', sum(counts.values()))
+    return counts
@@ -0,0 +1,253 @@
+"""Persistent film-detail page cache shared across crawls.
+
+Film Forum, IFC Center and Metrograph follow one detail page per film from their
+listing page, and most films stay on the schedule for weeks. Each detail URL's
+parsed metadata is kept in the ``film_detail_cache`` table together with the time
+it was last fetched and the response's HTTP validators (ETag / Last-Modified).
+
+On the next crawl a spider either:
+  - skips the fetch entirely while the entry is younger than
+    DETAIL_CACHE_FRESHNESS_DAYS, building items straight from the stored metadata;
+  - or revalidates with If-None-Match / If-Modified-Since, reusing the stored
+    metadata on a 304 Not Modified.
+
+The cache is disabled unless DETAIL_CACHE_ENABLED is set (the --dry-run settings
+and the unit tests leave it off), so a bare spider never touches the DB.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import psycopg2
+import scrapy
+from psycopg2.extras import execute_values
+from scrapy import signals
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.database.setup_db import get_engine
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FRESHNESS_DAYS = 14
+
+
+@dataclass
+class DetailEntry:
+    url: str
+    cinema: str
+    metadata: dict
+    fetched_at: datetime
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, freshness: timedelta, now: datetime | None = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        return now - self.fetched_at < freshness
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class DetailCache:
+    """In-memory view of film_detail_cache for one spider run.
+
+    Entries for the spider's cinemas are loaded once on open; new and revalidated
+    entries are buffered and written back in one upsert on close.
+    """
+
+    def __init__(self, freshness_days: float = DEFAULT_FRESHNESS_DAYS):
+        self.freshness = timedelta(days=freshness_days)
+        self.entries: dict[str, DetailEntry] = {}
+        self._dirty: set[str] = set()
+
+    @classmethod
+    def from_settings(cls, settings, max_freshness_days: float | None = None) -> 'DetailCache':
+        days = settings.getfloat('DETAIL_CACHE_FRESHNESS_DAYS', DEFAULT_FRESHNESS_DAYS)
+        if max_freshness_days is not None:
+            days = min(days, max_freshness_days)
+        return cls(freshness_days=days)
+
+    def get(self, url: str) -> DetailEntry | None:
+        return self.entries.get(url)
+
+    def fresh(self, url: str) -> DetailEntry | None:
+        """Return the entry for url if it may be used without any request."""
+        entry = self.entries.get(url)
+        if entry is not None and entry.is_fresh(self.freshness):
+            return entry
+        return None
+
+    def put(self, url: str, cinema: str, metadata: dict,
+            etag: str | None = None, last_modified: str | None = None) -> None:
+        self.entries[url] = DetailEntry(
+            url=url,
+            cinema=cinema,
+            metadata=metadata,
+            fetched_at=datetime.now(timezone.utc),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._dirty.add(url)
+
+    def touch(self, url: str) -> None:
+        """Mark a 304-revalidated entry as fetched now, keeping its metadata."""
+        entry = self.entries.get(url)
+        if entry is not None:
+            entry.fetched_at = datetime.now(timezone.utc)
+            self._dirty.add(url)
+
+    def load(self, cinemas: list[str]) -> None:
+        conn = get_engine().raw_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT url, cinema, metadata, fetched_at, etag, last_modified
+                FROM film_detail_cache
+                WHERE cinema = ANY(%s)
+            """, (list(cinemas),))
+            for url, cinema, metadata, fetched_at, etag, last_modified in cur.fetchall():
+                if isinstance(metadata, str):
+                    metadata = json.loads(metadata)
+                self.entries[url] = DetailEntry(
+                    url, cinema, metadata, fetched_at, etag, last_modified,
+                )
+            cur.close()
+        finally:
+            conn.close()
+
+    def flush(self) -> int:
+        """Upsert every new or revalidated entry. Returns the number written."""
+        rows = [
+            (e.url, e.cinema, json.dumps(e.metadata, default=str),
+             e.fetched_at, e.etag, e.last_modified)
+            for url in sorted(self._dirty)
+            if (e := self.entries.get(url)) is not None
+        ]
+        if not rows:
+            return 0
+        conn = get_engine().raw_connection()
+        try:
+            cur = conn.cursor()
+            execute_values(cur, """
+                INSERT INTO film_detail_cache
+                    (url, cinema, metadata, fetched_at, etag, last_modified)
+                VALUES %s
+                ON CONFLICT (url) DO UPDATE SET
+                    cinema        = EXCLUDED.cinema,
+                    metadata      = EXCLUDED.metadata,
+                    fetched_at    = EXCLUDED.fetched_at,
+                    etag          = EXCLUDED.etag,
+                    last_modified = EXCLUDED.last_modified
+            """, rows)
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+        self._dirty.clear()
+        return len(rows)
+
+
+class DetailCacheMixin:
+    """Spider mixin that routes detail-page fetches through a DetailCache.
+
+    A spider using it implements two hooks and sends every detail page through
+    ``follow_detail()`` with ``parse_film`` as the callback:
+
+      - ``_film_metadata(response) -> dict | None``: everything parse_film reads
+        from the detail page, as JSON-serializable values (None = unusable page);
+      - ``_film_items(metadata, meta)``: yields the spider's items from that
+        metadata plus the listing-page ``meta`` carried on the request.
+
+    A spider whose detail metadata goes stale faster than the rest (Film Forum's
+    ticket link) caps its freshness window with ``detail_cache_max_freshness_days``.
+    """
+
+    detail_cache: DetailCache | None = None
+    detail_cache_max_freshness_days: float | None = None
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        if crawler.settings.getbool('DETAIL_CACHE_ENABLED'):
+            spider.detail_cache = DetailCache.from_settings(
+                crawler.settings, spider.detail_cache_max_freshness_days)
+            crawler.signals.connect(spider._open_detail_cache, signal=signals.spider_opened)
+            crawler.signals.connect(spider._close_detail_cache, signal=signals.spider_closed)
+        return spider
+
+    def _open_detail_cache(self, spider):
+        try:
+            self.detail_cache.load(self.cinemas)
+            self.logger.info(f"Detail cache: loaded {len(self.detail_cache.entries)} entries")
+        except (psycopg2.Error, SQLAlchemyError) as e:
+            # A cold cache only costs a full fetch of every detail page.
+            self.logger.error(f"Detail cache load failed, fetching all detail pages: {e}")
+
+    def _close_detail_cache(self, spider):
+        try:
+            written = self.detail_cache.flush()
+            self.logger.info(f"Detail cache: wrote {written} entries")
+        except (psycopg2.Error, SQLAlchemyError) as e:
+            self.logger.error(f"Detail cache flush failed: {e}")
+
+    def _stat(self, key: str) -> None:
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None:
+            crawler.stats.inc_value(f'detail_cache/{key}', spider=self)
+
+    def follow_detail(self, url: str, meta: dict):
+        """Yield a detail Request for url, or its items straight from a fresh entry."""
+        cache = self.detail_cache
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None and cache.fresh(url) is not None:
+            self._stat('fresh')
+            yield from self._film_items(entry.metadata, meta)
+            return
+
+        meta = {**meta, 'detail_url': url}
+        headers = {}
+        if entry is not None:
+            headers = entry.conditional_headers()
+            meta['handle_httpstatus_list'] = [304]
+        yield scrapy.Request(url, callback=self.parse_film, headers=headers, meta=meta)
+
+    def parse_film(self, response):
+        url = response.meta.get('detail_url', response.url)
+        cache = self.detail_cache
+
+        if response.status == 304:
+            entry = cache.get(url) if cache is not None else None
+            if entry is None:
+                self.logger.warning(f"304 for {url} with no cached entry")
+                return
+            self._stat('revalidated')
+            cache.touch(url)
+            metadata = entry.metadata
+        else:
+            metadata = self._film_metadata(response)
+            if metadata is None:
+                return
+            if cache is not None:
+                self._stat('stored')
+                cache.put(
+                    url,
+                    self.cinemas[0],
+                    metadata,
+                    etag=_header(response, 'ETag'),
+                    last_modified=_header(response, 'Last-Modified'),
+                )
+
+        yield from self._film_items(metadata, response.meta)
+
+
+def _header(response, name: str) -> str | None:
+    value = response.headers.get(name)
+    return value.decode('latin-1') if value else None
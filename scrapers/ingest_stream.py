@@ -0,0 +1,97 @@
+"""Streaming ingest: embed and enrich movies while the spiders are still crawling.
+
+`run_spider_and_embed.py --pipelined` installs an IngestStream as
+CinemaScraperPipeline's movie sink. Every movie id the pipeline commits is pushed,
+once per run, onto two in-process queues; an embedding worker thread and an
+enrichment worker thread drain them concurrently with the crawl, calling the
+regular sync_embeddings / sync_enrichment with ``movie_ids=`` so the usual
+hash and staleness checks still decide what actually needs work.
+
+Scrapy's reactor owns the main thread and the pipeline runs on it, so publishing
+is a non-blocking queue put. Workers batch ids (up to ``batch_size``, or whatever
+has arrived after ``max_wait_s``) so the DB and API calls stay batched.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Callable, Sequence
+
+LOGGER = logging.getLogger("ingest_stream")
+
+_STOP = object()
+
+
+class IngestStream:
+    """Fan movie ids out to one queue per downstream stage."""
+
+    def __init__(self, stages: dict[str, Callable[[list[int]], None]],
+                 batch_size: int = 16, max_wait_s: float = 5.0):
+        self.batch_size = batch_size
+        self.max_wait_s = max_wait_s
+        self._seen: set[int] = set()
+        self._lock = threading.Lock()
+        self._queues: dict[str, queue.Queue] = {name: queue.Queue() for name in stages}
+        self._threads = [
+            threading.Thread(
+                target=self._work, args=(name, self._queues[name], handle),
+                name=f"ingest-{name}", daemon=True,
+            )
+            for name, handle in stages.items()
+        ]
+        self.processed: dict[str, int] = {name: 0 for name in stages}
+        self.failed_batches: dict[str, int] = {name: 0 for name in stages}
+
+    def start(self) -> None:
+        for t in self._threads:
+            t.start()
+
+    def publish(self, movie_id: int) -> None:
+        """Queue movie_id for every stage, once per run."""
+        with self._lock:
+            if movie_id in self._seen:
+                return
+            self._seen.add(movie_id)
+        for q in self._queues.values():
+            q.put(movie_id)
+
+    def close(self) -> None:
+        """Signal end of crawl and wait for every stage to drain its queue."""
+        for q in self._queues.values():
+            q.put(_STOP)
+        for t in self._threads:
+            t.join()
+        LOGGER.info(
+            "Streaming ingest done — %d movie(s) published; processed %s; failed batches %s",
+            len(self._seen), self.processed, self.failed_batches,
+        )
+
+    def _work(self, name: str, q: queue.Queue, handle: Callable[[list[int]], None]) -> None:
+        stopping = False
+        while not stopping:
+            batch: list[int] = []
+            item = q.get()
+            if item is _STOP:
+                break
+            batch.append(item)
+            while len(batch) < self.batch_size:
+                try:
+                    item = q.get(timeout=self.max_wait_s)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(name, handle, batch)
+
+    def _run_batch(self, name: str, handle: Callable[[list[int]], None],
+                   batch: Sequence[int]) -> None:
+        try:
+            handle(list(batch))
+            self.processed[name] += len(batch)
+        except Exception:
+            # One failed batch must not stop the stage; the next full run retries it.
+            self.failed_batches[name] += 1
+            LOGGER.exception("%s worker failed on batch of %d movie(s)", name, len(batch))
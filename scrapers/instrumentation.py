@@ -0,0 +1,97 @@
+"""Scrapy extension feeding per-spider crawl metrics into the run report.
+
+Records, per spider, every response's download latency (Scrapy's
+``download_latency`` meta key), item counts, and on close a summary of request
+and response counts, status codes, items per second, and the effective
+throughput per domain under the run's throughput profile (scrapers/throughput.py),
+which is also logged. Everything lands in ``src.database.crawl_report.REPORT``;
+see that module for the report format.
+"""
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from scrapy import signals
+
+from scrapers.throughput import PROFILE_KEYS
+from src.database.crawl_report import REPORT
+
+
+class CrawlInstrumentation:
+
+    def __init__(self, stats, settings=None):
+        self.stats = stats
+        self.settings = settings
+        self._opened_at: dict[str, float] = {}
+        # spider -> domain -> [responses, bytes]
+        self._domains: dict[str, dict[str, list[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler.stats, crawler.settings)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        return ext
+
+    def spider_opened(self, spider):
+        self._opened_at[spider.name] = time.perf_counter()
+
+    def response_received(self, response, request, spider):
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            REPORT.observe(f'spider.{spider.name}.request_latency', latency)
+        counts = self._domains[spider.name][urlparse(request.url).hostname or '']
+        counts[0] += 1
+        counts[1] += len(response.body)
+
+    def item_scraped(self, item, response, spider):
+        REPORT.incr(f'spider.{spider.name}.items')
+
+    def spider_closed(self, spider, reason):
+        elapsed = time.perf_counter() - self._opened_at.get(spider.name, time.perf_counter())
+        stats = self.stats.get_stats(spider)
+        items = stats.get('item_scraped_count', 0)
+        REPORT.set_spider(spider.name, {
+            'finish_reason': reason,
+            'elapsed_s': round(elapsed, 3),
+            'requests': stats.get('downloader/request_count', 0),
+            'responses': stats.get('downloader/response_count', 0),
+            'response_bytes': stats.get('downloader/response_bytes', 0),
+            'status_counts': {
+                key.rsplit('/', 1)[-1]: value
+                for key, value in stats.items()
+                if key.startswith('downloader/response_status_count/')
+            },
+            'items': items,
+            'items_per_s': round(items / elapsed, 2) if elapsed > 0 else 0.0,
+            'errors': stats.get('log_count/ERROR', 0),
+            'request_latency': REPORT.timing_summary(f'spider.{spider.name}.request_latency'),
+            'retry_budget_exhausted': stats.get('retry/budget_exhausted', 0),
+            **self._throughput(spider, elapsed),
+        })
+
+    def _throughput(self, spider, elapsed: float) -> dict:
+        """Per-domain responses/s and KB/s over the spider's lifetime, logged and reported."""
+        profile = self.settings.get('THROUGHPUT_PROFILE') if self.settings is not None else None
+        domains = {}
+        for domain, (responses, size) in sorted(self._domains.pop(spider.name, {}).items()):
+            rate = responses / elapsed if elapsed > 0 else 0.0
+            kb_rate = size / 1024 / elapsed if elapsed > 0 else 0.0
+            domains[domain] = {
+                'responses': responses,
+                'responses_per_s': round(rate, 2),
+                'kb_per_s': round(kb_rate, 1),
+            }
+            spider.logger.info(
+                f"Throughput [{profile or 'no profile'}] {domain}: {responses} responses "
+                f"in {elapsed:.1f}s = {rate:.2f}/s, {kb_rate:.1f} KB/s"
+            )
+        summary = {'domains': domains}
+        if profile:
+            summary['throughput_profile'] = profile
+            summary['effective_settings'] = {key: self.settings.get(key) for key in PROFILE_KEYS}
+        return summary
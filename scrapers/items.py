@@ -3,19 +3,42 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
-import scrapy
-
-
-class MetrographScraperItem(scrapy.Item):
-    # define the fields for your item here like:
-    title = scrapy.Field()
-    show_time = scrapy.Field()
-    show_day = scrapy.Field()
-    ticket_link = scrapy.Field()
-    image_url = scrapy.Field()
-    director1 = scrapy.Field()
-    director2 = scrapy.Field()
-    year = scrapy.Field()
-    runtime = scrapy.Field()
-    format = scrapy.Field()
-    synopsis = scrapy.Field()
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import NamedTuple
+
+
+class Showing(NamedTuple):
+    """One screening of a film. Format and special attributes vary per screening
+    at Angelika (35mm and Q&A showtypes of the same film), so they live here."""
+    show_time: datetime
+    format: str | None
+    ticket_link: str | None
+    special_attributes: str | None = None
+
+
+@dataclass(slots=True)
+class FilmItem:
+    """One film at one cinema with all of its scraped screenings.
+
+    Every spider yields one of these per film instead of one dict per showtime, so
+    the film-level fields are carried (and written to `movies`) once. A dataclass
+    is a native Scrapy item type (itemadapter), and slots keep the many small
+    instances of a crawl compact.
+
+    `--availability-only` crawls fill only cinema, details_link and showtimes.
+    """
+    cinema: str
+    title: str | None = None
+    details_link: str | None = None
+    image_url: str | None = None
+    director1: str | None = None
+    director2: str | None = None
+    year: int | str | None = None
+    runtime: int | None = None
+    synopsis: str | None = None
+    trailer_url: str | None = None
+    showtimes: list[Showing] = field(default_factory=list)
+
+    def add(self, show_time, format=None, ticket_link=None, special_attributes=None) -> None:
+        self.showtimes.append(Showing(show_time, format, ticket_link, special_attributes))
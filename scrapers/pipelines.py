@@ -11,16 +11,19 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 import psycopg2
+from psycopg2.extras import execute_values
 from src.database.setup_db import get_engine
-from src.database.title_normalization import (
-    _normalize_whitespace,
-    _api_lookup_title,
-    _strip_display_suffix,
-)
+from src.database.crawl_report import REPORT
+from src.database.movie_upsert import upsert_movie
+from src.database.title_normalization import normalize_title
 from dotenv import load_dotenv, find_dotenv
 from pathlib import Path
+import json
 from datetime import datetime, timezone
 
+from scrapers.crawl_job import item_marker
+from scrapers.items import FilmItem
+
 # Find .env in the root folder
 load_dotenv(find_dotenv())
 
@@ -30,13 +33,44 @@ def _prepare_item(raw_title: str, cinema: str) -> dict:
 
     Both CinemaScraperPipeline and DryRunCollectorPipeline call this, so edits
     here are automatically exercised by --dry-run before touching the DB.
+    Memoized per (title, cinema rule set) in title_normalization.
+    """
+    forms = normalize_title(raw_title, cinema)
+    return {
+        'title': forms.title,
+        'clean_title': forms.display,
+        'api_lookup': forms.api_lookup,
+    }
+
+
+def _dry_run_record(item: FilmItem, norm: dict) -> dict:
+    """JSON-safe summary of one film item as the dry-run output shows it.
+
+    `format` and `special_attributes` keep their one-string-per-film shape from
+    when items were per showtime (the first showing's values); `showings` has
+    every showing's own.
     """
-    title = _normalize_whitespace(raw_title)
-    clean_title = _strip_display_suffix(title)
+    synopsis = item.synopsis or ''
+    first = item.showtimes[0] if item.showtimes else None
     return {
-        'title': title,
-        'clean_title': clean_title,
-        'api_lookup': _api_lookup_title(clean_title, cinema),
+        'cinema': item.cinema or 'UNKNOWN',
+        'title': norm['title'],
+        'pipeline_clean_title': norm['clean_title'],
+        'pipeline_api_lookup': norm['api_lookup'],
+        'year': item.year,
+        'director1': item.director1,
+        'director2': item.director2,
+        'runtime': item.runtime,
+        'format': first.format if first else None,
+        'synopsis': synopsis[:300] + ('…' if len(synopsis) > 300 else ''),
+        'image_url': item.image_url,
+        'details_link': item.details_link,
+        'special_attributes': first.special_attributes if first else None,
+        'showtimes': [str(s.show_time) for s in item.showtimes],
+        'showings': [
+            {'show_time': str(s.show_time), 'format': s.format, 'special_attributes': s.special_attributes}
+            for s in item.showtimes
+        ],
     }
 
 
@@ -46,26 +80,52 @@ class DryRunCollectorPipeline:
 
     Call DryRunCollectorPipeline.reset(n) before starting CrawlerProcess, then
     read DryRunCollectorPipeline.items after it finishes.
+
+    With reset(n, stream_path=...) records are not kept: each one is appended to
+    that JSONL file as it arrives (flushed per line, so it can be tailed), and
+    only per-cinema title sets and counts stay in memory. close_stream() appends
+    a final summary line with the per-cinema movie and showtime counts.
     """
     items: list[dict] = []
     _seen: dict[str, set] = {}
     _limit: int = 10
     _closed: set[str] = set()
+    _stream = None
+    _counts: dict[str, dict[str, int]] = {}
 
     @classmethod
-    def reset(cls, limit: int = 10) -> None:
+    def reset(cls, limit: int = 10, stream_path: Path | None = None) -> None:
+        cls.close_stream()
         cls.items = []
         cls._seen = {}
         cls._limit = limit
         cls._closed = set()
+        cls._counts = {}
+        if stream_path is not None:
+            stream_path.parent.mkdir(parents=True, exist_ok=True)
+            cls._stream = open(stream_path, 'w', encoding='utf-8')
+
+    @classmethod
+    def close_stream(cls) -> None:
+        if cls._stream is None:
+            return
+        cls._write_line({'type': 'summary', 'n_movies_per_cinema': cls._limit,
+                         'cinemas': dict(sorted(cls._counts.items()))})
+        cls._stream.close()
+        cls._stream = None
+
+    @classmethod
+    def _write_line(cls, record: dict) -> None:
+        cls._stream.write(json.dumps(record, default=str, ensure_ascii=False) + '\n')
+        cls._stream.flush()
 
     @classmethod
     def _is_full(cls, cinema: str) -> bool:
         return len(cls._seen.get(cinema, ())) >= cls._limit
 
-    def process_item(self, item, spider):
-        cinema = item.get('cinema', 'UNKNOWN')
-        norm = _prepare_item(item.get('title') or '', cinema)
+    def process_item(self, item: FilmItem, spider):
+        cinema = item.cinema or 'UNKNOWN'
+        norm = _prepare_item(item.title or '', cinema)
         seen = DryRunCollectorPipeline._seen
         seen.setdefault(cinema, set())
 
@@ -80,12 +140,17 @@ class DryRunCollectorPipeline:
         if new_title:
             seen[cinema].add(norm['title'])
 
-        DryRunCollectorPipeline.items.append({
-            **dict(item),
-            'title': norm['title'],
-            '_pipeline_clean_title': norm['clean_title'],
-            '_pipeline_api_lookup': norm['api_lookup'],
-        })
+        record = _dry_run_record(item, norm)
+        counts = DryRunCollectorPipeline._counts.setdefault(cinema, {'movies': 0, 'showtimes': 0})
+        if new_title:
+            counts['movies'] += 1
+        counts['showtimes'] += len(record['showtimes'])
+        if DryRunCollectorPipeline._stream is not None:
+            # A film split over several items repeats its (cinema, title) key;
+            # readers merge lines on it, as _run_dry_spiders does for the JSON file.
+            DryRunCollectorPipeline._write_line({'type': 'movie', **record})
+        else:
+            DryRunCollectorPipeline.items.append(record)
         return item
 
     def _maybe_close(self, spider) -> None:
@@ -101,7 +166,51 @@ class DryRunCollectorPipeline:
         spider.crawler.engine.close_spider(spider, 'dry_run_limit')
 
 
-class CinemaScraperPipeline:
+# Matched rows get the new ticket_link; the select counts rows changed and keys
+# with no showtime at all. CTEs see the pre-UPDATE snapshot, so the second count
+# is not thrown off by the update.
+_AVAILABILITY_SQL = """
+    WITH v (cinema, details_link, show_time, ticket_link) AS (VALUES %s),
+    updated AS (
+        UPDATE showtimes AS s
+        SET ticket_link = v.ticket_link
+        FROM v
+        WHERE s.cinema = v.cinema
+          AND rtrim(s.details_link, '/') = v.details_link
+          AND s.show_time = v.show_time
+          AND s.ticket_link IS DISTINCT FROM v.ticket_link
+        RETURNING 1
+    )
+    SELECT
+        (SELECT count(*) FROM updated),
+        (SELECT count(*) FROM v WHERE NOT EXISTS (
+            SELECT 1 FROM showtimes AS s
+            WHERE s.cinema = v.cinema
+              AND rtrim(s.details_link, '/') = v.details_link
+              AND s.show_time = v.show_time
+        ))
+"""
+
+
+def _link_key(url: str) -> str:
+    """details_link as matched by AvailabilityPipeline: a trailing slash is ignored."""
+    return url.rstrip('/')
+
+
+class AvailabilityPipeline:
+    """Bulk-refresh showtimes.ticket_link for `--availability-only` crawls.
+
+    FilmItems need only cinema, details_link and each showing's show_time and
+    ticket_link, read from listing pages and APIs (Angelika's full items work
+    as-is). Nothing is inserted and crawled_at is left alone, so an availability
+    run neither creates showtimes nor shields stale ones from the next full
+    crawl's sweep. Rows are matched on
+    (cinema, details_link, show_time), ignoring a trailing slash on the link,
+    and written in one UPDATE on close. Records that match no showtime are
+    counted and logged: they usually mean the listing's link differs from the
+    one the full crawl stored.
+    """
+
     def __init__(self, test_mode=False):
         self.test_mode = test_mode
 
@@ -109,6 +218,120 @@ class CinemaScraperPipeline:
     def from_crawler(cls, crawler):
         return cls(test_mode=crawler.settings.getbool('TEST_MODE', False))
 
+    def open_spider(self, spider):
+        # (cinema, details_link, show_time) -> ticket_link; last write wins
+        self.rows: dict[tuple, str | None] = {}
+
+    def process_item(self, item: FilmItem, spider):
+        cinema = item.cinema or 'UNKNOWN'
+        if self.test_mode:
+            cinema = f'TEST_{cinema}'
+        if not item.details_link:
+            return item
+        link = _link_key(item.details_link)
+        for showing in item.showtimes:
+            if showing.show_time:
+                self.rows[(cinema, link, showing.show_time)] = showing.ticket_link
+        return item
+
+    def close_spider(self, spider):
+        if not self.rows:
+            return
+        conn = get_engine().raw_connection()
+        cur = conn.cursor()
+        try:
+            ((updated, unmatched),) = execute_values(cur, _AVAILABILITY_SQL, [
+                (cinema, details_link, show_time, ticket_link)
+                for (cinema, details_link, show_time), ticket_link in self.rows.items()
+            ], template='(%s, %s, %s::timestamp, %s::text)', page_size=len(self.rows), fetch=True)
+            conn.commit()
+            spider.logger.info(
+                f"Availability: {len(self.rows)} showtime(s) seen, {updated} ticket_link(s) changed"
+            )
+            if unmatched:
+                spider.logger.warning(
+                    f"Availability: {unmatched} of {len(self.rows)} showtime(s) matched no stored row"
+                )
+        except psycopg2.Error as e:
+            spider.logger.error(f"Availability update failed: {e}")
+            try:
+                conn.rollback()
+            except Exception as re:
+                spider.logger.error(f"Availability rollback failed: {re}")
+        finally:
+            cur.close()
+            conn.close()
+
+
+_SHOWTIME_COLUMNS = (
+    'id, crawled_at, title, show_time, show_day, ticket_link, director1, director2, year, '
+    'runtime, format, synopsis, cinema, movie_id, image_url, details_link, special_attributes, '
+    'trailer_url'
+)
+
+# One statement for every cinema written this run; the CTE's RETURNING gives the
+# per-cinema counts. Served by idx_showtimes_cinema_show_time_crawled_at.
+_SWEEP_SQL = """
+    WITH swept AS (
+        DELETE FROM showtimes
+        WHERE cinema = ANY(%s)
+          AND crawled_at < %s
+          AND show_time > now()
+        RETURNING cinema
+    )
+    SELECT cinema, count(*) FROM swept GROUP BY cinema
+"""
+
+# Same sweep, but the removed rows are copied to showtimes_archive in the same
+# statement (and so the same transaction) instead of being lost.
+_SWEEP_ARCHIVE_SQL = f"""
+    WITH swept AS (
+        DELETE FROM showtimes
+        WHERE cinema = ANY(%s)
+          AND crawled_at < %s
+          AND show_time > now()
+        RETURNING {_SHOWTIME_COLUMNS}
+    ), archived AS (
+        INSERT INTO showtimes_archive ({_SHOWTIME_COLUMNS}, swept_at)
+        SELECT {_SHOWTIME_COLUMNS}, now() FROM swept
+    )
+    SELECT cinema, count(*) FROM swept GROUP BY cinema
+"""
+
+SWEEP_MODES = ('delete', 'archive')
+
+
+def sweep_stale_showtimes(cur, cinemas, run_started_at, mode='delete') -> dict[str, int]:
+    """Remove (or archive) future showtimes of `cinemas` last crawled before
+    run_started_at; return counts per cinema. The caller commits."""
+    sql = _SWEEP_ARCHIVE_SQL if mode == 'archive' else _SWEEP_SQL
+    cur.execute(sql, (sorted(cinemas), run_started_at))
+    return {cinema: n for cinema, n in cur.fetchall()}
+
+
+class CinemaScraperPipeline:
+    # Optional callable receiving each committed movie id. Set by
+    # `run_spider_and_embed.py --pipelined` to an IngestStream.publish so embedding
+    # and enrichment start while the crawl is still running.
+    movie_sink = None
+    # Optional scrapers.crawl_job.CrawlJob. Set by `run_spider_and_embed.py --job-dir`
+    # for resumable crawls: items committed by an earlier attempt of the run are
+    # skipped, and sweeping waits until every spider of a cinema has finished.
+    crawl_job = None
+
+    def __init__(self, test_mode=False, sweep_mode='delete'):
+        if sweep_mode not in SWEEP_MODES:
+            raise ValueError(f"SHOWTIME_SWEEP_MODE must be one of {SWEEP_MODES}, got {sweep_mode!r}")
+        self.test_mode = test_mode
+        self.sweep_mode = sweep_mode
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            test_mode=crawler.settings.getbool('TEST_MODE', False),
+            sweep_mode=crawler.settings.get('SHOWTIME_SWEEP_MODE', 'delete'),
+        )
+
     def open_spider(self, spider):
         # Connect via SQLAlchemy engine to reuse env logic in setup_db.get_engine()
         engine = get_engine()
@@ -122,177 +345,182 @@ class CinemaScraperPipeline:
         # Cinemas with at least one successful write this run — only these are swept,
         # so a cinema that failed to scrape entirely never has its rows deleted.
         self.written_cinemas: set[str] = set()
+        self._markers: dict[str, int] = {}
+        job = CinemaScraperPipeline.crawl_job
+        if job is not None:
+            # A resumed run keeps its first attempt's start time, so rows written
+            # before the interruption do not look stale to the sweep.
+            self.run_started_at = job.started_at
+            self._markers = job.load_markers(spider.name)
 
     def close_spider(self, spider):
         try:
-            self._sweep_stale_showtimes(spider)
+            job = CinemaScraperPipeline.crawl_job
+            if job is not None:
+                job.record_written(spider.name, self.written_cinemas)
+            else:
+                self._sweep_stale_showtimes(spider)
         finally:
             self.cur.close()
             self.conn.close()
 
-    def _sweep_stale_showtimes(self, spider):
-        """Delete future showtimes this crawl did not re-write.
+    def _sweep_stale_showtimes(self, spider) -> dict[str, int]:
+        """Delete future showtimes this crawl did not re-write; return counts per cinema.
 
         A change to any part of the ON CONFLICT key (show_time, format) or to the
         title/year that resolves movie_id makes the upsert insert a fresh row
         instead of updating the existing one, orphaning the stale row. Re-written
         rows get crawled_at >= run_started_at; untouched future rows keep an older
         crawled_at and are pruned here. Past showtimes are left as history.
+
+        All written cinemas are swept in one statement and one transaction. With
+        SHOWTIME_SWEEP_MODE = 'archive' the swept rows move to showtimes_archive.
         """
-        for cinema in sorted(self.written_cinemas):
+        if not self.written_cinemas:
+            return {}
+        try:
+            counts = sweep_stale_showtimes(
+                self.cur, self.written_cinemas, self.run_started_at, self.sweep_mode,
+            )
+            self.conn.commit()
+        except psycopg2.Error as e:
+            spider.logger.error(f"Sweep failed for {sorted(self.written_cinemas)}: {e}")
             try:
-                self.cur.execute("""
-                    DELETE FROM showtimes
-                    WHERE cinema = %s
-                      AND crawled_at < %s
-                      AND show_time > now()
-                """, (cinema, self.run_started_at))
-                deleted = self.cur.rowcount
-                self.conn.commit()
-                if deleted:
-                    spider.logger.info(
-                        f"Swept {deleted} stale future showtime(s) for {cinema!r}"
-                    )
-            except psycopg2.Error as e:
-                spider.logger.error(f"Sweep failed for {cinema!r}: {e}")
-                try:
-                    self.conn.rollback()
-                except Exception as re:
-                    spider.logger.error(f"Sweep rollback failed: {re}")
-    
+                self.conn.rollback()
+            except Exception as re:
+                spider.logger.error(f"Sweep rollback failed: {re}")
+            return {}
+
+        verb = 'Archived' if self.sweep_mode == 'archive' else 'Swept'
+        for cinema, n in sorted(counts.items()):
+            spider.logger.info(f"{verb} {n} stale future showtime(s) for {cinema!r}")
+        REPORT.incr('pipeline.swept', sum(counts.values()))
+        return counts
+
     def process_item(self, item, spider):
-        
+        with REPORT.timer('pipeline.db_write'):
+            return self._write_item(item, spider)
+
+    def _write_item(self, item: FilmItem, spider):
+        """Upsert the film's movie row, then all of its showtimes in one statement
+        and one commit."""
         try:
-            year = item.get('year')
-            cinema = item.get('cinema') or 'UNKNOWN'
+            year = item.year
+            cinema = item.cinema or 'UNKNOWN'
             if self.test_mode:
                 cinema = f'TEST_{cinema}'
 
-            norm = _prepare_item(item.get('title') or '', cinema)
+            marker = None
+            if CinemaScraperPipeline.crawl_job is not None:
+                marker = item_marker(item)
+                if marker in self._markers:
+                    # Committed by an earlier attempt of this resumed run.
+                    self.written_cinemas.add(cinema)
+                    REPORT.incr('pipeline.resumed_skips')
+                    if CinemaScraperPipeline.movie_sink is not None:
+                        CinemaScraperPipeline.movie_sink(self._markers[marker])
+                    return item
+
+            norm = _prepare_item(item.title or '', cinema)
             title = norm['title']
             clean_title = norm['clean_title']
             api_lookup = norm['api_lookup']
 
-            spider.logger.debug(f"Pipeline: updating item {title!r} in movies table")
-            self.cur.execute("""
-                UPDATE movies
-                SET
-                    title = %s,
-                    year = %s,
-                    updated_at = %s,
-                    scraped_synopsis = %s,
-                    scraped_director1 = %s,
-                    scraped_cinema = %s,
-                    scraped_image_url = %s,
-                    scraped_details_link = %s,
-                    scraped_title_normalized = %s
-                WHERE lower(trim(title)) = lower(trim(%s))
-                  AND (year IS NOT DISTINCT FROM %s)
-                RETURNING id;
-            """, (
-                clean_title,
-                year,
-                datetime.now(timezone.utc),
-                item.get('synopsis'),
-                item.get('director1'),
-                cinema,
-                item.get('image_url'),
-                item.get('details_link'),
-                api_lookup,
-                clean_title,
-                year,
-            ))
-
-            row = self.cur.fetchone()
-            if row:
-                movie_id = row[0]
-            else:
-                spider.logger.debug(f"Pipeline: inserting item {title!r} into movies table")
-                self.cur.execute("""
-                    INSERT INTO movies (title, year, updated_at, scraped_synopsis, scraped_director1, scraped_cinema, scraped_image_url, scraped_details_link, scraped_title_normalized)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id;
-                """, (
-                    clean_title,
-                    year,
-                    datetime.now(timezone.utc),
-                    item.get('synopsis'),
-                    item.get('director1'),
-                    cinema,
-                    item.get('image_url'),
-                    item.get('details_link'),
-                    api_lookup,
-                ))
-                movie_id = self.cur.fetchone()[0]
-    
-            
+            spider.logger.debug(f"Pipeline: upserting item {title!r} into movies table")
+            movie_id = upsert_movie(self.cur, {
+                'title': clean_title,
+                'year': year,
+                'updated_at': datetime.now(timezone.utc),
+                'scraped_synopsis': item.synopsis,
+                'scraped_director1': item.director1,
+                'scraped_cinema': cinema,
+                'scraped_image_url': item.image_url,
+                'scraped_details_link': item.details_link,
+                'scraped_title_normalized': api_lookup,
+            })
+
             ## Update showtimes table
-            spider.logger.debug(f"Pipeline: inserting/updating item {(item.get('title'))}, {(item.get('show_time'))} in showtimes table")
-            self.cur.execute("""
-            INSERT INTO showtimes (
-                movie_id,
-                title,
-                crawled_at,
-                show_time,
-                show_day,
-                ticket_link,
-                details_link,
-                image_url,
-                director1,
-                director2,
-                year,
-                runtime,
-                format,
-                synopsis,
-                cinema,
-                special_attributes,
-                trailer_url
+            # ON CONFLICT DO UPDATE rejects a statement that touches the same row twice,
+            # so collapse repeated (show_time, format) screenings first; last one wins.
+            showings = {(s.show_time, s.format): s for s in item.showtimes if s.show_time}
+            crawled_at = datetime.now(timezone.utc)
+            spider.logger.debug(
+                f"Pipeline: inserting/updating {len(showings)} showtime(s) for {title!r} in showtimes table"
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (movie_id, show_time, cinema, format)
-            DO UPDATE SET
-                crawled_at         = EXCLUDED.crawled_at,
-                title              = EXCLUDED.title,
-                year               = EXCLUDED.year,
-                show_day           = EXCLUDED.show_day,
-                ticket_link        = EXCLUDED.ticket_link,
-                details_link       = EXCLUDED.details_link,
-                image_url          = EXCLUDED.image_url,
-                director1          = EXCLUDED.director1,
-                director2          = EXCLUDED.director2,
-                runtime            = EXCLUDED.runtime,
-                synopsis           = EXCLUDED.synopsis,
-                special_attributes = EXCLUDED.special_attributes,
-                trailer_url        = EXCLUDED.trailer_url;
-            """, (
-                movie_id,
-                title,
-                datetime.now(timezone.utc),
-                item.get('show_time'),
-                item.get('show_day'),
-                item.get('ticket_link'),
-                item.get('details_link'),
-                item.get('image_url'),
-                item.get('director1'),
-                item.get('director2'),
-                year,
-                item.get('runtime'),
-                item.get('format'),
-                item.get('synopsis'),
-                cinema,
-                item.get('special_attributes'),
-                item.get('trailer_url'),
-            ))
+            if showings:
+                execute_values(self.cur, """
+                INSERT INTO showtimes (
+                    movie_id,
+                    title,
+                    crawled_at,
+                    show_time,
+                    show_day,
+                    ticket_link,
+                    details_link,
+                    image_url,
+                    director1,
+                    director2,
+                    year,
+                    runtime,
+                    format,
+                    synopsis,
+                    cinema,
+                    special_attributes,
+                    trailer_url
+                )
+                VALUES %s
+                ON CONFLICT (movie_id, show_time, cinema, format)
+                DO UPDATE SET
+                    crawled_at         = EXCLUDED.crawled_at,
+                    title              = EXCLUDED.title,
+                    year               = EXCLUDED.year,
+                    show_day           = EXCLUDED.show_day,
+                    ticket_link        = EXCLUDED.ticket_link,
+                    details_link       = EXCLUDED.details_link,
+                    image_url          = EXCLUDED.image_url,
+                    director1          = EXCLUDED.director1,
+                    director2          = EXCLUDED.director2,
+                    runtime            = EXCLUDED.runtime,
+                    synopsis           = EXCLUDED.synopsis,
+                    special_attributes = EXCLUDED.special_attributes,
+                    trailer_url        = EXCLUDED.trailer_url;
+                """, [
+                    (
+                        movie_id,
+                        title,
+                        crawled_at,
+                        s.show_time,
+                        s.show_time.strftime('%A'),
+                        s.ticket_link,
+                        item.details_link,
+                        item.image_url,
+                        item.director1,
+                        item.director2,
+                        year,
+                        item.runtime,
+                        s.format,
+                        item.synopsis,
+                        cinema,
+                        s.special_attributes,
+                        item.trailer_url,
+                    )
+                    for s in showings.values()
+                ], page_size=len(showings))
 
             self.conn.commit()
             # Only cinemas with a committed write are eligible for the close_spider
             # sweep, so a failed scrape never deletes an otherwise-untouched cinema.
             self.written_cinemas.add(cinema)
+            if marker is not None:
+                CinemaScraperPipeline.crawl_job.add_marker(spider.name, marker, movie_id)
+                self._markers[marker] = movie_id
+            if CinemaScraperPipeline.movie_sink is not None:
+                CinemaScraperPipeline.movie_sink(movie_id)
         except psycopg2.Error as e:
             # Log original DB error and rollback so subsequent commands can run
-            spider.logger.error(f"DB error inserting item {(item.get('title'))}: {e}")
+            spider.logger.error(f"DB error inserting item {item.title!r}: {e}")
             try:
                 self.conn.rollback()
             except Exception as re:
                 spider.logger.error(f"Rollback failed: {re}")
-        return item
\ No newline at end of file
+        return item
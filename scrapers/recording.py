@@ -0,0 +1,125 @@
+"""Record spider HTTP traffic to disk and replay it with no network.
+
+    python scrapers/run_spider_and_embed.py --dry-run --record data/recordings
+    python scrapers/run_spider_and_embed.py --dry-run --replay data/recordings
+
+HttpRecordingMiddleware is a downloader middleware driven by two settings:
+
+  - HTTP_RECORDING_MODE: 'record' or 'replay' (unset = middleware disabled)
+  - HTTP_RECORDING_DIR:  root directory; one subdirectory per spider
+
+Each response is stored as ``<dir>/<spider>/<request fingerprint>.json`` holding
+the URL, status, headers, the (already decompressed) body and the callback name,
+plus any JSON-safe request meta. In replay mode a request whose fingerprint has
+no recording is dropped with IgnoreRequest, so a replayed crawl never reaches
+the network. The same files feed the parse benchmarks in benchmarks/.
+
+Recordings include response bodies verbatim (the Angelika settings response
+carries an API token), so they belong in the gitignored data/ directory.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+
+# Stripped on record: the stored body is already decompressed, and a replayed
+# Content-Encoding would make HttpCompressionMiddleware try to decode it again.
+_DROP_HEADERS = {b'content-encoding', b'content-length', b'transfer-encoding', b'set-cookie'}
+
+_JSON_SAFE = (str, int, float, bool, type(None))
+
+
+def _safe_meta(meta: dict) -> dict:
+    return {
+        k: v for k, v in meta.items()
+        if isinstance(v, _JSON_SAFE) and not k.startswith(('download_', '_'))
+    }
+
+
+def save_recording(path: Path, request, response) -> None:
+    headers = {
+        k.decode('latin-1'): [v.decode('latin-1') for v in vs]
+        for k, vs in response.headers.items()
+        if k.lower() not in _DROP_HEADERS
+    }
+    callback = getattr(request.callback, '__name__', None) or 'parse'
+    record = {
+        'url': response.url,
+        'request_url': request.url,
+        'method': request.method,
+        'status': response.status,
+        'headers': headers,
+        'callback': callback,
+        'meta': _safe_meta(request.meta),
+        'body_b64': base64.b64encode(response.body).decode('ascii'),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(record, indent=1))
+
+
+def load_recording(path: Path) -> dict:
+    record = json.loads(path.read_text())
+    record['body'] = base64.b64decode(record.pop('body_b64'))
+    return record
+
+
+def build_response(record: dict, request=None):
+    """Rebuild a Scrapy Response of the right type (HtmlResponse, TextResponse…)."""
+    headers = Headers(record['headers'])
+    cls = responsetypes.from_args(headers=headers, url=record['url'], body=record['body'])
+    return cls(
+        url=record['url'],
+        status=record['status'],
+        headers=headers,
+        body=record['body'],
+        request=request,
+    )
+
+
+def iter_recordings(root: Path, spider_name: str):
+    """Yield every recording stored for one spider, in a stable order."""
+    for path in sorted((Path(root) / spider_name).glob('*.json')):
+        yield load_recording(path)
+
+
+class HttpRecordingMiddleware:
+
+    def __init__(self, mode: str, root: Path, fingerprinter):
+        self.mode = mode
+        self.root = root
+        self.fingerprinter = fingerprinter
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        mode = crawler.settings.get('HTTP_RECORDING_MODE')
+        if not mode:
+            raise NotConfigured
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"HTTP_RECORDING_MODE must be 'record' or 'replay', got {mode!r}")
+        root = Path(crawler.settings.get('HTTP_RECORDING_DIR') or 'data/recordings')
+        return cls(mode, root, crawler.request_fingerprinter)
+
+    def _path(self, request, spider) -> Path:
+        fp = self.fingerprinter.fingerprint(request).hex()
+        return self.root / spider.name / f'{fp}.json'
+
+    def process_request(self, request, spider):
+        if self.mode != 'replay':
+            return None
+        path = self._path(request, spider)
+        if not path.exists():
+            spider.crawler.stats.inc_value('recording/replay_miss', spider=spider)
+            raise IgnoreRequest(f"No recording for {request.url}")
+        spider.crawler.stats.inc_value('recording/replayed', spider=spider)
+        return build_response(load_recording(path), request=request)
+
+    def process_response(self, request, response, spider):
+        if self.mode == 'record':
+            save_recording(self._path(request, spider), request, response)
+            spider.crawler.stats.inc_value('recording/recorded', spider=spider)
+        return response
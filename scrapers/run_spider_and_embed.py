@@ -3,7 +3,18 @@
 Usage (from repo root):
     python scrapers/run_spider_and_embed.py                    # full pipeline, writes to DB
     python scrapers/run_spider_and_embed.py --dry-run          # scrape 10 movies/cinema, no DB writes
+    python scrapers/run_spider_and_embed.py --dry-run --jsonl --dry-run-movies 500  # stream to JSONL
     python scrapers/run_spider_and_embed.py --refresh-enrichment  # force re-enrich all movies
+    python scrapers/run_spider_and_embed.py --refresh-details  # revalidate every cached detail page
+    python scrapers/run_spider_and_embed.py --availability-only  # refresh sold-out state only (hourly)
+    python scrapers/run_spider_and_embed.py --pipelined        # embed/enrich concurrently with the crawl
+    python scrapers/run_spider_and_embed.py --persist-report   # also store the JSON run report in crawl_runs
+    python scrapers/run_spider_and_embed.py --job-dir data/jobs  # resumable crawl; rerun to continue
+    python scrapers/run_spider_and_embed.py --pipelined --spiders angelika  # one spider, its movies only
+    python scrapers/run_spider_and_embed.py --profile polite  # slower, gentler crawl (polite|default|fast)
+    python scrapers/run_spider_and_embed.py --dry-run --record data/recordings  # save responses for replay
+    python scrapers/run_spider_and_embed.py --dry-run --replay data/recordings  # crawl offline from recordings
+    python scrapers/run_spider_and_embed.py --time-budget 900  # cap embed and enrich at 15 min each
 """
 from __future__ import annotations
 
@@ -28,67 +39,223 @@ os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "scrapers.settings")
 
 from src.database.sync_embeddings import sync_embeddings, DEFAULT_BATCH_SIZE  # noqa: E402
 from src.database.sync_enrichment import sync_enrichment  # noqa: E402
+from src.database.crawl_report import REPORT  # noqa: E402
+from src.database.setup_db import get_engine  # noqa: E402
+from src.database.work_priority import TimeBudget  # noqa: E402
+from scrapers.throughput import PROFILES  # noqa: E402
 
 LOGGER = logging.getLogger("run_spider_and_embed")
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
 DRY_RUN_OUTPUT_DIR = ROOT / "data" / "scraper"
 DRY_RUN_MOVIES_PER_CINEMA = 10
+RUN_REPORT_DIR = ROOT / "data" / "reports"
 
 
-def run_spider() -> None:
-    process = CrawlerProcess(get_project_settings())
-    process.crawl('metrograph')
-    process.crawl('film_forum')
-    process.crawl('ifc_center')
-    process.crawl('angelika')
+# Settings applied to every CrawlerProcess this run; see _apply_profile_args() and
+# _apply_recording_args().
+_SETTINGS_OVERRIDES: dict = {}
+
+
+def _project_settings():
+    settings = get_project_settings()
+    for key, value in _SETTINGS_OVERRIDES.items():
+        settings.set(key, value)
+    return settings
+
+
+def _apply_profile_args(args: argparse.Namespace) -> None:
+    """Apply the chosen throughput profile (scrapers/throughput.py) to every spider."""
+    if args.profile:
+        _SETTINGS_OVERRIDES['THROUGHPUT_PROFILE'] = args.profile
+
+
+def _apply_recording_args(args: argparse.Namespace) -> None:
+    """Route every spider's HTTP through scrapers/recording.py when asked to."""
+    if args.record:
+        _SETTINGS_OVERRIDES.update(HTTP_RECORDING_MODE='record', HTTP_RECORDING_DIR=args.record)
+    elif args.replay:
+        _SETTINGS_OVERRIDES.update(HTTP_RECORDING_MODE='replay', HTTP_RECORDING_DIR=args.replay)
+
+
+SPIDERS = ('metrograph', 'film_forum', 'ifc_center', 'angelika')
+# Spiders --availability-only can run, with their crawl arguments. Film Forum is
+# left out: its ticket links live on the detail pages.
+AVAILABILITY_SPIDERS = {
+    'metrograph': {'availability_only': True},
+    'ifc_center': {'availability_only': True},
+    'angelika': {},
+}
+
+
+def run_spider(refresh_details: bool = False, job_dir: str | None = None,
+               spiders: tuple[str, ...] = SPIDERS) -> None:
+    settings = _project_settings()
+    if refresh_details:
+        # Revalidate every cached detail page instead of trusting the freshness window.
+        settings.set('DETAIL_CACHE_FRESHNESS_DAYS', 0)
+    process = CrawlerProcess(settings)
+    if job_dir is None:
+        for name in spiders:
+            process.crawl(name)
+        process.start()
+        return
+    _run_resumable(process, settings, Path(job_dir), spiders)
+
+
+def _run_resumable(process: CrawlerProcess, settings, job_root: Path, spiders: tuple[str, ...]) -> None:
+    """Crawl under a scrapers/crawl_job.py job: resume the unfinished run in
+    job_root if there is one, and sweep each cinema once its spiders finished."""
+    from scrapy import signals
+    from scrapers.crawl_job import CrawlJob, sweep_completed
+    from scrapers.pipelines import CinemaScraperPipeline
+
+    job = CrawlJob.start_or_resume(job_root, {
+        name: list(process.spider_loader.load(name).cinemas) for name in spiders
+    })
+    CinemaScraperPipeline.crawl_job = job
+    try:
+        pending = job.pending_spiders()
+        if pending:
+            for name in pending:
+                crawler = process.create_crawler(name)
+                # Settings freeze in crawl(), so each spider gets its own JOBDIR here.
+                crawler.settings.set('JOBDIR', job.jobdir(name))
+                crawler.signals.connect(
+                    lambda spider, reason: job.spider_closed(spider.name, reason),
+                    signal=signals.spider_closed, weak=False,
+                )
+                process.crawl(crawler)
+            process.start()
+        else:
+            LOGGER.info("Crawl job %s: every spider already finished", job.run_id)
+    finally:
+        CinemaScraperPipeline.crawl_job = None
+
+    sweep_completed(job, get_engine(), settings.get('SHOWTIME_SWEEP_MODE', 'delete'))
+    if not job.finish_if_complete():
+        LOGGER.warning(
+            "Crawl job %s unfinished (%s); rerun with the same --job-dir to resume",
+            job.run_id, ', '.join(job.pending_spiders()) or 'sweep pending',
+        )
+
+
+def run_availability_refresh(spiders: tuple[str, ...] = SPIDERS) -> None:
+    """Re-read listing pages and APIs only and bulk-update showtimes.ticket_link.
+
+    Only the AVAILABILITY_SPIDERS among `spiders` run; the others are logged and
+    skipped, and SystemExit is raised if none is left.
+    """
+    unsupported = [name for name in spiders if name not in AVAILABILITY_SPIDERS]
+    spiders = [name for name in spiders if name in AVAILABILITY_SPIDERS]
+    if not spiders:
+        raise SystemExit(f"--availability-only cannot refresh {', '.join(unsupported)}: "
+                         f"supported spiders are {', '.join(AVAILABILITY_SPIDERS)}")
+    if unsupported:
+        LOGGER.info("Availability refresh skips %s (ticket links only on detail pages)",
+                    ', '.join(unsupported))
+
+    settings = _project_settings()
+    settings.set('ITEM_PIPELINES', {'scrapers.pipelines.AvailabilityPipeline': 300})
+    settings.set('DETAIL_CACHE_ENABLED', False)
+
+    process = CrawlerProcess(settings)
+    for name in spiders:
+        process.crawl(name, **AVAILABILITY_SPIDERS[name])
     process.start()
 
 
-def _run_dry_spiders(n_movies: int = DRY_RUN_MOVIES_PER_CINEMA) -> Path:
-    """Scrape up to n_movies per cinema without writing to the DB.
+def run_pipelined(args: argparse.Namespace) -> None:
+    """Crawl while embedding and enriching committed movies on worker threads.
 
-    Returns the path of the JSON file written to data/scraper/.
+    Wall time approaches the longest stage instead of the sum of all three. Only
+    movies the crawl wrote are considered, which is every movie with a future
+    showtime once the sweep has run. --time-budget caps each stage across all of
+    its micro-batches, counted from the start of the crawl.
+    """
+    from scrapers.ingest_stream import IngestStream
+    from scrapers.pipelines import CinemaScraperPipeline
+
+    embed_budget = TimeBudget(args.time_budget)
+    enrich_budget = TimeBudget(args.time_budget)
+
+    stream = IngestStream(
+        {
+            'embed': lambda ids: sync_embeddings(
+                refresh_all=args.refresh_all,
+                batch_size=args.batch_size,
+                sleep_s=args.sleep,
+                movie_ids=ids,
+                budget=embed_budget,
+            ),
+            'enrich': lambda ids: sync_enrichment(
+                apply=True,
+                refresh_all=args.refresh_enrichment,
+                sleep_s=args.sleep,
+                movie_ids=ids,
+                budget=enrich_budget,
+            ),
+        },
+        batch_size=args.batch_size,
+    )
+    CinemaScraperPipeline.movie_sink = stream.publish
+    stream.start()
+    try:
+        run_spider(refresh_details=args.refresh_details, job_dir=args.job_dir, spiders=args.spiders)
+    finally:
+        CinemaScraperPipeline.movie_sink = None
+        LOGGER.info("Spiders complete. Waiting for embedding/enrichment workers...")
+        stream.close()
+
+
+def _run_dry_spiders(n_movies: int = DRY_RUN_MOVIES_PER_CINEMA, stream: bool = False,
+                     spiders: tuple[str, ...] = SPIDERS) -> Path:
+    """Scrape up to n_movies per cinema of `spiders` without writing to the DB.
+
+    Returns the path of the file written to data/scraper/: one JSON document
+    grouped by cinema, or with stream=True a JSONL file appended to as items
+    arrive (one line per movie record, then a per-cinema summary line), which
+    keeps memory flat whatever n_movies is.
     """
     from scrapers.pipelines import DryRunCollectorPipeline
 
-    DryRunCollectorPipeline.reset(n_movies)
+    DRY_RUN_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+    out_path = DRY_RUN_OUTPUT_DIR / (f'dry_run_{ts}.jsonl' if stream else f'dry_run_{ts}.json')
+    DryRunCollectorPipeline.reset(n_movies, stream_path=out_path if stream else None)
+    if stream:
+        LOGGER.info('Streaming dry-run records to %s', out_path)
 
-    settings = get_project_settings()
+    settings = _project_settings()
     settings.set('ITEM_PIPELINES', {'scrapers.pipelines.DryRunCollectorPipeline': 300})
+    settings.set('DETAIL_CACHE_ENABLED', False)
 
-    process = CrawlerProcess(settings)
-    process.crawl('metrograph')
-    process.crawl('film_forum')
-    process.crawl('ifc_center')
-    process.crawl('angelika')
-    process.start()
+    try:
+        process = CrawlerProcess(settings)
+        for name in spiders:
+            process.crawl(name)
+        process.start()
+    finally:
+        DryRunCollectorPipeline.close_stream()
 
-    # Group raw showtime items into movie records for readability
+    if not stream:
+        _write_dry_run_json(DryRunCollectorPipeline.items, n_movies, out_path)
+    LOGGER.info('Dry-run complete. Results written to %s', out_path)
+    return out_path
+
+
+def _write_dry_run_json(records: list[dict], n_movies: int, out_path: Path) -> None:
+    # One film can arrive as several items; merge them into one record per (cinema, title)
     movies_by_cinema: dict[str, dict[str, dict]] = defaultdict(dict)
-    for item in DryRunCollectorPipeline.items:
-        cinema = item.get('cinema', 'UNKNOWN')
-        title = item.get('title', '')
-        if title not in movies_by_cinema[cinema]:
-            synopsis = item.get('synopsis') or ''
-            movies_by_cinema[cinema][title] = {
-                'title': title,
-                'pipeline_clean_title': item.get('_pipeline_clean_title'),
-                'pipeline_api_lookup': item.get('_pipeline_api_lookup'),
-                'year': item.get('year'),
-                'director1': item.get('director1'),
-                'director2': item.get('director2'),
-                'runtime': item.get('runtime'),
-                'format': item.get('format'),
-                'synopsis': synopsis[:300] + ('…' if len(synopsis) > 300 else ''),
-                'image_url': item.get('image_url'),
-                'details_link': item.get('details_link'),
-                'special_attributes': item.get('special_attributes'),
-                'showtimes': [],
-            }
-        show_time = item.get('show_time')
-        if show_time:
-            movies_by_cinema[cinema][title]['showtimes'].append(str(show_time))
+    for record in records:
+        cinema, title = record['cinema'], record['title']
+        merged = movies_by_cinema[cinema].get(title)
+        if merged is None:
+            movies_by_cinema[cinema][title] = {**record, 'showtimes': list(record['showtimes']),
+                                               'showings': list(record['showings'])}
+        else:
+            merged['showtimes'].extend(record['showtimes'])
+            merged['showings'].extend(record['showings'])
 
     output: dict = {
         'generated_at': datetime.now(timezone.utc).isoformat(),
@@ -96,13 +263,7 @@ def _run_dry_spiders(n_movies: int = DRY_RUN_MOVIES_PER_CINEMA) -> Path:
     }
     for cinema in sorted(movies_by_cinema):
         output[cinema] = list(movies_by_cinema[cinema].values())
-
-    DRY_RUN_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
-    out_path = DRY_RUN_OUTPUT_DIR / f'dry_run_{ts}.json'
     out_path.write_text(json.dumps(output, indent=2, default=str, ensure_ascii=False))
-    LOGGER.info('Dry-run complete. Results written to %s', out_path)
-    return out_path
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -111,37 +272,125 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Embedding batch size")
     parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to sleep between embedding batches")
     parser.add_argument("--refresh-all", action="store_true", help="Force re-embed all movies, ignoring hashes")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="SECONDS",
+                        help="Cap each of the embedding and enrichment stages at this many seconds "
+                             "(with --pipelined, counted from the start of the crawl); "
+                             "soonest-screening films are done first")
     parser.add_argument("--refresh-enrichment", action="store_true",
                         help="Force re-enrich all movies with future showtimes, ignoring enriched_at")
+    parser.add_argument("--refresh-details", action="store_true",
+                        help="Revalidate every cached film-detail page, ignoring the freshness window")
+    parser.add_argument("--availability-only", action="store_true",
+                        help="Only refresh ticket_link/sold-out state from listing pages; "
+                             "no detail pages, embeddings or enrichment")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Embed and enrich movies on worker threads while the spiders run "
+                             "(--limit is ignored)")
+    parser.add_argument("--report-path", default=None,
+                        help="Where to write the JSON run report (default: data/reports/run_report_<ts>.json)")
+    parser.add_argument("--persist-report", action="store_true",
+                        help="Also insert the run report into the crawl_runs table")
+    parser.add_argument("--profile", choices=tuple(PROFILES), default=None,
+                        help="Throughput profile: concurrency, AutoThrottle and retry budget "
+                             "(default: THROUGHPUT_PROFILE in scrapers/settings.py)")
+    parser.add_argument("--spiders", nargs="+", choices=SPIDERS, default=SPIDERS, metavar="NAME",
+                        help=f"Crawl only these spiders, in every mode (default: all of {', '.join(SPIDERS)})")
+    parser.add_argument("--job-dir", metavar="DIR", default=None,
+                        help="Make the crawl resumable: persist request queues and progress under "
+                             "DIR/<run_id>/; rerunning with the same DIR continues an interrupted run")
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--record", metavar="DIR", default=None,
+                           help="Save every spider response under DIR/<spider>/ for offline replay")
+    recording.add_argument("--replay", metavar="DIR", default=None,
+                           help="Serve spider responses from recordings in DIR; no network")
     parser.add_argument("--dry-run", action="store_true",
                         help=f"Scrape {DRY_RUN_MOVIES_PER_CINEMA} movies per cinema, no DB writes; save to data/scraper/")
+    parser.add_argument("--dry-run-movies", type=int, default=DRY_RUN_MOVIES_PER_CINEMA, metavar="N",
+                        help=f"Movies per cinema for --dry-run (default: {DRY_RUN_MOVIES_PER_CINEMA})")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="With --dry-run: stream records to a .jsonl file as they arrive "
+                             "instead of writing one JSON document at the end")
     return parser
 
 
+def _run_mode(args: argparse.Namespace) -> str:
+    if args.dry_run:
+        return 'dry_run'
+    if args.availability_only:
+        return 'availability'
+    if args.pipelined:
+        return 'pipelined'
+    return 'full'
+
+
+def _finish_report(args: argparse.Namespace, mode: str) -> None:
+    REPORT.finish()
+    path = args.report_path or (
+        RUN_REPORT_DIR / f"run_report_{REPORT.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    REPORT.write(Path(path))
+    LOGGER.info("Run report written to %s", path)
+    if args.persist_report and mode != 'dry_run':
+        try:
+            REPORT.persist(get_engine())
+        except Exception:
+            # The report is diagnostics; never fail an otherwise successful ingest over it.
+            LOGGER.exception("Failed to persist run report to crawl_runs")
+
+
 def main(argv: list[str] | None = None) -> None:
     args = _build_parser().parse_args(argv)
+    mode = _run_mode(args)
+    _apply_profile_args(args)
+    _apply_recording_args(args)
+    REPORT.reset(mode)
+    try:
+        _run(args, mode)
+    finally:
+        _finish_report(args, mode)
 
-    if args.dry_run:
-        _run_dry_spiders()
+
+def _run(args: argparse.Namespace, mode: str) -> None:
+    if mode == 'dry_run':
+        _run_dry_spiders(args.dry_run_movies, stream=args.jsonl, spiders=args.spiders)
+        return
+
+    if mode == 'availability':
+        LOGGER.info("Refreshing showtime availability...")
+        with REPORT.timer("stage.crawl"):
+            run_availability_refresh(args.spiders)
+        LOGGER.info("Availability refresh finished")
+        return
+
+    if mode == 'pipelined':
+        LOGGER.info("Running all cinema spiders with streaming embedding/enrichment...")
+        with REPORT.timer("stage.pipelined"):
+            run_pipelined(args)
+        LOGGER.info("Pipeline finished")
         return
 
     LOGGER.info("Running all cinema spiders...")
-    run_spider() 
+    with REPORT.timer("stage.crawl"):
+        run_spider(refresh_details=args.refresh_details, job_dir=args.job_dir, spiders=args.spiders)
     LOGGER.info("Spider complete. Starting embedding sync...")
-    sync_embeddings(
-        refresh_all=args.refresh_all,
-        limit=args.limit,
-        batch_size=args.batch_size,
-        sleep_s=args.sleep,
-        dry_run=False,
-    )
+    with REPORT.timer("stage.embed"):
+        sync_embeddings(
+            refresh_all=args.refresh_all,
+            limit=args.limit,
+            batch_size=args.batch_size,
+            sleep_s=args.sleep,
+            dry_run=False,
+            time_budget_s=args.time_budget,
+        )
     LOGGER.info("Embeddings done. Starting enrichment sync...")
-    sync_enrichment(
-        apply=True,
-        refresh_all=args.refresh_enrichment,
-        limit=args.limit,
-        sleep_s=args.sleep,
-    )
+    with REPORT.timer("stage.enrich"):
+        sync_enrichment(
+            apply=True,
+            refresh_all=args.refresh_enrichment,
+            limit=args.limit,
+            sleep_s=args.sleep,
+            time_budget_s=args.time_budget,
+        )
     LOGGER.info("Pipeline finished")
 
 
@@ -0,0 +1,254 @@
+"""Long-running crawl scheduler: each spider on its own cadence.
+
+Usage (from repo root):
+    python scrapers/scheduler.py                                 # cadences from CRAWL_SCHEDULE in settings.py
+    python scrapers/scheduler.py --every angelika=1h --every film_forum=1d --max-concurrent 1
+    python scrapers/scheduler.py --once                          # run every spider once, then exit
+    python scrapers/scheduler.py --job-dir data/jobs --persist-report
+
+Every due spider is run as its own `run_spider_and_embed.py --pipelined --spiders
+<name>` subprocess. A Scrapy reactor cannot be restarted inside one process, and a
+subprocess keeps one site's crash or memory growth away from the others. Pipelined
+mode embeds and enriches only the movies that run committed, so an hourly Angelika
+poll does not re-scan the whole catalogue, and its sweep only touches the cinemas
+that spider wrote.
+
+After a run starts, the spider's next run is due interval * (1 ± jitter) later;
+first runs are spread over [0, jitter * interval) so a restart does not fire every
+spider at once. A spider is never run twice concurrently (a run longer than its
+interval delays the next one) and at most --max-concurrent runs happen at a time;
+due spiders wait, most overdue first.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "scrapers.settings")
+
+LOGGER = logging.getLogger("scheduler")
+
+RUNNER = ROOT / "scrapers" / "run_spider_and_embed.py"
+
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+_INTERVAL_RE = re.compile(r'^(\d+(?:\.\d+)?)([smhd]?)$')
+
+
+def parse_interval(text: str) -> float:
+    """'90', '30m', '1h', '1.5d' -> seconds."""
+    m = _INTERVAL_RE.match(text.strip().lower())
+    if not m:
+        raise ValueError(f"bad interval {text!r}; expected e.g. 900, 30m, 1h, 1d")
+    seconds = float(m.group(1)) * _UNITS[m.group(2) or 's']
+    if seconds <= 0:
+        raise ValueError(f"interval must be positive, got {text!r}")
+    return seconds
+
+
+@dataclass
+class SpiderSchedule:
+    name: str
+    interval_s: float
+    next_due: float = 0.0
+    process: subprocess.Popen | None = None
+    started_at: float | None = None
+    runs: int = 0
+    failures: int = 0
+
+
+class CrawlScheduler:
+    """Launches spider runs when due, within the concurrency limit.
+
+    `launch(name)` starts one run and returns a Popen-like object (`poll()`,
+    `returncode`, `terminate()`, `wait()`); `clock` returns monotonic seconds.
+    Both are injectable so tick() can be driven by tests.
+    """
+
+    def __init__(self, cadences: dict[str, float], launch: Callable[[str], subprocess.Popen],
+                 max_concurrent: int = 2, jitter: float = 0.1,
+                 clock: Callable[[], float] = time.monotonic, rng: random.Random | None = None):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be in [0, 1)")
+        self.launch = launch
+        self.max_concurrent = max_concurrent
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng or random.Random()
+        now = clock()
+        self.schedules = {
+            name: SpiderSchedule(name, interval, next_due=now + self.rng.uniform(0, jitter * interval))
+            for name, interval in cadences.items()
+        }
+
+    def _next_delay(self, interval_s: float) -> float:
+        return interval_s * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def running(self) -> list[SpiderSchedule]:
+        return [s for s in self.schedules.values() if s.process is not None]
+
+    def reap(self) -> list[SpiderSchedule]:
+        """Collect finished runs."""
+        done = []
+        now = self.clock()
+        for s in self.running():
+            code = s.process.poll()
+            if code is None:
+                continue
+            elapsed = now - s.started_at
+            if code == 0:
+                LOGGER.info("%s finished in %.0fs", s.name, elapsed)
+            else:
+                s.failures += 1
+                LOGGER.error("%s exited with code %s after %.0fs", s.name, code, elapsed)
+            s.process = None
+            done.append(s)
+        return done
+
+    def tick(self) -> list[str]:
+        """Reap finished runs, then launch due spiders up to the limit; return launched names."""
+        self.reap()
+        now = self.clock()
+        slots = self.max_concurrent - len(self.running())
+        due = sorted(
+            (s for s in self.schedules.values() if s.process is None and s.next_due <= now),
+            key=lambda s: s.next_due,
+        )
+        launched = []
+        for s in due[:max(slots, 0)]:
+            LOGGER.info("Starting %s (run %d)", s.name, s.runs + 1)
+            s.process = self.launch(s.name)
+            s.started_at = now
+            s.runs += 1
+            s.next_due = now + self._next_delay(s.interval_s)
+            launched.append(s.name)
+        return launched
+
+    def seconds_until_due(self) -> float:
+        idle = [s.next_due for s in self.schedules.values() if s.process is None]
+        if not idle:
+            return float('inf')
+        return max(0.0, min(idle) - self.clock())
+
+    def stop(self, timeout_s: float = 60.0) -> None:
+        """Ask running crawls to shut down (Scrapy closes gracefully on SIGTERM)."""
+        for s in self.running():
+            LOGGER.info("Stopping %s", s.name)
+            s.process.terminate()
+        for s in self.running():
+            try:
+                s.process.wait(timeout=timeout_s)
+            except subprocess.TimeoutExpired:
+                s.process.kill()
+            s.process = None
+
+
+def _runner_command(name: str, args: argparse.Namespace) -> list[str]:
+    cmd = [sys.executable, str(RUNNER), "--pipelined", "--spiders", name]
+    if args.job_dir:
+        # One job root per spider so each resumes only its own interrupted run.
+        cmd += ["--job-dir", str(Path(args.job_dir) / name)]
+    if args.persist_report:
+        cmd.append("--persist-report")
+    if args.profile:
+        cmd += ["--profile", args.profile]
+    return cmd
+
+
+def _cadences(args: argparse.Namespace, settings) -> dict[str, float]:
+    cadences = {name: float(s) for name, s in settings.getdict('CRAWL_SCHEDULE').items()}
+    for spec in args.every:
+        name, sep, interval = spec.partition('=')
+        if not sep:
+            raise SystemExit(f"--every expects NAME=INTERVAL, got {spec!r}")
+        cadences[name] = parse_interval(interval)
+    if args.spiders:
+        unknown = [name for name in args.spiders if name not in cadences]
+        if unknown:
+            raise SystemExit(f"No cadence for {', '.join(unknown)}: add it to CRAWL_SCHEDULE "
+                             f"or pass --every NAME=INTERVAL")
+        cadences = {name: cadences[name] for name in args.spiders}
+    return cadences
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run each cinema spider on its own cadence")
+    parser.add_argument("--every", action="append", default=[], metavar="NAME=INTERVAL",
+                        help="Override a spider's cadence, e.g. angelika=1h (units s, m, h, d)")
+    parser.add_argument("--spiders", nargs="+", default=None, metavar="NAME",
+                        help="Schedule only these spiders (default: every spider in CRAWL_SCHEDULE)")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="Most spider runs at once (default: CRAWL_SCHEDULE_MAX_CONCURRENT)")
+    parser.add_argument("--jitter", type=float, default=None,
+                        help="Fraction of the interval to randomise each run by (default: CRAWL_SCHEDULE_JITTER)")
+    parser.add_argument("--once", action="store_true",
+                        help="Run every scheduled spider once (still within --max-concurrent), then exit")
+    parser.add_argument("--job-dir", metavar="DIR", default=None,
+                        help="Pass --job-dir DIR/<spider> to each run so interrupted runs resume")
+    parser.add_argument("--persist-report", action="store_true",
+                        help="Pass --persist-report to each run")
+    parser.add_argument("--profile", default=None,
+                        help="Pass --profile NAME (scrapers/throughput.py) to each run")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    from scrapy.utils.project import get_project_settings
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _build_parser().parse_args(argv)
+    settings = get_project_settings()
+    cadences = _cadences(args, settings)
+    if not cadences:
+        raise SystemExit("Nothing to schedule")
+
+    scheduler = CrawlScheduler(
+        cadences,
+        launch=lambda name: subprocess.Popen(_runner_command(name, args), cwd=ROOT),
+        max_concurrent=args.max_concurrent or settings.getint('CRAWL_SCHEDULE_MAX_CONCURRENT', 2),
+        jitter=settings.getfloat('CRAWL_SCHEDULE_JITTER', 0.1) if args.jitter is None else args.jitter,
+    )
+    if args.once:
+        for s in scheduler.schedules.values():
+            s.next_due = 0.0
+    for name, interval in sorted(cadences.items()):
+        LOGGER.info("Scheduling %s every %.0fs", name, interval)
+
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    try:
+        while not stopping:
+            scheduler.tick()
+            if args.once and all(s.runs for s in scheduler.schedules.values()) and not scheduler.running():
+                break
+            time.sleep(min(scheduler.seconds_until_due(), 5.0))
+    finally:
+        scheduler.stop()
+    if any(s.failures for s in scheduler.schedules.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
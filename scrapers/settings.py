@@ -19,16 +19,13 @@ NEWSPIDER_MODULE = "scrapers.spiders"
 # Obey robots.txt rules
 ROBOTSTXT_OBEY = True
 
-# Configure maximum concurrent requests performed by Scrapy (default: 16)
-#CONCURRENT_REQUESTS = 32
-
-# Configure a delay for requests for the same website (default: 0)
-# See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
-# See also autothrottle settings and docs
-#DOWNLOAD_DELAY = 3
-# The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
-#CONCURRENT_REQUESTS_PER_IP = 16
+# Concurrency, download delays, AutoThrottle and retries come from a named profile
+# in scrapers/throughput.py ('polite', 'default', 'fast'), applied per spider by the
+# ThroughputProfile add-on. Pick one with `run_spider_and_embed.py --profile NAME`.
+THROUGHPUT_PROFILE = "default"
+ADDONS = {
+    "scrapers.throughput.ThroughputProfile": 0,
+}
 
 # Disable cookies (enabled by default)
 #COOKIES_ENABLED = False
@@ -45,14 +42,21 @@ ROBOTSTXT_OBEY = True
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
+    'scrapers.recording.HttpRecordingMiddleware': 50,
     'scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware': 810,
 }
 
+# Offline record/replay (scrapers/recording.py): 'record', 'replay', or None (off).
+# Set per run by `run_spider_and_embed.py --record DIR / --replay DIR`.
+HTTP_RECORDING_MODE = None
+HTTP_RECORDING_DIR = "data/recordings"
+
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-#EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-#}
+EXTENSIONS = {
+    # Per-spider request latency and item rates for the run report (src/database/crawl_report.py)
+    "scrapers.instrumentation.CrawlInstrumentation": 500,
+}
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
@@ -60,19 +64,6 @@ ITEM_PIPELINES = {
    "scrapers.pipelines.CinemaScraperPipeline": 300,
 }
 
-# Enable and configure the AutoThrottle extension (disabled by default)
-# See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
-# The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
-# The maximum download delay to be set in case of high latencies
-#AUTOTHROTTLE_MAX_DELAY = 60
-# The average number of requests Scrapy should be sending in parallel to
-# each remote server
-#AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
-# Enable showing throttling stats for every response received:
-#AUTOTHROTTLE_DEBUG = False
-
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
 #HTTPCACHE_ENABLED = True
@@ -81,6 +72,29 @@ ITEM_PIPELINES = {
 #HTTPCACHE_IGNORE_HTTP_CODES = []
 #HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
 
+# Persistent film-detail page cache (scrapers/detail_cache.py). Detail pages fetched
+# within the freshness window are not re-requested; older ones are revalidated with
+# If-None-Match / If-Modified-Since. Disabled for --dry-run, which never touches the DB.
+DETAIL_CACHE_ENABLED = True
+DETAIL_CACHE_FRESHNESS_DAYS = 14
+
+# What CinemaScraperPipeline's stale-showtime sweep does with future rows the crawl
+# did not re-write: 'delete' them, or 'archive' them into showtimes_archive.
+SHOWTIME_SWEEP_MODE = "delete"
+
+# Per-spider cadences for the long-running scheduler (scrapers/scheduler.py), in
+# seconds. The Angelika JSON API is cheap to poll; the HTML sites are not. Each run
+# waits interval * (1 ± CRAWL_SCHEDULE_JITTER) and at most
+# CRAWL_SCHEDULE_MAX_CONCURRENT spiders crawl at once.
+CRAWL_SCHEDULE = {
+    "angelika": 3600,
+    "metrograph": 86400,
+    "film_forum": 86400,
+    "ifc_center": 86400,
+}
+CRAWL_SCHEDULE_JITTER = 0.1
+CRAWL_SCHEDULE_MAX_CONCURRENT = 2
+
 # Set settings whose default value is deprecated to a future-proof value
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 FEED_EXPORT_ENCODING = "utf-8"
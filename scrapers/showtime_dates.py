@@ -0,0 +1,87 @@
+"""Single-pass parser for calendar-style showtime labels.
+
+Metrograph's calendar splits each showtime into a date heading and a time link:
+
+    <h5 class="sr-only">Sat April <span class="day-number">25</span></h5>
+    <div class="film_day"><a ...>7:00pm</a></div>
+
+``parse_showtime('Sat April', '25', '7:00pm')`` turns that into a datetime. Both
+halves are matched by one precompiled regex each, accepting everything the old
+strptime cascade did (weekday optional, full or abbreviated month, "7:00pm" or
+"7:00 PM") without raising and catching an exception per miss.
+
+The year is not on the page: a month earlier than the current one is taken to be
+next year. Pass ``today`` once per page rather than calling it per showtime.
+
+Labels repeat heavily across a calendar (every film on a day shares the heading,
+and a handful of times cover most screenings), so the year-independent part of
+the parse is memoized on the raw (date_text, day_number, time_text) strings.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+_MONTHS = {
+    name: i
+    for i, names in enumerate((
+        ('january', 'jan'), ('february', 'feb'), ('march', 'mar'), ('april', 'apr'),
+        ('may',), ('june', 'jun'), ('july', 'jul'), ('august', 'aug'),
+        ('september', 'sep'), ('october', 'oct'), ('november', 'nov'), ('december', 'dec'),
+    ), start=1)
+    for name in names
+}
+
+# "[Weekday] Month [day]" - the day may instead come from the separate day-number span.
+_DATE_RE = re.compile(r'^\s*(?:([a-z]+)\s+)?([a-z]+)(?:\s+(\d{1,2}))?\s*$', re.IGNORECASE)
+# "7:00pm", "7:00 PM", "11:15 p.m."
+_TIME_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*([ap])\.?m\.?\s*$', re.IGNORECASE)
+
+_MEMO_SIZE = 4096
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _parse_parts(date_text: str, day_number: str | None, time_text: str) -> tuple[int, int, int, int] | None:
+    """(month, day, hour, minute) for one label, or None if it doesn't parse."""
+    dm = _DATE_RE.match(date_text)
+    tm = _TIME_RE.match(time_text)
+    if not dm or not tm:
+        return None
+
+    _weekday, month_name, day = dm.groups()
+    month = _MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+    if day_number:
+        day = day_number.strip()
+    if not day or not day.isdigit():
+        return None
+
+    hour, minute, meridiem = int(tm.group(1)), int(tm.group(2)), tm.group(3).lower()
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    hour = hour % 12 + (12 if meridiem == 'p' else 0)
+    return month, int(day), hour, minute
+
+
+def parse_showtime(
+    date_text: str | None,
+    day_number: str | None,
+    time_text: str | None,
+    today: date | None = None,
+) -> datetime | None:
+    """Datetime for a calendar label, or None if it can't be parsed."""
+    if not date_text or not time_text:
+        return None
+    parts = _parse_parts(date_text, day_number, time_text)
+    if parts is None:
+        return None
+    month, day, hour, minute = parts
+    today = today or date.today()
+    year = today.year + 1 if month < today.month else today.year
+    try:
+        return datetime(year, month, day, hour, minute)
+    except ValueError:  # e.g. April 31
+        return None
+
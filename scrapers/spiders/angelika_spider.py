@@ -5,6 +5,8 @@ from zoneinfo import ZoneInfo
 import scrapy
 from lxml.html import fromstring
 
+from scrapers.items import FilmItem
+
 
 _ET = ZoneInfo('America/New_York')
 
@@ -94,8 +96,6 @@ class AngelikaSpider(scrapy.Spider):
     cinemas = [name for _, _, name in CINEMAS]
 
     custom_settings = {
-        'DOWNLOAD_DELAY': 1,
-        'CONCURRENT_REQUESTS_PER_DOMAIN': 2,
         'ROBOTSTXT_OBEY': False,
         'USER_AGENT': (
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
@@ -158,6 +158,18 @@ class AngelikaSpider(scrapy.Spider):
                 f'https://angelikafilmcenter.com/{cinema_slug}/movies/details/{movie_slug}'
             )
 
+            item = FilmItem(
+                cinema=cinema,
+                title=_clean(title),
+                details_link=details_link,
+                image_url=image_url,
+                director1=_clean(dirs[0]) if dirs else None,
+                director2=_clean(dirs[1]) if len(dirs) > 1 else None,
+                year=year,
+                runtime=runtime,
+                synopsis=synopsis,
+                trailer_url=film.get('youtube_id') or None,
+            )
             for showdate in film.get('showdates', []):
                 for showtype in showdate.get('showtypes', []):
                     type_name = showtype.get('type', '') or ''
@@ -178,20 +190,7 @@ class AngelikaSpider(scrapy.Spider):
                         else:
                             ticket_link = f'{details_link}#showTime'
 
-                        yield {
-                            'cinema':            cinema,
-                            'title':             _clean(title),
-                            'show_time':         show_dt,
-                            'show_day':          show_dt.strftime('%A'),
-                            'ticket_link':       ticket_link,
-                            'details_link':      details_link,
-                            'image_url':         image_url,
-                            'director1':         _clean(dirs[0]) if dirs else None,
-                            'director2':         _clean(dirs[1]) if len(dirs) > 1 else None,
-                            'year':              year,
-                            'runtime':           runtime,
-                            'format':            fmt,
-                            'synopsis':          synopsis,
-                            'special_attributes': special_attr,
-                            'trailer_url':       film.get('youtube_id') or None,
-                        }
+                        item.add(show_dt, fmt, ticket_link, special_attr)
+
+            if item.showtimes:
+                yield item
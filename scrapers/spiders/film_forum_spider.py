@@ -3,6 +3,9 @@ import re
 
 import scrapy
 
+from scrapers.detail_cache import DetailCacheMixin
+from scrapers.items import FilmItem
+
 
 def _clean(val):
     """Strip non-breaking spaces and leading/trailing whitespace from scraped text."""
@@ -56,13 +59,16 @@ def _parse_film_forum_time(time_str: str, date: datetime.date) -> datetime.datet
     return datetime.datetime(date.year, date.month, date.day, h, m)
 
 
-class FilmForumSpider(scrapy.Spider):
+class FilmForumSpider(DetailCacheMixin, scrapy.Spider):
     name = 'film_forum'
     cinemas = ['FILM FORUM']  # every cinema this spider emits; see DryRunCollectorPipeline
     start_urls = ['https://filmforum.org/now_playing']
+    # The ticket link comes from the detail page, so a cached one is at most a day old.
+    detail_cache_max_freshness_days = 1
 
     custom_settings = {
         'DOWNLOADER_MIDDLEWARES': {
+            'scrapers.recording.HttpRecordingMiddleware': 50,
             'scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware': 810,
         },
         'SPIDER_MIDDLEWARES': {},
@@ -133,15 +139,11 @@ class FilmForumSpider(scrapy.Spider):
             return
 
         for detail_url, showtimes in url_showtimes.items():
-            yield scrapy.Request(
-                detail_url,
-                callback=self.parse_film,
-                meta={'showtimes': showtimes},
-            )
+            yield from self.follow_detail(detail_url, {'showtimes': showtimes})
 
-    def parse_film(self, response):
+    def _film_metadata(self, response):
         """
-        Detail page: extract metadata and combine with showtimes from listing page.
+        Detail page: extract film-level metadata (cached across crawls by DetailCacheMixin).
         Structure:
           <h2 class="main-title">TITLE</h2>
           <div class="copy">
@@ -150,8 +152,6 @@ class FilmForumSpider(scrapy.Spider):
           </div>
           <a class="button medium blue" href="https://my.filmforum.org/events/...">
         """
-        showtimes: list[tuple[datetime.date, str]] = response.meta['showtimes']
-
         # --- Title ---
         title_raw = ' '.join(
             t.strip() for t in response.css('h2.main-title *::text, h2.main-title::text').getall()
@@ -159,7 +159,7 @@ class FilmForumSpider(scrapy.Spider):
         )
         if not title_raw:
             self.logger.warning(f"No title at {response.url}")
-            return
+            return None
 
         # --- Metadata paragraph ---
         # <p><strong>India, 1970<br/>Directed by Satyajit Ray<br/>Starring...<br/>Approx. 116 min.</strong></p>
@@ -240,25 +240,41 @@ class FilmForumSpider(scrapy.Spider):
             'a.button.medium.blue::attr(href), a[class*="button"][class*="blue"]::attr(href)'
         ).get()
 
+        return {
+            'title': title_raw,
+            'details_link': response.url,
+            'image_url': poster_url,
+            'ticket_link': ticket_link,
+            'director': director,
+            'year': year,
+            'runtime': runtime,
+            'format': format_val,
+            'synopsis': synopsis,
+        }
+
+    def _film_items(self, metadata: dict, meta: dict):
+        """Combine detail-page metadata with the listing page's (date, time) pairs."""
+        showtimes: list[tuple[datetime.date, str]] = meta['showtimes']
+        title_raw = metadata['title']
+        fmt = _clean(metadata['format'])
+
+        item = FilmItem(
+            cinema='FILM FORUM',
+            title=_clean(title_raw),
+            details_link=metadata['details_link'],
+            image_url=metadata['image_url'],
+            director1=_clean(metadata['director']),
+            year=metadata['year'],
+            runtime=metadata['runtime'],
+            synopsis=_clean(metadata['synopsis']),
+        )
         for date, ts in showtimes:
             try:
                 show_dt = _parse_film_forum_time(ts, date)
             except (ValueError, TypeError):
                 self.logger.warning(f"Unparseable time {ts!r} for {title_raw!r}")
                 continue
+            item.add(show_dt, fmt, metadata['ticket_link'])
 
-            yield {
-                'cinema': 'FILM FORUM',
-                'title': _clean(title_raw),
-                'show_time': show_dt,
-                'show_day': show_dt.strftime('%A'),
-                'ticket_link': ticket_link,
-                'details_link': response.url,
-                'image_url': poster_url,
-                'director1': _clean(director),
-                'director2': None,
-                'year': year,
-                'runtime': runtime,
-                'format': _clean(format_val),
-                'synopsis': _clean(synopsis),
-            }
+        if item.showtimes:
+            yield item
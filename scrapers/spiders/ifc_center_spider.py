@@ -3,6 +3,9 @@ import re
 
 import scrapy
 
+from scrapers.detail_cache import DetailCacheMixin
+from scrapers.items import FilmItem, Showing
+
 
 def _clean(val):
     """Strip non-breaking spaces and leading/trailing whitespace from scraped text."""
@@ -41,13 +44,14 @@ def _infer_year(month: int, day: int, today: datetime.date) -> int:
     return today.year
 
 
-class IFCCenterSpider(scrapy.Spider):
+class IFCCenterSpider(DetailCacheMixin, scrapy.Spider):
     name = 'ifc_center'
     cinemas = ['IFC CENTER']  # every cinema this spider emits; see DryRunCollectorPipeline
     start_urls = ['https://www.ifccenter.com/']
 
     custom_settings = {
         'DOWNLOADER_MIDDLEWARES': {
+            'scrapers.recording.HttpRecordingMiddleware': 50,
             'scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware': 810,
         },
         'SPIDER_MIDDLEWARES': {},
@@ -60,6 +64,9 @@ class IFCCenterSpider(scrapy.Spider):
         ),
         'ROBOTSTXT_OBEY': False,
     }
+    # Set by `run_spider_and_embed.py --availability-only`: emit ticket_link records
+    # straight from the daily schedule and never follow detail pages.
+    availability_only = False
 
     def parse(self, response):
         today = datetime.date.today()
@@ -113,32 +120,26 @@ class IFCCenterSpider(scrapy.Spider):
 
                     slug_items.setdefault(slug, []).append({
                         'show_time': show_dt,
-                        'show_day': show_dt.strftime('%A'),
                         'ticket_link': ticket_href or None,
                     })
 
         for slug, items in slug_items.items():
             detail_url = f'https://www.ifccenter.com/films/{slug}/'
-            yield scrapy.Request(
-                detail_url,
-                callback=self.parse_film,
-                meta={
-                    'slug': slug,
-                    'items': items,
-                    'title': slug_title.get(slug, ''),
-                },
-            )
-
-    def parse_film(self, response):
-        meta = response.meta
-        partial_items: list[dict] = meta['items']
-        listing_title: str = meta['title']
+            if self.availability_only:
+                yield FilmItem(cinema='IFC CENTER', details_link=detail_url, showtimes=[
+                    Showing(item['show_time'], None, item['ticket_link']) for item in items
+                ])
+                continue
+            yield from self.follow_detail(detail_url, {
+                'slug': slug,
+                'items': items,
+                'title': slug_title.get(slug, ''),
+            })
 
+    def _film_metadata(self, response):
         # --- Title ---
-        title = (
-            response.css('h1.title::text, h1::text').get(default='').strip()
-            or listing_title
-        )
+        # Empty when the page has no <h1>; _film_items falls back to the listing title.
+        title = response.css('h1.title::text, h1::text').get(default='').strip()
 
         # --- Metadata from <ul><li><strong>Label</strong> Value</li></ul> ---
         director = None
@@ -187,21 +188,36 @@ class IFCCenterSpider(scrapy.Spider):
         raw_poster = response.css('img.film-featured.wp-post-image::attr(src)').get()
         poster_url = response.urljoin(raw_poster) if raw_poster else None
 
+        return {
+            'title': title,
+            # The URL asked for, not where it redirected: availability runs build it the same way.
+            'details_link': response.meta.get('detail_url', response.url),
+            'image_url': poster_url,
+            'director': director,
+            'year': year,
+            'runtime': runtime,
+            'format': format_val,
+            'synopsis': synopsis,
+        }
+
+    def _film_items(self, metadata: dict, meta: dict):
+        partial_items: list[dict] = meta['items']
+        title = metadata['title'] or meta['title']
+        director = metadata['director']
         directors = [d.strip() for d in director.split(',')] if director else []
-
-        for item in partial_items:
-            yield {
-                'cinema': 'IFC CENTER',
-                'title': _clean(title),
-                'show_time': item['show_time'],
-                'show_day': item['show_day'],
-                'ticket_link': item['ticket_link'],
-                'details_link': response.url,
-                'image_url': poster_url,
-                'director1': _clean(directors[0]) if directors else None,
-                'director2': _clean(directors[1]) if len(directors) > 1 else None,
-                'year': year,
-                'runtime': runtime,
-                'format': _clean(format_val),
-                'synopsis': _clean(synopsis),
-            }
+        fmt = _clean(metadata['format'])
+
+        item = FilmItem(
+            cinema='IFC CENTER',
+            title=_clean(title),
+            details_link=metadata['details_link'],
+            image_url=metadata['image_url'],
+            director1=_clean(directors[0]) if directors else None,
+            director2=_clean(directors[1]) if len(directors) > 1 else None,
+            year=metadata['year'],
+            runtime=metadata['runtime'],
+            synopsis=_clean(metadata['synopsis']),
+        )
+        for partial in partial_items:
+            item.add(partial['show_time'], fmt, partial['ticket_link'])
+        yield item
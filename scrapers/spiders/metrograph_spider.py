@@ -1,7 +1,11 @@
 import re
 
 import scrapy
-from datetime import datetime
+from datetime import date
+
+from scrapers.detail_cache import DetailCacheMixin
+from scrapers.items import FilmItem, Showing
+from scrapers.showtime_dates import parse_showtime
 
 
 def _clean(val):
@@ -27,16 +31,16 @@ def _para_text(selector):
     return re.sub(r'\s+', ' ', _walk(selector.root)).strip()
 
 
-class MetrographSpider(scrapy.Spider):
+class MetrographSpider(DetailCacheMixin, scrapy.Spider):
     name = 'metrograph'
     cinemas = ['METROGRAPH']  # every cinema this spider emits; see DryRunCollectorPipeline
     start_urls = ['https://metrograph.com/film/']
-    custom_settings = {
-        'DOWNLOAD_DELAY': 1,
-        'CONCURRENT_REQUESTS_PER_DOMAIN': 1,
-    }
+    # Set by `run_spider_and_embed.py --availability-only`: emit ticket_link records
+    # straight from the calendar and never follow detail pages.
+    availability_only = False
 
     def parse(self, response):
+        today = date.today()
         for block in response.css('div.col-sm-12.homepage-in-theater-movie'):
             ### MOVIE-LEVEL INFO
             title = block.css('h3.movie_title a::text').get(default='').strip()
@@ -90,56 +94,14 @@ class MetrographSpider(scrapy.Spider):
                     continue
                 time_text = time_text.strip()
 
-                candidates = []
-                if date_text:
-                    parts = date_text.split()
-                    month_part = parts[1] if len(parts) > 1 else parts[0]
-                    if day_number:
-                        candidates.append(f"{month_part} {day_number} {time_text}")
-                        candidates.append(f"{parts[0]} {month_part} {day_number} {time_text}")
-                    else:
-                        candidates.append(f"{date_text} {time_text}")
-
-                date_formats = [
-                    "%b %d %I:%M%p",
-                    "%B %d %I:%M%p",
-                    "%a %b %d %I:%M%p",
-                    "%A %B %d %I:%M%p",
-                    "%b %d %I:%M %p",
-                    "%B %d %I:%M %p",
-                    "%a %b %d %I:%M %p",
-                    "%A %B %d %I:%M %p",
-                ]
-
-                parsed_dt = None
-                for cand in candidates:
-                    for fmt in date_formats:
-                        try:
-                            parsed_dt = datetime.strptime(cand, fmt)
-                            break
-                        except Exception:
-                            continue
-                    if parsed_dt:
-                        break
-
-                if not parsed_dt:
+                timestamp = parse_showtime(date_text, day_number, time_text, today)
+                if not timestamp:
                     self.logger.error(
                         f"Failed to parse date/time for title={title!r}: "
                         f"date_text={date_text!r} day_number={day_number!r} time={time_text!r}"
                     )
                     continue
 
-                today = datetime.today()
-                current_year = today.year
-                if parsed_dt.month < today.month:
-                    current_year += 1
-                timestamp = parsed_dt.replace(year=current_year)
-
-                try:
-                    show_day = timestamp.strftime('%A')
-                except Exception:
-                    show_day = None
-
                 ticket_link = 'sold_out'
                 title_attr = day_div.css('a::attr(title)').get()
                 href_attr = day_div.css('a::attr(href)').get()
@@ -148,49 +110,52 @@ class MetrographSpider(scrapy.Spider):
 
                 showtimes.append({
                     'show_time': timestamp,
-                    'show_day': show_day,
                     'ticket_link': ticket_link,
                 })
 
             if not showtimes or not detail_href:
                 continue
 
-            yield scrapy.Request(
-                response.urljoin(detail_href),
-                callback=self.parse_film,
-                meta={
-                    'showtimes': showtimes,
-                    'title': title,
-                    'image_url': image_url,
-                    'director1': director1,
-                    'director2': director2,
-                    'year': year,
-                    'runtime': runtime,
-                    'format': format,
-                },
-            )
-
-    def parse_film(self, response):
-        meta = response.meta
-        showtimes = meta['showtimes']
+            if self.availability_only:
+                yield FilmItem(cinema='METROGRAPH', details_link=response.urljoin(detail_href), showtimes=[
+                    Showing(st['show_time'], None, st['ticket_link']) for st in showtimes
+                ])
+                continue
 
+            yield from self.follow_detail(response.urljoin(detail_href), {
+                'showtimes': showtimes,
+                'title': title,
+                'image_url': image_url,
+                'director1': director1,
+                'director2': director2,
+                'year': year,
+                'runtime': runtime,
+                'format': format,
+            })
+
+    def _film_metadata(self, response):
         # Synopsis lives in div.movie-info; h1/h5/.showtimes don't use <p>, so p tags are synopsis only
         movie_info = response.css('div.movie-info')
         parts = [t for p in movie_info.css('p') if (t := _para_text(p))]
-        synopsis = '\n\n'.join(parts) or None
-        for st in showtimes:
-            yield {
-                'cinema': 'METROGRAPH',
-                'title': _clean(meta['title']),
-                'show_time': st['show_time'],
-                'show_day': st['show_day'],
-                'ticket_link': st['ticket_link'],
-                'details_link': response.url,
-                'image_url': meta['image_url'],
-                'director1': _clean(meta['director1']),
-                'director2': _clean(meta['director2']),
-                'year': meta['year'],
-                'runtime': meta['runtime'],
-                'format': _clean(meta['format']),
-                'synopsis': _clean(synopsis),
-            }
+        return {
+            # The URL asked for, not where it redirected: availability runs build it the same way.
+            'details_link': response.meta.get('detail_url', response.url),
+            'synopsis': '\n\n'.join(parts) or None,
+        }
+
+    def _film_items(self, metadata: dict, meta: dict):
+        # Everything but the synopsis comes from the listing page, so it stays current
+        # even when the detail page is served from the cache.
+        fmt = _clean(meta['format'])
+        yield FilmItem(
+            cinema='METROGRAPH',
+            title=_clean(meta['title']),
+            details_link=metadata['details_link'],
+            image_url=meta['image_url'],
+            director1=_clean(meta['director1']),
+            director2=_clean(meta['director2']),
+            year=meta['year'],
+            runtime=meta['runtime'],
+            synopsis=_clean(metadata['synopsis']),
+            showtimes=[Showing(st['show_time'], fmt, st['ticket_link']) for st in meta['showtimes']],
+        )
@@ -53,7 +53,7 @@ TMDB_COLS = [
     'tmdb_title_zh',
 ]
 
-ALL_ENRICHMENT_COLS = OMDB_COLS + TMDB_COLS + ['enriched_at']
+ALL_ENRICHMENT_COLS = OMDB_COLS + TMDB_COLS + ['enriched_at', 'ratings_refreshed_at', 'metadata_refreshed_at']
 
 
 def _fmt(val) -> str:
@@ -64,6 +64,7 @@ _ENRICHMENT_FIELDS = [
     'tmdb_poster_url', 'tmdb_release_date', 'tmdb_trailer_url',
     'tmdb_title_zh', 'embedding', 'embedding_model',
     'embedding_source_hash', 'enriched_at', 'embedded_at',
+    'ratings_refreshed_at', 'metadata_refreshed_at',
 ]
 
 
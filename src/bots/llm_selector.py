@@ -1,10 +1,10 @@
 import os
 import json
-import requests
 from openai import OpenAI
 import tiktoken
 
 from errors import LLMError
+from database import http_client
 from database.setup_db import get_engine
 from database.queries import insert_recommendation_log
 
@@ -92,7 +92,7 @@ def ollama_generate(prompt: str, model: str,
             "temperature": temperature,
         },
     }
-    resp = requests.post(f"{OLLAMA_BASE}/generate", json=payload, timeout=DEFAULT_OLLAMA_TIMEOUT)
+    resp = http_client.post(f"{OLLAMA_BASE}/generate", json=payload, timeout=DEFAULT_OLLAMA_TIMEOUT)
     resp.raise_for_status()
 
     try:
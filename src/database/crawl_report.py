@@ -0,0 +1,160 @@
+"""Per-run ingest instrumentation: counters, latency histograms and a JSON report.
+
+One process-wide ``REPORT`` collects measurements from every stage of an ingest run:
+
+  - the spiders, through the Scrapy extension in scrapers/instrumentation.py
+    (per-spider request counts, download latency, items per second);
+  - CinemaScraperPipeline (DB write latency per item);
+  - sync_embeddings (OpenAI batch latency, commit latency);
+  - sync_enrichment (latency of each OMDb/TMDb call).
+
+``scrapers/run_spider_and_embed.py`` writes ``REPORT.as_dict()`` as JSON at the end of
+the run and, with --persist-report, inserts it into the ``crawl_runs`` table so
+ingest performance can be compared run over run.
+
+No third-party imports at module level: both sync modules import this from the
+web-app and the scraper contexts.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Upper bounds, in milliseconds, of the latency histogram buckets; the last bucket is open.
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def _histogram(values_ms: list[float]) -> dict[str, int]:
+    counts = {f'le_{b}': 0 for b in HISTOGRAM_BUCKETS_MS}
+    counts['inf'] = 0
+    for v in values_ms:
+        for b in HISTOGRAM_BUCKETS_MS:
+            if v <= b:
+                counts[f'le_{b}'] += 1
+                break
+        else:
+            counts['inf'] += 1
+    return counts
+
+
+class RunReport:
+    """Thread-safe collector of timings, counters and spider summaries for one run."""
+
+    def __init__(self, mode: str = 'full'):
+        self._lock = threading.Lock()
+        self.reset(mode)
+
+    def reset(self, mode: str = 'full') -> None:
+        with self._lock:
+            self.mode = mode
+            self.started_at = datetime.now(timezone.utc)
+            self.finished_at: datetime | None = None
+            self._timings: dict[str, list[float]] = {}
+            self._counters: dict[str, int] = {}
+            self.spiders: dict[str, dict] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._timings.setdefault(name, []).append(seconds)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str):
+        """Decorator form of timer()."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def set_spider(self, name: str, summary: dict) -> None:
+        with self._lock:
+            self.spiders[name] = summary
+
+    def finish(self) -> None:
+        self.finished_at = datetime.now(timezone.utc)
+
+    def timing_summary(self, name: str) -> dict:
+        with self._lock:
+            values = sorted(self._timings.get(name, ()))
+        ms = [v * 1000 for v in values]
+        return {
+            'count': len(ms),
+            'total_s': round(sum(values), 3),
+            'mean_ms': round(sum(ms) / len(ms), 2) if ms else 0.0,
+            'p50_ms': round(_percentile(ms, 0.50), 2),
+            'p90_ms': round(_percentile(ms, 0.90), 2),
+            'p99_ms': round(_percentile(ms, 0.99), 2),
+            'max_ms': round(ms[-1], 2) if ms else 0.0,
+            'histogram_ms': _histogram(ms),
+        }
+
+    def as_dict(self) -> dict:
+        finished = self.finished_at or datetime.now(timezone.utc)
+        with self._lock:
+            names = sorted(self._timings)
+            counters = dict(sorted(self._counters.items()))
+            spiders = {k: dict(v) for k, v in sorted(self.spiders.items())}
+        return {
+            'mode': self.mode,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': finished.isoformat(),
+            'wall_time_s': round((finished - self.started_at).total_seconds(), 3),
+            'spiders': spiders,
+            'timings': {name: self.timing_summary(name) for name in names},
+            'counters': counters,
+        }
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.as_dict(), indent=2, default=str))
+        return path
+
+    def persist(self, engine) -> None:
+        """Insert this report as one row of crawl_runs."""
+        report = self.as_dict()
+        conn = engine.raw_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO crawl_runs (started_at, finished_at, mode, wall_time_s, report)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (
+                self.started_at,
+                self.finished_at or datetime.now(timezone.utc),
+                self.mode,
+                report['wall_time_s'],
+                json.dumps(report, default=str),
+            ))
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+
+# Imported by reference everywhere, so start a new run with REPORT.reset(mode).
+REPORT = RunReport()
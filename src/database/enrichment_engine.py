@@ -0,0 +1,96 @@
+"""Concurrency primitives for sync_enrichment: token-bucket rate limiters and an
+ordered, bounded thread-pool map.
+
+Enrichment is I/O bound: each movie waits on up to three OMDb and four TMDb
+round-trips, so movies are looked up on a pool of worker threads while one
+TokenBucket per API keeps the combined request rate under that API's limit,
+however many workers there are. ordered_map() keeps at most `max_in_flight`
+movies submitted at once (memory and pending requests stay bounded for large
+backfills) and yields results in input order, so logging and DB writes happen on
+the calling thread exactly as in the sequential loop. sync_embeddings uses
+ordered_map() the same way for its OpenAI batches.
+
+Pure stdlib; no DB or network access.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `burst`.
+
+    acquire() blocks until the caller's token is due and returns the seconds
+    waited. A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(self._clock())
+            # Take the token now, going into debt if the bucket is empty; the debt
+            # is the caller's place in line, so waiters are served in arrival order.
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+        # Sleep outside the lock so other threads can reserve meanwhile.
+        self._sleep(delay)
+        return delay
+
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], workers: int,
+                max_in_flight: int | None = None) -> Iterator[tuple[T, R | BaseException]]:
+    """Yield (item, fn(item)) in input order, running fn on `workers` threads.
+
+    At most `max_in_flight` items (default 2 * workers) are submitted but not yet
+    yielded. An exception raised by fn is yielded in place of its result rather
+    than aborting the remaining items. With workers <= 1 everything runs inline.
+    """
+    if workers <= 1:
+        for item in items:
+            try:
+                yield item, fn(item)
+            except Exception as e:
+                yield item, e
+        return
+
+    limit = max(max_in_flight or 2 * workers, workers)
+    pending: deque[tuple[T, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='enrich') as pool:
+        for item in items:
+            pending.append((item, pool.submit(fn, item)))
+            if len(pending) >= limit:
+                yield _resolve(*pending.popleft())
+        while pending:
+            yield _resolve(*pending.popleft())
+
+
+def _resolve(item, future: Future):
+    try:
+        return item, future.result()
+    except Exception as e:
+        return item, e
@@ -0,0 +1,155 @@
+"""Batched writes of enrichment results: one UPDATE ... FROM (VALUES ...) per batch.
+
+Writing through the ORM cost every enriched movie its own session, a
+``session.get(Movie, id)`` that loads the whole row (1536-d embedding included)
+just to set a dozen rating and metadata columns, and its own commit.
+update_enrichment() instead sets only the enrichment columns, for a whole batch
+of movies, straight from a VALUES list:
+
+    UPDATE movies AS m SET imdb_rating = v.imdb_rating, ...
+    FROM (VALUES (...), (...)) AS v (id, imdb_rating, ...)
+    WHERE m.id = v.id
+
+A movie only gets the columns its lookup produced (an OMDb-only hit leaves the
+TMDb columns alone, as before), so rows are grouped by the set of columns they
+carry: at most a handful of statements per batch. The same transaction clears
+the movies' enrichment_misses rows.
+
+EnrichmentWriter buffers results from the enrichment loop and flushes every
+`batch_size` movies. If a batch fails, it is rolled back and retried row by row,
+so one bad value costs one movie, not the batch.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from src.database.crawl_report import REPORT
+
+LOGGER = logging.getLogger(__name__)
+
+# Every column enrichment may write, with the type its VALUES entry is cast to
+# (a column of NULLs would otherwise be typed text).
+ENRICHMENT_COLUMNS = {
+    'imdb_id': 'text',
+    'imdb_rating': 'numeric',
+    'imdb_votes': 'integer',
+    'omdb_rt_score': 'integer',
+    'omdb_metacritic_score': 'integer',
+    'tmdb_id': 'integer',
+    'tmdb_original_title': 'text',
+    'tmdb_genres': 'text[]',
+    'tmdb_origin_countries': 'text[]',
+    'tmdb_original_language': 'text',
+    'tmdb_spoken_languages': 'text[]',
+    'tmdb_tagline': 'text',
+    'tmdb_overview': 'text',
+    'tmdb_runtime': 'integer',
+    'tmdb_collection_name': 'text',
+    'tmdb_poster_url': 'text',
+    'tmdb_release_date': 'date',
+    'tmdb_trailer_url': 'text',
+    'tmdb_title_zh': 'text',
+    'enriched_at': 'timestamptz',
+    'ratings_refreshed_at': 'timestamptz',
+    'metadata_refreshed_at': 'timestamptz',
+}
+
+# Bookkeeping columns stamped for each refresh tier a result came from.
+TIER_STAMPS = {
+    'full': ('enriched_at', 'ratings_refreshed_at', 'metadata_refreshed_at'),
+    'ratings': ('ratings_refreshed_at',),
+    'metadata': ('metadata_refreshed_at',),
+}
+
+
+def _update_sql(columns: tuple[str, ...]) -> tuple[str, str]:
+    """(statement, execute_values template) updating `columns` by id."""
+    statement = f"""
+        UPDATE movies AS m
+        SET {', '.join(f'{c} = v.{c}' for c in columns)}
+        FROM (VALUES %s) AS v (id, {', '.join(columns)})
+        WHERE m.id = v.id
+    """
+    template = '(%s::integer, ' + ', '.join(f'%s::{ENRICHMENT_COLUMNS[c]}' for c in columns) + ')'
+    return statement, template
+
+
+def update_enrichment(cur, rows: list[tuple[int, dict]]) -> None:
+    """Write each (movie_id, fields) and clear those movies' miss records.
+
+    Keys outside ENRICHMENT_COLUMNS raise ValueError. Leaves committing to the caller.
+    """
+    groups: dict[tuple[str, ...], list[tuple]] = {}
+    for movie_id, fields in rows:
+        unknown = set(fields) - ENRICHMENT_COLUMNS.keys()
+        if unknown:
+            raise ValueError(f'not enrichment columns: {sorted(unknown)}')
+        columns = tuple(c for c in ENRICHMENT_COLUMNS if c in fields)
+        groups.setdefault(columns, []).append((movie_id, *(fields[c] for c in columns)))
+
+    for columns, values in groups.items():
+        statement, template = _update_sql(columns)
+        execute_values(cur, statement, values, template=template, page_size=len(values))
+    cur.execute('DELETE FROM enrichment_misses WHERE movie_id = ANY(%s)', ([movie_id for movie_id, _ in rows],))
+
+
+class EnrichmentWriter:
+    """Buffers enrichment results and writes them `batch_size` at a time.
+
+    add() stamps the TIER_STAMPS columns of the tiers the result came from;
+    written / failed count movies once flushed.
+    """
+
+    def __init__(self, engine, batch_size: int = 50):
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.written = 0
+        self.failed = 0
+        self._pending: list[tuple[int, dict]] = []
+
+    def add(self, movie_id: int, fields: dict, tiers: tuple[str, ...] = ('full',)) -> None:
+        now = datetime.now(timezone.utc)
+        stamps = {column: now for tier in tiers for column in TIER_STAMPS[tier]}
+        self._pending.append((movie_id, {**fields, **stamps}))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        conn = self.engine.raw_connection()
+        try:
+            try:
+                with REPORT.timer('enrich.db_write'):
+                    cur = conn.cursor()
+                    update_enrichment(cur, rows)
+                    conn.commit()
+                self.written += len(rows)
+                REPORT.incr('enrich.db_batches')
+                return
+            except (psycopg2.Error, ValueError):
+                conn.rollback()
+                LOGGER.exception('Batch write of %d movie(s) failed; retrying one by one', len(rows))
+            for row in rows:
+                try:
+                    cur = conn.cursor()
+                    update_enrichment(cur, [row])
+                    conn.commit()
+                    self.written += 1
+                except (psycopg2.Error, ValueError):
+                    conn.rollback()
+                    LOGGER.exception('  Failed to write enrichment for [%d]', row[0])
+                    self.failed += 1
+        finally:
+            conn.close()
+
+    def __enter__(self) -> EnrichmentWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
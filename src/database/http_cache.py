@@ -0,0 +1,163 @@
+"""Persistent on-disk cache of OMDb / TMDb JSON responses (SQLite).
+
+sync_enrichment looks up the same titles run after run: every --refresh-all, every
+re-enrichment of a recent release, every retry after a failed write. Responses
+are stored in one SQLite file keyed by endpoint, URL and the sorted request
+params (API keys excluded, so the file holds no secrets and survives a key
+rotation), and served until the endpoint's TTL runs out:
+
+    omdb           3 days   ratings and vote counts move
+    tmdb_search    7 days   new releases get indexed
+    tmdb_find     30 days   IMDb -> TMDb id mapping is stable
+    tmdb_details  30 days   metadata rarely changes
+
+"Not found" answers (OMDb Response=False, empty TMDb results) are cached like
+any other body. Only 2xx JSON responses are stored.
+
+Modes: 'use' (read and write, the default), 'refresh' (skip reads, still write),
+'only' (never touch the network: a miss raises CacheMiss, so enrichment can be
+replayed offline from a previous run's cache) and 'off'.
+
+When the file grows past max_bytes, expired entries and then the least recently
+used ones are evicted down to 90% of the limit. One connection is shared by all
+enrichment worker threads behind a lock; SQLite calls are sub-millisecond next to
+the HTTP round-trips they replace.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_MODES = ('use', 'refresh', 'only', 'off')
+
+DEFAULT_TTLS = {
+    'omdb': 3 * 86400,
+    'tmdb_search': 7 * 86400,
+    'tmdb_find': 30 * 86400,
+    'tmdb_details': 30 * 86400,
+}
+
+# Never part of a cache key.
+_SECRET_PARAMS = frozenset({'apikey', 'api_key'})
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key        TEXT PRIMARY KEY,
+        endpoint   TEXT NOT NULL,
+        url        TEXT NOT NULL,
+        params     TEXT NOT NULL,
+        body       TEXT NOT NULL,
+        size       INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        used_at    REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_responses_used_at ON responses (used_at);
+"""
+
+
+class CacheMiss(LookupError):
+    """Raised in 'only' mode when a response is not cached."""
+
+
+def request_key(endpoint: str, url: str, params: dict | None) -> tuple[str, str]:
+    """(key, canonical params JSON) for a request; secrets dropped, params sorted."""
+    public = {k: str(v) for k, v in (params or {}).items() if k not in _SECRET_PARAMS and v is not None}
+    canonical = json.dumps(public, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(f'{endpoint}\n{url}\n{canonical}'.encode('utf-8')).hexdigest()
+    return digest, canonical
+
+
+class ResponseCache:
+
+    def __init__(self, path: Path | str, mode: str = 'use', max_bytes: int = 200 * 2**20,
+                 ttls: dict[str, float] | None = None, clock=time.time):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"cache mode must be one of {CACHE_MODES}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._total = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(_SCHEMA)
+            self._total = self._conn.execute('SELECT coalesce(sum(size), 0) FROM responses').fetchone()[0]
+        return self._conn
+
+    def get(self, endpoint: str, url: str, params: dict | None = None):
+        """The cached JSON body, or None on a miss (CacheMiss in 'only' mode)."""
+        if self.mode in ('off', 'refresh'):
+            return None
+        key, _ = request_key(endpoint, url, params)
+        now = self._clock()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT body, fetched_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and now - row[1] < self.ttls.get(endpoint, 0):
+                conn.execute('UPDATE responses SET used_at = ? WHERE key = ?', (now, key))
+                return json.loads(row[0])
+        if self.mode == 'only':
+            raise CacheMiss(f'{endpoint} {url} {params and request_key(endpoint, url, params)[1]}')
+        return None
+
+    def put(self, endpoint: str, url: str, params: dict | None, body) -> None:
+        if self.mode in ('off', 'only'):
+            return
+        key, canonical = request_key(endpoint, url, params)
+        text = json.dumps(body, ensure_ascii=False)
+        size = len(text.encode('utf-8')) + len(url) + len(canonical)
+        now = self._clock()
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, endpoint, url, canonical, text, size, now, now),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        for endpoint, ttl in self.ttls.items():
+            conn.execute('DELETE FROM responses WHERE endpoint = ? AND fetched_at < ?', (endpoint, now - ttl))
+        self._total = conn.execute('SELECT coalesce(sum(size), 0) FROM responses').fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        while self._total > target:
+            rows = conn.execute('SELECT key, size FROM responses ORDER BY used_at LIMIT 256').fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total -= size
+                evicted += 1
+                if self._total <= target:
+                    break
+        LOGGER.info('Response cache over %d bytes; evicted %d LRU entries', self.max_bytes, evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute('SELECT endpoint, count(*), sum(size) FROM responses GROUP BY endpoint').fetchall()
+        return {endpoint: {'entries': n, 'bytes': size} for endpoint, n, size in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
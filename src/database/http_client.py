@@ -0,0 +1,156 @@
+"""Shared, pooled HTTP client for outbound API calls (OMDb, TMDb, Ollama).
+
+A bare ``requests.get`` builds a throwaway Session per call: a fresh TCP (and TLS)
+handshake every time and no retry policy. Everything here goes through one
+process-wide ``requests.Session`` instead, whose adapters keep up to
+HTTP_POOL_SIZE keep-alive connections per host (sized for the enrichment worker
+pool) and retry through urllib3:
+
+  - for GET (and HEAD), 429 and 5xx responses, connection errors and at most one
+    read error are retried up to HTTP_RETRIES times, with exponential backoff
+    (HTTP_BACKOFF_S * 2**n) plus up to HTTP_BACKOFF_S of random jitter so
+    concurrent workers do not retry in lockstep;
+  - a Retry-After header on 429/503 is honoured in place of the backoff, capped at
+    HTTP_MAX_RETRY_AFTER_S so one bad header cannot stall a run;
+  - once retries run out the last response is returned as-is, so callers keep
+    using raise_for_status();
+  - a POST is only retried when the connection could not be made. Its request
+    may already have been processed (an Ollama generation can take minutes), so
+    it is never resent after a timeout or an error status.
+
+request() also keeps per-host metrics (requests, retries, errors and latency
+over the last LATENCY_WINDOW requests, retries included); host_metrics()
+summarises them. They are bounded, so a long-lived web process can use this too.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+HTTP_BACKOFF_S = float(os.getenv('HTTP_BACKOFF_S', '0.5'))
+HTTP_MAX_RETRY_AFTER_S = float(os.getenv('HTTP_MAX_RETRY_AFTER_S', '60'))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '32'))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset({'GET', 'HEAD'})
+LATENCY_WINDOW = 2048
+
+
+class CappedRetry(Retry):
+    """urllib3 Retry that honours Retry-After but never sleeps longer than max_retry_after."""
+
+    max_retry_after = HTTP_MAX_RETRY_AFTER_S
+
+    def get_retry_after(self, response) -> float | None:
+        after = super().get_retry_after(response)
+        return None if after is None else min(after, self.max_retry_after)
+
+
+def build_session(retries: int = HTTP_RETRIES, backoff_s: float = HTTP_BACKOFF_S,
+                  pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    retry = CappedRetry(
+        total=retries,
+        read=min(retries, 1),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        backoff_factor=backoff_s,
+        backoff_jitter=backoff_s,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """The process-wide pooled session, built on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+class _HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+
+_stats: dict[str, _HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, seconds: float, retries: int, error: bool) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(host, _HostStats())
+        stats.requests += 1
+        stats.retries += retries
+        stats.errors += error
+        stats.latencies.append(seconds)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send through the shared session, recording per-host latency and retries."""
+    host = urlsplit(url).netloc
+    start = time.perf_counter()
+    try:
+        resp = get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        _record(host, time.perf_counter() - start, 0, True)
+        raise
+    retry_state = getattr(resp.raw, 'retries', None)
+    retries = len(retry_state.history) if retry_state is not None else 0
+    _record(host, time.perf_counter() - start, retries, resp.status_code >= 400)
+    return resp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def host_metrics() -> dict[str, dict]:
+    """{host: {requests, retries, errors, mean_ms, p50_ms, p90_ms, max_ms}}; latency
+    figures cover the last LATENCY_WINDOW requests to that host."""
+    with _stats_lock:
+        snapshot = {h: (s.requests, s.retries, s.errors, sorted(s.latencies)) for h, s in _stats.items()}
+    metrics = {}
+    for host, (n, retries, errors, values) in sorted(snapshot.items()):
+        ms = [v * 1000 for v in values]
+        metrics[host] = {
+            'requests': n,
+            'retries': retries,
+            'errors': errors,
+            'mean_ms': round(sum(ms) / len(ms), 2) if ms else 0.0,
+            'p50_ms': round(ms[int(0.5 * (len(ms) - 1))], 2) if ms else 0.0,
+            'p90_ms': round(ms[int(0.9 * (len(ms) - 1))], 2) if ms else 0.0,
+            'max_ms': round(ms[-1], 2) if ms else 0.0,
+        }
+    return metrics
+
+
+def reset_metrics() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -81,6 +81,8 @@ class Movie(Base):
     # Enrichment bookkeeping
     enriched_at             = Column(DateTime)
     scraped_title_normalized = Column(Text)
+    ratings_refreshed_at    = Column(DateTime)
+    metadata_refreshed_at   = Column(DateTime)
 
     # __table_args__ = (
     #     UniqueConstraint('title', 'year', name='uq_movie_title_year'),
@@ -0,0 +1,123 @@
+"""Resolve scraped films to movies.id with one INSERT ... ON CONFLICT per batch.
+
+Movie identity is (lower(trim(title)), year), enforced by the unique index
+uq_idx_movies_title_year. Conflicting on that index turns "update the row if it
+exists, otherwise insert it" into a single statement, so a new film costs one
+round-trip instead of two and two spiders writing the same film at once cannot
+both insert it.
+
+The index treats NULL years as distinct, so ON CONFLICT never fires for a film
+without a year; those rows keep the old UPDATE ... WHERE year IS NOT DISTINCT
+FROM NULL, then INSERT, path so reruns still update one row rather than adding
+a duplicate every crawl.
+
+Both functions take a psycopg2 cursor and leave committing to the caller.
+"""
+from __future__ import annotations
+
+from psycopg2.extras import execute_values
+
+# Written on insert and on every update; order matches the VALUES tuples.
+MOVIE_COLUMNS = (
+    'title',
+    'year',
+    'updated_at',
+    'scraped_synopsis',
+    'scraped_director1',
+    'scraped_cinema',
+    'scraped_image_url',
+    'scraped_details_link',
+    'scraped_title_normalized',
+)
+
+_COLUMNS_SQL = ', '.join(MOVIE_COLUMNS)
+
+_UPSERT_SQL = f"""
+    INSERT INTO movies ({_COLUMNS_SQL})
+    VALUES %s
+    ON CONFLICT ((lower(trim(title))), year)
+    DO UPDATE SET
+        {', '.join(f'{c} = EXCLUDED.{c}' for c in MOVIE_COLUMNS if c != 'year')}
+    RETURNING id, lower(trim(title)), year
+"""
+
+_UPDATE_NULL_YEAR_SQL = f"""
+    UPDATE movies
+    SET {', '.join(f'{c} = %s' for c in MOVIE_COLUMNS)}
+    WHERE lower(trim(title)) = lower(trim(%s))
+      AND year IS NULL
+    RETURNING id
+"""
+
+_SELECT_ID_SQL = """
+    SELECT id FROM movies WHERE lower(trim(title)) = lower(trim(%s)) AND year = %s
+"""
+
+_INSERT_SQL = f"""
+    INSERT INTO movies ({_COLUMNS_SQL})
+    VALUES ({', '.join(['%s'] * len(MOVIE_COLUMNS))})
+    RETURNING id
+"""
+
+
+def _year(value) -> int | None:
+    """Scraped years arrive as ints or strings; anything that is not digits ('', 'TBA') is NULL."""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip() if value is not None else ''
+    return int(text) if text.isdigit() else None
+
+
+def _identity(movie: dict) -> tuple[str, int | None]:
+    # Mirrors lower(trim(title)): Postgres trim() strips spaces only.
+    return (movie['title'] or '').strip(' ').lower(), _year(movie.get('year'))
+
+
+def _values(movie: dict) -> tuple:
+    return tuple(_year(movie.get(c)) if c == 'year' else movie.get(c) for c in MOVIE_COLUMNS)
+
+
+def _upsert_null_year(cur, movie: dict) -> int:
+    values = _values(movie)
+    cur.execute(_UPDATE_NULL_YEAR_SQL, (*values, movie['title']))
+    row = cur.fetchone()
+    if row:
+        return row[0]
+    cur.execute(_INSERT_SQL, values)
+    return cur.fetchone()[0]
+
+
+def upsert_movies(cur, movies: list[dict]) -> list[int]:
+    """Insert or update each movie; return their ids in input order.
+
+    Each dict carries the MOVIE_COLUMNS keys (missing keys are written as NULL).
+    Movies sharing an identity within the batch resolve to the same id, with the
+    last one's fields winning, since ON CONFLICT DO UPDATE cannot touch one row
+    twice in a statement.
+    """
+    keys = [_identity(m) for m in movies]
+    ids: dict[tuple, int] = {}
+
+    latest = {key: m for key, m in zip(keys, movies) if key[1] is not None}
+    if latest:
+        rows = execute_values(
+            cur, _UPSERT_SQL, [_values(m) for m in latest.values()],
+            page_size=len(latest), fetch=True,
+        )
+        for movie_id, title_key, year in rows:
+            ids[(title_key, year)] = movie_id
+
+    for key, movie in zip(keys, movies):
+        if key[1] is None:
+            ids[key] = _upsert_null_year(cur, movie)
+        elif key not in ids:
+            # Python's lower() and the database's disagreed on this title; ask for it.
+            cur.execute(_SELECT_ID_SQL, (movie['title'], key[1]))
+            ids[key] = cur.fetchone()[0]
+
+    return [ids[key] for key in keys]
+
+
+def upsert_movie(cur, movie: dict) -> int:
+    """Single-film form of upsert_movies()."""
+    return upsert_movies(cur, [movie])[0]
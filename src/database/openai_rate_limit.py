@@ -0,0 +1,120 @@
+"""Adaptive throttling for concurrent OpenAI calls, driven by the rate-limit headers.
+
+Every OpenAI response reports the caller's remaining budget for the current
+window and how long until it resets:
+
+    x-ratelimit-remaining-requests: 4999     x-ratelimit-reset-requests: 12ms
+    x-ratelimit-remaining-tokens:   994000   x-ratelimit-reset-tokens:   360ms
+
+RateLimitGate keeps the latest figures and reserves from them before each
+request, so several worker threads sharing one API key pause together just
+before the budget runs out instead of each running into a 429. When a 429 does
+arrive, pause() holds every worker until its Retry-After has passed. The gate
+never delays a request while the budget is unknown (before the first response,
+or once a reset time has passed).
+
+Pure stdlib; no network access.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Callable, Mapping
+
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_UNIT_S = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def parse_reset(value: str | None) -> float | None:
+    """Seconds in an OpenAI reset header ('20ms', '1s', '6m0s', '1h2m3.5s'); None if absent."""
+    if not value:
+        return None
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(n) * _UNIT_S[unit] for n, unit in parts)
+
+
+def _int(value: str | None) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class _Budget:
+    """Remaining units of one limit (requests or tokens) until `reset_at`."""
+
+    __slots__ = ('remaining', 'reset_at')
+
+    def __init__(self):
+        self.remaining: int | None = None
+        self.reset_at = 0.0
+
+    def update(self, remaining: int | None, reset_s: float | None, now: float) -> None:
+        if remaining is None:
+            return
+        self.remaining = remaining
+        self.reset_at = now + (reset_s or 0.0)
+
+    def delay(self, need: int, now: float) -> float:
+        if self.remaining is None:
+            return 0.0
+        if now >= self.reset_at:
+            self.remaining = None          # window has rolled over; budget unknown again
+            return 0.0
+        return 0.0 if self.remaining >= need else self.reset_at - now
+
+    def take(self, need: int) -> None:
+        if self.remaining is not None:
+            self.remaining -= need
+
+
+class RateLimitGate:
+    """Shared by the threads calling one API key; thread-safe.
+
+    wait(tokens) blocks until both the request and the token budget can cover one
+    more request of `tokens` and reserves it; update(headers) refreshes the
+    budgets from a response; pause(seconds) holds everyone after a 429. Waits are
+    returned so callers can report them.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = _Budget()
+        self._tokens = _Budget()
+        self._paused_until = 0.0
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        now = self._clock()
+        with self._lock:
+            self._requests.update(_int(headers.get('x-ratelimit-remaining-requests')),
+                                  parse_reset(headers.get('x-ratelimit-reset-requests')), now)
+            self._tokens.update(_int(headers.get('x-ratelimit-remaining-tokens')),
+                                parse_reset(headers.get('x-ratelimit-reset-tokens')), now)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def wait(self, tokens: int = 0) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                delay = max(self._paused_until - now,
+                            self._requests.delay(1, now),
+                            self._tokens.delay(tokens, now))
+                if delay <= 0:
+                    self._requests.take(1)
+                    self._tokens.take(tokens)
+                    return waited
+            self._sleep(delay)
+            waited += delay
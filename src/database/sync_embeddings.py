@@ -12,12 +12,16 @@ from typing import Iterable, List, Sequence
 
 import hashlib
 
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .crawl_report import REPORT
+from .enrichment_engine import ordered_map
 from .models import Movie
+from .openai_rate_limit import RateLimitGate, parse_reset
 from .setup_db import get_session
+from .work_priority import TimeBudget, by_priority
 
 
 LOGGER = logging.getLogger("sync_embeddings")
@@ -28,6 +32,14 @@ EMBEDDING_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
 # text-embedding-3-small outputs 1,536 dimensional vectors
 EMBEDDING_DIM = 1536
 DEFAULT_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 16))
+# Embedding requests in flight at once; their commits overlap the next requests.
+DEFAULT_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", 4))
+# Times a batch is retried after a 429 that outlasted the client's own retries.
+RATE_LIMIT_RETRIES = 5
+
+# One gate per process: the budget OpenAI reports is per API key, so every
+# sync_embeddings call (e.g. each micro-batch of the pipelined crawl) shares it.
+_GATE = RateLimitGate()
 
 
 def _chunked(items: Sequence[Movie], chunk_size: int) -> Iterable[Sequence[Movie]]:
@@ -70,13 +82,20 @@ def _needs_embedding(movie: Movie) -> bool:
         or movie.embedding_source_hash != current_hash
     )
 
-def _fetch_movies(session: Session, refresh_all: bool, limit: int | None) -> List[Movie]:
-    stmt = select(Movie).order_by(Movie.embedded_at.desc())
-    if not refresh_all:
+def _fetch_movies(session: Session, refresh_all: bool, limit: int | None,
+                  movie_ids: Sequence[int] | None = None) -> List[Movie]:
+    stmt = select(Movie)
+    if movie_ids is not None:
+        # Targeted runs (the streaming ingest) skip the NULL/model prefilter and let
+        # _needs_embedding's hash check decide, so an edited synopsis is picked up too.
+        stmt = stmt.where(Movie.id.in_(list(movie_ids)))
+    elif not refresh_all:
         stmt = stmt.where(
             (Movie.embedding.is_(None)) |
             (Movie.embedding_model != EMBEDDING_MODEL)
         )
+    # Soonest-screening films first, so a capped or interrupted run covers them.
+    stmt = by_priority(stmt, datetime.now(timezone.utc), Movie.embedded_at.desc())
     if limit:
         stmt = stmt.limit(limit)
     return list(session.scalars(stmt).all())
@@ -86,8 +105,40 @@ def _create_client() -> OpenAI:
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-def _generate_embeddings(client: OpenAI, payloads: Sequence[str]) -> List[List[float]]:
-    response = client.embeddings.create(model=EMBEDDING_MODEL, input=list(payloads))
+def _estimate_tokens(payloads: Sequence[str]) -> int:
+    # ~4 characters per token for English text; only used to reserve rate-limit budget.
+    return sum(len(p) for p in payloads) // 4 + len(payloads)
+
+
+def _retry_after(error: RateLimitError) -> float:
+    headers = error.response.headers
+    ms = headers.get("retry-after-ms")
+    if ms:
+        return float(ms) / 1000
+    return (parse_reset(headers.get("retry-after"))
+            or parse_reset(headers.get("x-ratelimit-reset-requests"))
+            or 1.0)
+
+
+def _generate_embeddings(client: OpenAI, payloads: Sequence[str],
+                         gate: RateLimitGate | None = None) -> List[List[float]]:
+    """One embeddings request; `gate` is waited on first and fed the response's rate-limit headers."""
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if gate is not None:
+            REPORT.observe("embed.rate_limit_wait", gate.wait(_estimate_tokens(payloads)))
+        try:
+            with REPORT.timer("embed.api_batch"):
+                raw = client.embeddings.with_raw_response.create(model=EMBEDDING_MODEL, input=list(payloads))
+            break
+        except RateLimitError as e:
+            if gate is None or attempt == RATE_LIMIT_RETRIES:
+                raise
+            REPORT.incr("embed.rate_limited")
+            gate.update(e.response.headers)
+            gate.pause(_retry_after(e))
+    if gate is not None:
+        gate.update(raw.headers)
+    response = raw.parse()
     vectors: List[List[float]] = []
     for record in response.data:
         vector = getattr(record, "embedding", None)
@@ -103,15 +154,34 @@ def _generate_embeddings(client: OpenAI, payloads: Sequence[str]) -> List[List[f
 
 def sync_embeddings(refresh_all: bool = False, limit: int | None = None,
                     batch_size: int = DEFAULT_BATCH_SIZE, sleep_s: float = 0.0,
-                    dry_run: bool = False) -> None:
+                    dry_run: bool = False, movie_ids: Sequence[int] | None = None,
+                    time_budget_s: float | None = None,
+                    concurrency: int = DEFAULT_CONCURRENCY,
+                    gate: RateLimitGate | None = None,
+                    budget: TimeBudget | None = None) -> None:
+    """Embed movies whose embedding is missing or stale.
+
+    movie_ids restricts the run to those rows (used by the streaming ingest in
+    scrapers/ingest_stream.py); otherwise every candidate row is considered.
+    Movies are embedded soonest-screening first; once time_budget_s seconds have
+    passed no new batch is sent. A `budget` given instead is shared with other
+    calls, so a stage split into many calls is capped as a whole.
+
+    Up to `concurrency` batches are in flight on worker threads, paced by the
+    rate-limit headers OpenAI returns (openai_rate_limit.RateLimitGate; the
+    process-wide one unless `gate` is given, so back-to-back calls keep what the
+    last response said about the budget). Results come back in batch order and
+    are committed on this thread while the next batches are still being embedded.
+    """
     _validate_env()
+    budget = budget or TimeBudget(time_budget_s)
 
     if batch_size <= 0:
         raise ValueError("batch_size must be greater than zero")
 
     session = get_session()
     try:
-        movies = _fetch_movies(session, refresh_all=refresh_all, limit=limit)
+        movies = _fetch_movies(session, refresh_all=refresh_all, limit=limit, movie_ids=movie_ids)
         if refresh_all:
             movies_to_embed = movies
         else:
@@ -129,45 +199,57 @@ def sync_embeddings(refresh_all: bool = False, limit: int | None = None,
             return
 
         client = _create_client()
+        gate = gate or _GATE
         processed = 0
 
-        for batch in _chunked(movies_to_embed, batch_size):
-
-            inputs = [_build_embedding_input(movie) for movie in batch]
-            filtered_movies: List[Movie] = []
-            filtered_inputs: List[str] = []
-            for movie, payload in zip(batch, inputs):
-                normalized = (payload or "").strip()
-                if not normalized:
-                    LOGGER.info(
-                        "Skipping movie id=%s title=%s due to empty embedding payload",
-                        movie.id,
-                        movie.title,
-                    )
+        def payloads():
+            # Runs on this thread: worker threads only ever see strings, never ORM rows.
+            for batch in budget.take(_chunked(movies_to_embed, batch_size)):
+                filtered_movies: List[Movie] = []
+                filtered_inputs: List[str] = []
+                for movie in batch:
+                    normalized = (_build_embedding_input(movie) or "").strip()
+                    if not normalized:
+                        LOGGER.info(
+                            "Skipping movie id=%s title=%s due to empty embedding payload",
+                            movie.id,
+                            movie.title,
+                        )
+                        continue
+                    filtered_movies.append(movie)
+                    filtered_inputs.append(normalized)
+                if not filtered_movies:
+                    LOGGER.info("Skipping batch: no valid embedding payloads")
                     continue
-                filtered_movies.append(movie)
-                filtered_inputs.append(normalized)
+                yield filtered_movies, filtered_inputs
 
-            if not filtered_movies:
-                LOGGER.info("Skipping batch: no valid embedding payloads")
-                continue
+        for (filtered_movies, filtered_inputs), vectors in ordered_map(
+            lambda job: _generate_embeddings(client, job[1], gate), payloads(), workers=max(1, concurrency),
+        ):
+            if isinstance(vectors, BaseException):
+                raise vectors
 
             source_hashes = [_source_hash(text) for text in filtered_inputs]
-            vectors = _generate_embeddings(client, filtered_inputs)
-
             for movie, vector, source_hash in zip(filtered_movies, vectors, source_hashes):
                 movie.embedding = vector
                 movie.embedding_model = EMBEDDING_MODEL
                 movie.embedding_source_hash = source_hash
                 movie.embedded_at = datetime.now(timezone.utc)
 
-            session.commit()
+            with REPORT.timer("embed.db_commit"):
+                session.commit()
+            REPORT.incr("embed.movies", len(filtered_movies))
 
             processed += len(filtered_movies)
             LOGGER.info("Embedded %s/%s movies", processed, total)
             if sleep_s:
                 time.sleep(sleep_s)
 
+        if budget.cut:
+            LOGGER.info("Time budget of %.0f s spent; %s batch(es) left for the next run",
+                        budget.seconds, budget.cut)
+            REPORT.incr("embed.budget_deferred", budget.cut)
+
     except Exception:
         session.rollback()
         LOGGER.exception("Embedding sync failed")
@@ -185,6 +267,10 @@ def _build_parser() -> argparse.ArgumentParser:
                         help="Regenerate embeddings even for movies that already have one")
     parser.add_argument("--sleep", type=float, default=0.0,
                         help="Seconds to sleep between batches to respect rate limits")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Embedding requests in flight at once (default: {DEFAULT_CONCURRENCY}; 1 = sequential)")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="SECONDS",
+                        help="Stop sending new batches after this many seconds (soonest screenings go first)")
     parser.add_argument("--dry-run", action="store_true", help="Only report what would run")
     return parser
 
@@ -198,6 +284,8 @@ def main(argv: Sequence[str] | None = None) -> None:
         batch_size=args.batch_size,
         sleep_s=args.sleep,
         dry_run=args.dry_run,
+        time_budget_s=args.time_budget,
+        concurrency=args.concurrency,
     )
 
 
@@ -6,7 +6,11 @@ Usage (from repo root):
     python src/database/sync_enrichment.py --refresh-all          # dry-run: re-enrich all movies
     python src/database/sync_enrichment.py --refresh-all --apply  # write re-enriched values for all
     python src/database/sync_enrichment.py --limit 10             # cap records processed
-    python src/database/sync_enrichment.py --sleep 0.5            # seconds between API calls
+    python src/database/sync_enrichment.py --sleep 0.5            # extra pause after each API phase
+    python src/database/sync_enrichment.py --workers 16           # movies looked up concurrently
+    python src/database/sync_enrichment.py --cache-mode only      # replay from the response cache, no network
+    python src/database/sync_enrichment.py --retry-misses         # ignore the both-miss back-off
+    python src/database/sync_enrichment.py --tier ratings --apply # only the due OMDb-by-id ratings refreshes
     python src/database/sync_enrichment.py --refresh-count 50     # backfill 50 unenriched movies (full DB, no future-showtime filter)
     python src/database/sync_enrichment.py --refresh-count 50 --apply
     python src/database/sync_enrichment.py --backfill-titles      # only backfill scraped_title_normalized
@@ -14,16 +18,16 @@ Usage (from repo root):
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import os
 import re
 import sys
 import time
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
-import requests
-
 ROOT = Path(__file__).resolve().parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -31,9 +35,17 @@ if str(ROOT) not in sys.path:
 from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv())
 
-from sqlalchemy import or_, select, exists
+import psycopg2
+from psycopg2.extras import execute_values
+from sqlalchemy import and_, column, exists, func, or_, select, table, text
 
+from src.database.crawl_report import REPORT
+from src.database.enrichment_engine import TokenBucket, ordered_map
+from src.database.enrichment_writer import EnrichmentWriter
+from src.database import http_client
+from src.database.http_cache import CACHE_MODES, ResponseCache
 from src.database.title_normalization import _api_lookup_title
+from src.database.work_priority import TimeBudget, by_priority
 from src.database.models import Movie, Showtime
 from src.database.setup_db import get_engine, get_session
 
@@ -43,6 +55,76 @@ logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
 OMDB_KEY = os.getenv('OMDB_API_KEY')
 TMDB_KEY = os.getenv('TMDB_API_KEY')
 TMDB_IMG_BASE = 'https://image.tmdb.org/t/p/w500'
+# Overridable so load tests can point enrichment at benchmarks/fake_enrichment_apis.py.
+OMDB_BASE_URL = os.getenv('OMDB_BASE_URL', 'http://www.omdbapi.com/')
+TMDB_BASE_URL = os.getenv('TMDB_BASE_URL', 'https://api.themoviedb.org/3').rstrip('/')
+
+# Requests per second across all worker threads. OMDb publishes no per-second limit
+# (only a daily quota), so stay modest; TMDb allows roughly 50/s per IP.
+OMDB_RATE_PER_S = float(os.getenv('OMDB_RATE_PER_S', '8'))
+TMDB_RATE_PER_S = float(os.getenv('TMDB_RATE_PER_S', '35'))
+ENRICH_WORKERS = int(os.getenv('ENRICH_WORKERS', '8'))
+# Enriched movies written per UPDATE ... FROM (VALUES ...) batch.
+ENRICH_WRITE_BATCH = int(os.getenv('ENRICH_WRITE_BATCH', '50'))
+
+_LIMITERS = {
+    'omdb': TokenBucket(OMDB_RATE_PER_S),
+    'tmdb': TokenBucket(TMDB_RATE_PER_S),
+}
+
+
+# Refresh tiers. 'full' re-resolves identity (OMDb search, TMDb find/search, TMDb
+# details); 'ratings' re-reads OMDb by the stored imdb_id; 'metadata' re-reads TMDb
+# details by the stored tmdb_id. Each tier is due once its timestamp is older than
+# its max age (see _due_tiers).
+TIERS = ('ratings', 'metadata', 'full')
+ENRICH_RATINGS_MAX_AGE_DAYS = float(os.getenv('ENRICH_RATINGS_MAX_AGE_DAYS', '1'))
+ENRICH_METADATA_MAX_AGE_DAYS = float(os.getenv('ENRICH_METADATA_MAX_AGE_DAYS', '30'))
+ENRICH_FULL_MAX_AGE_DAYS = float(os.getenv('ENRICH_FULL_MAX_AGE_DAYS', '7'))
+# Ratings are only kept fresh for films released this recently (or undated).
+RECENT_RELEASE_DAYS = 30
+
+# Both-miss back-off: a movie neither API matched is retried after
+# BACKOFF * 2**(attempts - 1) days, capped at MAX_BACKOFF.
+ENRICH_MISS_BACKOFF_DAYS = float(os.getenv('ENRICH_MISS_BACKOFF_DAYS', '1'))
+ENRICH_MISS_MAX_BACKOFF_DAYS = float(os.getenv('ENRICH_MISS_MAX_BACKOFF_DAYS', '30'))
+
+# enrichment_misses is not declared in models.py (see docs/data-model.md); this
+# lightweight table is just enough to filter candidates against it.
+_MISSES = table('enrichment_misses', column('movie_id'), column('lookup_title'), column('retry_after'))
+
+_HTTP_CACHE = ResponseCache(
+    Path(os.getenv('ENRICH_HTTP_CACHE', ROOT / 'data' / 'cache' / 'enrichment_http.sqlite')),
+    mode=os.getenv('ENRICH_HTTP_CACHE_MODE', 'use'),
+    max_bytes=int(float(os.getenv('ENRICH_HTTP_CACHE_MAX_MB', '200')) * 2**20),
+)
+
+
+def _get_json(endpoint: str, url: str, params: dict, fresh: bool = False):
+    """GET `url` as JSON through the on-disk response cache (http_cache.py).
+
+    Only a cache miss takes a token from the API's bucket (reported as
+    enrich.<api>_wait) and hits the network (timed as enrich.<endpoint>), so
+    cached re-runs are neither rate limited nor counted as API latency.
+    fresh=True skips the cache read (the answer is still stored), for lookups
+    whose point is a new answer; 'only' mode still replays from the cache.
+    """
+    cached = None
+    if not fresh or _HTTP_CACHE.mode == 'only':
+        cached = _HTTP_CACHE.get(endpoint, url, params)
+    if cached is not None:
+        REPORT.incr('enrich.http_cache_hit')
+        return cached
+    REPORT.incr('enrich.http_cache_miss')
+    api = endpoint.split('_')[0]
+    REPORT.observe(f'enrich.{api}_wait', _LIMITERS[api].acquire())
+    with REPORT.timer(f'enrich.{endpoint}'):
+        r = http_client.get(url, params=params, timeout=10)
+        r.raise_for_status()
+        data = r.json()
+    _HTTP_CACHE.put(endpoint, url, params, data)
+    return data
+
 
 _EDITION_SUFFIX_RE = re.compile(
     r"\s*:?\s*(?:the\s+)?(?:director['’‘]s|final|extended|unrated|theatrical)\s+cut\s*$",
@@ -62,13 +144,16 @@ def _strip_edition_suffix(title: str) -> str:
 
 # ── OMDb ──────────────────────────────────────────────────────────────────────
 
-def _call_omdb(title: str, year: str | None) -> dict | None:
+def _call_omdb(title: str, year: str | None, fresh: bool = False) -> dict | None:
     params = {'t': title, 'apikey': OMDB_KEY}
     if year:
         params['y'] = year
-    r = requests.get('http://www.omdbapi.com/', params=params, timeout=10)
-    r.raise_for_status()
-    data = r.json()
+    data = _get_json('omdb', OMDB_BASE_URL, params, fresh=fresh)
+    return None if data.get('Response') == 'False' else data
+
+
+def _call_omdb_by_id(imdb_id: str, fresh: bool = False) -> dict | None:
+    data = _get_json('omdb', OMDB_BASE_URL, {'i': imdb_id, 'apikey': OMDB_KEY}, fresh=fresh)
     return None if data.get('Response') == 'False' else data
 
 
@@ -117,36 +202,35 @@ def _parse_omdb(data: dict) -> dict:
 
 # ── TMDb ──────────────────────────────────────────────────────────────────────
 
-def _call_tmdb_find(imdb_id: str) -> int | None:
-    r = requests.get(
-        f'https://api.themoviedb.org/3/find/{imdb_id}',
-        params={'external_source': 'imdb_id', 'api_key': TMDB_KEY},
-        timeout=10,
+def _call_tmdb_find(imdb_id: str, fresh: bool = False) -> int | None:
+    data = _get_json(
+        'tmdb_find',
+        f'{TMDB_BASE_URL}/find/{imdb_id}',
+        {'external_source': 'imdb_id', 'api_key': TMDB_KEY},
+        fresh=fresh,
     )
-    r.raise_for_status()
-    results = r.json().get('movie_results', [])
+    results = data.get('movie_results', [])
     return results[0]['id'] if results else None
 
 
-def _call_tmdb_search(title: str, year: str) -> int | None:
-    r = requests.get(
-        'https://api.themoviedb.org/3/search/movie',
-        params={'query': title, 'year': year, 'api_key': TMDB_KEY},
-        timeout=10,
+def _call_tmdb_search(title: str, year: str, fresh: bool = False) -> int | None:
+    data = _get_json(
+        'tmdb_search',
+        f'{TMDB_BASE_URL}/search/movie',
+        {'query': title, 'year': year, 'api_key': TMDB_KEY},
+        fresh=fresh,
     )
-    r.raise_for_status()
-    results = r.json().get('results', [])
+    results = data.get('results', [])
     return results[0]['id'] if results else None
 
 
-def _call_tmdb_details(tmdb_id: int) -> dict:
-    r = requests.get(
-        f'https://api.themoviedb.org/3/movie/{tmdb_id}',
-        params={'append_to_response': 'videos,translations', 'api_key': TMDB_KEY},
-        timeout=10,
+def _call_tmdb_details(tmdb_id: int, fresh: bool = False) -> dict:
+    return _get_json(
+        'tmdb_details',
+        f'{TMDB_BASE_URL}/movie/{tmdb_id}',
+        {'append_to_response': 'videos,translations', 'api_key': TMDB_KEY},
+        fresh=fresh,
     )
-    r.raise_for_status()
-    return r.json()
 
 
 def _parse_tmdb(data: dict) -> dict:
@@ -203,221 +287,628 @@ def _parse_tmdb(data: dict) -> dict:
 
 # ── Enrichment sync ───────────────────────────────────────────────────────────
 
-def _fetch_backfill_enrichment_movies(session, count: int) -> list[Movie]:
-    stmt = (
-        select(Movie)
-        .where(Movie.enriched_at.is_(None))
-        .order_by(Movie.id)
-        .limit(count)
+def _miss_backoff(attempts: int) -> timedelta:
+    """How long to wait before retrying a movie that has missed `attempts` times in a row."""
+    return timedelta(days=min(ENRICH_MISS_BACKOFF_DAYS * 2 ** (attempts - 1), ENRICH_MISS_MAX_BACKOFF_DAYS))
+
+
+def _backing_off(now: datetime):
+    """Movies with a both-miss record whose retry is not due yet. A changed
+    scraped_title_normalized makes the movie due again immediately."""
+    return exists().where(
+        _MISSES.c.movie_id == Movie.id,
+        _MISSES.c.retry_after > now,
+        _MISSES.c.lookup_title == func.coalesce(func.nullif(Movie.scraped_title_normalized, ''), Movie.title, ''),
     )
+
+
+def _missed_ids(session, movie_ids: list[int]) -> set[int]:
+    """The movies among movie_ids with a both-miss record, i.e. whose lookup is a retry."""
+    if not movie_ids:
+        return set()
+    return set(session.scalars(select(_MISSES.c.movie_id).where(_MISSES.c.movie_id.in_(movie_ids))))
+
+
+def _naive_utc(now: datetime) -> datetime:
+    # The movies timestamps are `timestamp without time zone`, holding UTC.
+    return now.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _due_tiers(movie: Movie, now: datetime, refresh_all: bool = False,
+               only: str | None = None) -> tuple[str, ...]:
+    """Refresh tiers due for `movie`: ('full',), a subset of ('ratings', 'metadata'), or ().
+
+      full      never enriched, or still missing imdb_id or tmdb_id and last
+                enriched over ENRICH_FULL_MAX_AGE_DAYS ago;
+      ratings   imdb_id known, released within RECENT_RELEASE_DAYS (or undated),
+                ratings older than ENRICH_RATINGS_MAX_AGE_DAYS;
+      metadata  tmdb_id known, metadata older than ENRICH_METADATA_MAX_AGE_DAYS.
+
+    refresh_all makes `only` (default 'full') due regardless of age; `only`
+    otherwise restricts the result to that tier. Mirrored in SQL by _due_clause().
+    """
+    if refresh_all:
+        due = {only or 'full'}
+    else:
+        now = _naive_utc(now)
+
+        def stale(stamp, days):
+            return stamp is None or stamp < now - timedelta(days=days)
+
+        due = set()
+        if movie.enriched_at is None or (
+                not (movie.imdb_id and movie.tmdb_id) and stale(movie.enriched_at, ENRICH_FULL_MAX_AGE_DAYS)):
+            due.add('full')
+        recent = (movie.tmdb_release_date is None
+                  or movie.tmdb_release_date >= (now - timedelta(days=RECENT_RELEASE_DAYS)).date())
+        if recent and stale(movie.ratings_refreshed_at or movie.enriched_at, ENRICH_RATINGS_MAX_AGE_DAYS):
+            due.add('ratings')
+        if stale(movie.metadata_refreshed_at or movie.enriched_at, ENRICH_METADATA_MAX_AGE_DAYS):
+            due.add('metadata')
+        if only:
+            due &= {only}
+    if 'full' in due:
+        return ('full',)
+    if not movie.imdb_id:
+        due.discard('ratings')
+    if not movie.tmdb_id:
+        due.discard('metadata')
+    return tuple(t for t in TIERS if t in due)
+
+
+def _due_clause(now: datetime, only: str | None = None):
+    """SQL form of _due_tiers() (without refresh_all): rows with at least one tier due."""
+    def stale(stamp, days):
+        return or_(stamp.is_(None), stamp < now - timedelta(days=days))
+
+    clauses = {
+        'full': or_(
+            Movie.enriched_at.is_(None),
+            and_(or_(Movie.imdb_id.is_(None), Movie.tmdb_id.is_(None)),
+                 stale(Movie.enriched_at, ENRICH_FULL_MAX_AGE_DAYS)),
+        ),
+        'ratings': and_(
+            Movie.imdb_id.isnot(None),
+            or_(Movie.tmdb_release_date.is_(None),
+                Movie.tmdb_release_date >= (now - timedelta(days=RECENT_RELEASE_DAYS)).date()),
+            stale(func.coalesce(Movie.ratings_refreshed_at, Movie.enriched_at), ENRICH_RATINGS_MAX_AGE_DAYS),
+        ),
+        'metadata': and_(
+            Movie.tmdb_id.isnot(None),
+            stale(func.coalesce(Movie.metadata_refreshed_at, Movie.enriched_at), ENRICH_METADATA_MAX_AGE_DAYS),
+        ),
+    }
+    if only:
+        return clauses[only]
+    return or_(*clauses.values())
+
+
+def _fetch_backfill_enrichment_movies(session, count: int, retry_misses: bool = False) -> list[Movie]:
+    now = datetime.now(timezone.utc)
+    stmt = select(Movie).where(Movie.enriched_at.is_(None))
+    if not retry_misses:
+        stmt = stmt.where(~_backing_off(now))
+    stmt = by_priority(stmt, now).limit(count)
     return list(session.scalars(stmt).all())
 
 
-def _fetch_enrichment_movies(session, refresh_all: bool, limit: int | None) -> list[Movie]:
+def _fetch_enrichment_movies(session, refresh_all: bool, limit: int | None,
+                             movie_ids: list[int] | None = None,
+                             retry_misses: bool = False,
+                             tier: str | None = None) -> list[Movie]:
     now = datetime.now(timezone.utc)
     has_future_showtime = exists().where(
         Showtime.movie_id == Movie.id,
         Showtime.show_time > now,
     )
-    stmt = (
-        select(Movie)
-        .where(has_future_showtime)
-        .order_by(Movie.enriched_at.asc().nulls_first(), Movie.id)
-    )
+    stmt = select(Movie).where(has_future_showtime)
+    if movie_ids is not None:
+        stmt = stmt.where(Movie.id.in_(movie_ids))
+    if not retry_misses:
+        stmt = stmt.where(~_backing_off(now))
     if not refresh_all:
-        cutoff = (now - timedelta(days=30)).date()
-        stmt = stmt.where(
-            or_(
-                Movie.enriched_at.is_(None),
-                Movie.tmdb_release_date.is_(None),
-                Movie.tmdb_release_date >= cutoff,
-            )
-        )
+        stmt = stmt.where(_due_clause(now, tier))
+    elif tier == 'ratings':
+        stmt = stmt.where(Movie.imdb_id.isnot(None))
+    elif tier == 'metadata':
+        stmt = stmt.where(Movie.tmdb_id.isnot(None))
+    stmt = by_priority(stmt, now, Movie.enriched_at.asc().nulls_first())
     if limit:
         stmt = stmt.limit(limit)
     return list(session.scalars(stmt).all())
 
 
-def sync_enrichment(
-    apply: bool = False,
-    refresh_all: bool = False,
-    limit: int | None = None,
-    sleep_s: float = 0.1,
-    backfill_count: int | None = None,
-) -> None:
-    """Call OMDb + TMDb for each unenriched movie and write results to DB."""
-    _validate_env()
+@dataclass(frozen=True)
+class _Candidate:
+    """The fields a lookup needs, copied off the ORM row so worker threads never
+    touch a Session."""
+    id: int
+    title: str | None
+    lookup: str
+    year: str | None
+    tiers: tuple[str, ...] = ('full',)
+    imdb_id: str | None = None
+    tmdb_id: int | None = None
+    # Retrying a recorded both-miss: the cached "not found" answers are what put it
+    # in back-off, so this lookup skips the cache read.
+    fresh: bool = False
+
+    @classmethod
+    def from_movie(cls, movie: Movie, tiers: tuple[str, ...] = ('full',),
+                   fresh: bool = False) -> _Candidate:
+        return cls(
+            id=movie.id,
+            title=movie.title,
+            lookup=movie.scraped_title_normalized or movie.title or '',
+            year=str(movie.year) if movie.year else None,
+            tiers=tiers,
+            imdb_id=movie.imdb_id,
+            tmdb_id=movie.tmdb_id,
+            fresh=fresh,
+        )
 
-    engine = get_engine()
-    session = get_session(engine)
-    try:
-        if backfill_count is not None:
-            movies = _fetch_backfill_enrichment_movies(session, backfill_count)
-        else:
-            movies = _fetch_enrichment_movies(session, refresh_all=refresh_all, limit=limit)
-    finally:
-        session.close()
 
-    if not movies:
-        LOGGER.info('No movies to enrich')
-        return
+@dataclass
+class _LookupResult:
+    omdb_hit: bool = False
+    omdb_fields: dict = field(default_factory=dict)
+    tmdb_id: int | None = None
+    tmdb_fields: dict = field(default_factory=dict)
+    warnings: list[str] = field(default_factory=list)
+    lookups: list[dict] = field(default_factory=list)   # every query tried, for enrichment_misses
+
+    @property
+    def fields(self) -> dict:
+        return {**self.omdb_fields, **self.tmdb_fields}
+
+    def log(self, tiers: tuple[str, ...] = ('full',)) -> None:
+        for warning in self.warnings:
+            LOGGER.warning('  %s', warning)
+        if 'full' in tiers or 'ratings' in tiers:
+            if self.omdb_hit:
+                LOGGER.info('  OMDb HIT  imdb=%s  rating=%s  RT=%s  MC=%s',
+                            self.omdb_fields.get('imdb_id'), self.omdb_fields.get('imdb_rating'),
+                            self.omdb_fields.get('omdb_rt_score'), self.omdb_fields.get('omdb_metacritic_score'))
+            else:
+                LOGGER.info('  OMDb MISS')
+        if 'full' in tiers or 'metadata' in tiers:
+            if self.tmdb_fields:
+                LOGGER.info('  TMDb HIT  id=%d  genres=%s  poster=%s',
+                            self.tmdb_id, self.tmdb_fields.get('tmdb_genres'),
+                            bool(self.tmdb_fields.get('tmdb_poster_url')))
+            elif not self.tmdb_id:
+                LOGGER.info('  TMDb MISS')
 
-    LOGGER.info('Enriching %d movie(s)', len(movies))
-    if not apply:
-        LOGGER.info('DRY-RUN — no writes will occur')
 
-    enriched = both_miss = errors = 0
-    for movie in movies:
-        lookup = movie.scraped_title_normalized or movie.title or ''
-        year = str(movie.year) if movie.year else None
-        stripped = _strip_edition_suffix(lookup)
-        has_edition = stripped != lookup
+def _lookup(candidate: _Candidate, sleep_s: float = 0.0) -> _LookupResult:
+    """Look one movie up for its due tiers. Runs on a worker thread: no DB, no logging.
 
-        LOGGER.info('[%4d] %r  year=%s', movie.id, movie.title, year)
+    The ratings and metadata tiers skip the response cache read: their max ages
+    are at or below the cache TTLs, and the writer stamps the tier as refreshed.
+    """
+    if 'full' in candidate.tiers:
+        return _lookup_full(candidate, sleep_s)
 
-        # ── OMDb ─────────────────────────────────────────────────────────────
-        omdb_data = None
+    result = _LookupResult()
+    if 'ratings' in candidate.tiers:
         try:
-            omdb_data = _call_omdb(lookup, year)
-            if omdb_data is None and has_edition and year:
-                omdb_data = _call_omdb(lookup, None)        # retry 1: keep title, drop year
-            if omdb_data is None and has_edition:
-                omdb_data = _call_omdb(stripped, year)      # retry 2: strip suffix, keep year
+            data = _call_omdb_by_id(candidate.imdb_id, fresh=True)
+            if data:
+                result.omdb_hit = True
+                result.omdb_fields = _parse_omdb(data)
         except Exception as e:
-            LOGGER.warning('  OMDb error: %s', e)
+            result.warnings.append(f'OMDb error: {e}')
+        if sleep_s:
+            time.sleep(sleep_s)
+    if 'metadata' in candidate.tiers:
+        result.tmdb_id = candidate.tmdb_id
+        try:
+            result.tmdb_fields = _parse_tmdb(_call_tmdb_details(candidate.tmdb_id, fresh=True))
+            result.tmdb_fields['tmdb_id'] = candidate.tmdb_id
+        except Exception as e:
+            result.warnings.append(f'TMDb details error: {e}')
+        if sleep_s:
+            time.sleep(sleep_s)
+    return result
+
+
+def _lookup_full(candidate: _Candidate, sleep_s: float = 0.0) -> _LookupResult:
+    """OMDb search then TMDb find/search and details: re-resolves the movie's identity."""
+    lookup, year = candidate.lookup, candidate.year
+    stripped = _strip_edition_suffix(lookup)
+    has_edition = stripped != lookup
+    result = _LookupResult()
+
+    def omdb(title, y):
+        result.lookups.append({'api': 'omdb', 'title': title, 'year': y})
+        return _call_omdb(title, y, fresh=candidate.fresh)
+
+    def search(title, y):
+        result.lookups.append({'api': 'tmdb_search', 'title': title, 'year': y})
+        return _call_tmdb_search(title, y, fresh=candidate.fresh)
+
+    # ── OMDb ─────────────────────────────────────────────────────────────
+    omdb_data = None
+    try:
+        omdb_data = omdb(lookup, year)
+        if omdb_data is None and has_edition and year:
+            omdb_data = omdb(lookup, None)        # retry 1: keep title, drop year
+        if omdb_data is None and has_edition:
+            omdb_data = omdb(stripped, year)      # retry 2: strip suffix, keep year
+    except Exception as e:
+        result.warnings.append(f'OMDb error: {e}')
+    if sleep_s:
         time.sleep(sleep_s)
 
-        omdb_fields = _parse_omdb(omdb_data) if omdb_data else {}
-        imdb_id = omdb_fields.get('imdb_id')
-        if omdb_data:
-            LOGGER.info('  OMDb HIT  imdb=%s  rating=%s  RT=%s  MC=%s',
-                        imdb_id, omdb_fields.get('imdb_rating'),
-                        omdb_fields.get('omdb_rt_score'), omdb_fields.get('omdb_metacritic_score'))
-        else:
-            LOGGER.info('  OMDb MISS')
+    if omdb_data:
+        result.omdb_hit = True
+        result.omdb_fields = _parse_omdb(omdb_data)
+    imdb_id = result.omdb_fields.get('imdb_id')
 
-        # ── TMDb ─────────────────────────────────────────────────────────────
-        tmdb_id = None
-        try:
-            if imdb_id:
-                tmdb_id = _call_tmdb_find(imdb_id)
-            if not tmdb_id:
-                tmdb_id = _call_tmdb_search(lookup, year or '')
-            if not tmdb_id and has_edition:
-                tmdb_id = _call_tmdb_search(stripped, year or '')
-        except Exception as e:
-            LOGGER.warning('  TMDb search error: %s', e)
+    # ── TMDb ─────────────────────────────────────────────────────────────
+    tmdb_id = None
+    try:
+        if imdb_id:
+            tmdb_id = _call_tmdb_find(imdb_id, fresh=candidate.fresh)
+        if not tmdb_id:
+            tmdb_id = search(lookup, year or '')
+        if not tmdb_id and has_edition:
+            tmdb_id = search(stripped, year or '')
+    except Exception as e:
+        result.warnings.append(f'TMDb search error: {e}')
+    if sleep_s:
         time.sleep(sleep_s)
 
-        tmdb_fields: dict = {}
-        if tmdb_id:
-            try:
-                details = _call_tmdb_details(tmdb_id)
-                tmdb_fields = _parse_tmdb(details)
-                tmdb_fields['tmdb_id'] = tmdb_id
-                LOGGER.info('  TMDb HIT  id=%d  genres=%s  poster=%s',
-                            tmdb_id, tmdb_fields.get('tmdb_genres'),
-                            bool(tmdb_fields.get('tmdb_poster_url')))
-            except Exception as e:
-                LOGGER.warning('  TMDb details error: %s', e)
+    result.tmdb_id = tmdb_id
+    if tmdb_id:
+        try:
+            details = _call_tmdb_details(tmdb_id, fresh=candidate.fresh)
+            result.tmdb_fields = _parse_tmdb(details)
+            result.tmdb_fields['tmdb_id'] = tmdb_id
+        except Exception as e:
+            result.warnings.append(f'TMDb details error: {e}')
+        if sleep_s:
             time.sleep(sleep_s)
-        else:
-            LOGGER.info('  TMDb MISS')
+    return result
+
+
+def _record_miss(session, candidate: _Candidate, result: _LookupResult, now: datetime) -> int:
+    """Upsert the enrichment_misses row for a both-miss; returns the attempt count.
+
+    Attempts only accumulate while the lookup title stays the same: a movie whose
+    scraped_title_normalized changed starts again from one.
+    """
+    prev = session.execute(
+        text('SELECT attempts, lookup_title FROM enrichment_misses WHERE movie_id = :id'),
+        {'id': candidate.id},
+    ).first()
+    attempts = prev.attempts + 1 if prev is not None and prev.lookup_title == candidate.lookup else 1
+    session.execute(
+        text("""
+            INSERT INTO enrichment_misses
+                (movie_id, lookup_title, lookups, attempts, first_attempt_at, last_attempt_at, retry_after)
+            VALUES (:id, :lookup_title, CAST(:lookups AS jsonb), :attempts, :now, :now, :retry_after)
+            ON CONFLICT (movie_id) DO UPDATE SET
+                lookup_title     = EXCLUDED.lookup_title,
+                lookups          = EXCLUDED.lookups,
+                attempts         = EXCLUDED.attempts,
+                first_attempt_at = CASE WHEN EXCLUDED.attempts = 1 THEN EXCLUDED.first_attempt_at
+                                        ELSE enrichment_misses.first_attempt_at END,
+                last_attempt_at  = EXCLUDED.last_attempt_at,
+                retry_after      = EXCLUDED.retry_after
+        """),
+        {
+            'id': candidate.id,
+            'lookup_title': candidate.lookup,
+            'lookups': json.dumps(result.lookups),
+            'attempts': attempts,
+            'now': now,
+            'retry_after': now + _miss_backoff(attempts),
+        },
+    )
+    return attempts
 
-        if not omdb_data and not tmdb_id:
-            both_miss += 1
-            continue
 
-        if not apply:
-            continue
+def _work_key(candidate: _Candidate) -> tuple:
+    """Candidates with equal keys would make identical API calls."""
+    if 'full' in candidate.tiers:
+        return ('full', candidate.lookup.casefold(), candidate.year)
+    return (candidate.tiers,
+            candidate.imdb_id if 'ratings' in candidate.tiers else None,
+            candidate.tmdb_id if 'metadata' in candidate.tiers else None)
 
-        session = get_session(engine)
-        try:
-            obj = session.get(Movie, movie.id)
-            for k, v in {**omdb_fields, **tmdb_fields}.items():
-                setattr(obj, k, v)
-            obj.enriched_at = datetime.now(timezone.utc)
-            session.commit()
-            enriched += 1
-        except Exception:
-            session.rollback()
-            LOGGER.exception('  Failed to write enrichment for [%d]', movie.id)
-            errors += 1
-        finally:
-            session.close()
 
-    if apply:
-        LOGGER.info('Done — enriched %d, both-missed %d, errors %d', enriched, both_miss, errors)
-    else:
-        LOGGER.info('DRY-RUN — %d candidates (%d would skip as both-miss)', len(movies) - both_miss, both_miss)
+def _plan_work(candidates: list[_Candidate]) -> list[list[_Candidate]]:
+    """Group candidates that would repeat each other's lookups, in first-seen order.
 
+    The same film often has several movies rows (one per cinema spelling, suffix
+    variant or null-year duplicate). A full lookup depends only on the lookup
+    title and year, and a cheap refresh only on the stored imdb_id / tmdb_id, so
+    each group is looked up once (its first member) and the result fanned out to
+    every row.
+    """
+    groups: dict[tuple, list[_Candidate]] = {}
+    for candidate in candidates:
+        groups.setdefault(_work_key(candidate), []).append(candidate)
+    return list(groups.values())
 
-# ── Backfill scraped_title_normalized (Step E.1, kept for reruns) ─────────────
 
-def _fetch_backfill_movies(session, refresh_all: bool, limit: int | None) -> list[Movie]:
-    stmt = select(Movie).order_by(Movie.id)
-    if not refresh_all:
-        stmt = stmt.where(Movie.scraped_title_normalized.is_(None))
-    if limit:
-        stmt = stmt.limit(limit)
-    return list(session.scalars(stmt).all())
+def _write_miss(engine, candidate: _Candidate, result: _LookupResult) -> None:
+    session = get_session(engine)
+    try:
+        attempts = _record_miss(session, candidate, result, datetime.now(timezone.utc))
+        session.commit()
+        LOGGER.info('  [%d] both missed %d time(s); next try in %s', candidate.id, attempts, _miss_backoff(attempts))
+    except Exception:
+        session.rollback()
+        LOGGER.exception('  Failed to record miss for [%d]', candidate.id)
+    finally:
+        session.close()
 
 
-def backfill_normalized_titles(
+def sync_enrichment(
     apply: bool = False,
     refresh_all: bool = False,
     limit: int | None = None,
+    sleep_s: float = 0.0,
+    backfill_count: int | None = None,
+    movie_ids: list[int] | None = None,
+    workers: int = ENRICH_WORKERS,
+    cache_mode: str | None = None,
+    retry_misses: bool = False,
+    write_batch: int = ENRICH_WRITE_BATCH,
+    tier: str | None = None,
+    time_budget_s: float | None = None,
+    budget: TimeBudget | None = None,
 ) -> None:
-    """Compute and write scraped_title_normalized without making any API calls."""
+    """Call OMDb + TMDb for each movie with a refresh tier due and write results to DB.
+
+    Each candidate gets the tiers _due_tiers() finds due: a full lookup for new or
+    partly identified movies, otherwise an OMDb-by-id ratings refresh and/or a
+    TMDb-details metadata refresh. `tier` restricts the run to one tier; with
+    refresh_all it is applied to every candidate (default 'full').
+
+    movie_ids restricts the candidate query to those rows (used by the streaming
+    ingest in scrapers/ingest_stream.py); the usual staleness rules still apply.
+
+    Candidates come soonest-screening first (work_priority.by_priority); once
+    time_budget_s seconds have passed no new lookups start, so a capped run has
+    covered the most visible films. A `budget` given instead is shared with other
+    calls. Candidates that would make identical calls
+    are merged first (_plan_work) and each group's result is written to all of
+    its rows.
+
+    Lookups run on `workers` threads (enrichment_engine.ordered_map), paced by the
+    per-API token buckets; results are logged in candidate order on this thread
+    and written `write_batch` movies per statement by EnrichmentWriter.
+
+    cache_mode overrides ENRICH_HTTP_CACHE_MODE for this run ('use', 'refresh',
+    'only', 'off'). In 'only' mode no request leaves the machine and no API keys
+    are needed; uncached lookups count as misses.
+
+    Movies both APIs cleanly missed are recorded in enrichment_misses and skipped
+    with exponential back-off (_miss_backoff) until their scraped_title_normalized
+    changes; retry_misses ignores the back-off. A retry skips the response cache
+    read, so it asks the APIs again rather than replaying the cached misses.
+    Lookups that failed with an error are not recorded, so they are retried on
+    the next run.
+    """
+    if cache_mode is not None:
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
+        _HTTP_CACHE.mode = cache_mode
+    if _HTTP_CACHE.mode != 'only':
+        _validate_env()
+
+    budget = budget or TimeBudget(time_budget_s)
     engine = get_engine()
     session = get_session(engine)
     try:
-        movies = _fetch_backfill_movies(session, refresh_all=refresh_all, limit=limit)
+        if backfill_count is not None:
+            movies = _fetch_backfill_enrichment_movies(session, backfill_count, retry_misses=retry_misses)
+        else:
+            movies = _fetch_enrichment_movies(
+                session, refresh_all=refresh_all, limit=limit, movie_ids=movie_ids,
+                retry_misses=retry_misses, tier=tier,
+            )
+        retrying = _missed_ids(session, [m.id for m in movies])
     finally:
         session.close()
 
-    if not movies:
-        LOGGER.info('No movies to process')
+    now = datetime.now(timezone.utc)
+    candidates = []
+    for movie in movies:
+        tiers = ('full',) if backfill_count is not None else _due_tiers(movie, now, refresh_all, tier)
+        if tiers:
+            candidates.append(_Candidate.from_movie(movie, tiers, fresh=movie.id in retrying and 'full' in tiers))
+
+    if not candidates:
+        LOGGER.info('No movies to enrich')
         return
 
-    scope = 'all movies' if refresh_all else 'movies missing scraped_title_normalized'
-    LOGGER.info('Processing %d %s', len(movies), scope)
+    LOGGER.info('Enriching %d movie(s) on %d worker(s)', len(candidates), max(workers, 1))
     if not apply:
         LOGGER.info('DRY-RUN — no writes will occur')
 
-    updated = skipped = unchanged = 0
-    for movie in movies:
-        computed = _api_lookup_title(movie.title or '', movie.scraped_cinema or '')
-        if not computed:
-            skipped += 1
-            continue
+    tier_counts = {t: sum(t in c.tiers for c in candidates) for t in TIERS}
+    for t, n in tier_counts.items():
+        REPORT.incr(f'enrich.tier_{t}', n)
+    LOGGER.info('Tiers — full %d, ratings %d, metadata %d',
+                tier_counts['full'], tier_counts['ratings'], tier_counts['metadata'])
+    groups = _plan_work(candidates)
+    if len(groups) < len(candidates):
+        LOGGER.info('%d lookup(s) after merging %d duplicate row(s)', len(groups), len(candidates) - len(groups))
+    REPORT.incr('enrich.deduped', len(candidates) - len(groups))
+
+    both_miss = errors = 0
+    writer = EnrichmentWriter(engine, batch_size=write_batch)
+    with writer:
+        for group, result in ordered_map(
+            lambda g: _lookup(replace(g[0], fresh=any(c.fresh for c in g)), sleep_s),
+            budget.take(groups), workers=workers,
+        ):
+            lead = group[0]
+            LOGGER.info('[%4d] %r  year=%s  %s%s', lead.id, lead.title, lead.year, '+'.join(lead.tiers),
+                        f"  (also {', '.join(str(c.id) for c in group[1:])})" if len(group) > 1 else '')
+            if isinstance(result, BaseException):
+                LOGGER.error('  Lookup failed: %s', result)
+                errors += len(group)
+                continue
+            result.log(lead.tiers)
+
+            if 'full' in lead.tiers and not result.omdb_hit and not result.tmdb_id:
+                both_miss += len(group)
+                if apply and not result.warnings:
+                    for candidate in group:
+                        _write_miss(engine, candidate, result)
+                continue
+
+            if not result.fields:
+                # A refresh (or a TMDb id whose details failed) that brought back nothing.
+                errors += len(group) if result.warnings else 0
+                continue
+            if apply:
+                for candidate in group:
+                    writer.add(candidate.id, result.fields, candidate.tiers)
+    enriched = writer.written
+    errors += writer.failed
+    if budget.cut:
+        LOGGER.info('Time budget of %.0f s spent — %d lookup(s) left for the next run', budget.seconds, budget.cut)
+        REPORT.incr('enrich.budget_deferred', budget.cut)
+
+    REPORT.incr('enrich.enriched', enriched)
+    REPORT.incr('enrich.both_miss', both_miss)
+    REPORT.incr('enrich.errors', errors)
+    for host, m in http_client.host_metrics().items():
+        LOGGER.info('HTTP %s — %d request(s), %d retried, %d failed, p50 %.0f ms, p90 %.0f ms',
+                    host, m['requests'], m['retries'], m['errors'], m['p50_ms'], m['p90_ms'])
+    if apply:
+        LOGGER.info('Done — enriched %d, both-missed %d, errors %d', enriched, both_miss, errors)
+    else:
+        LOGGER.info('DRY-RUN — %d candidates (%d would skip as both-miss)', len(candidates) - both_miss, both_miss)
+
 
-        if refresh_all and movie.scraped_title_normalized == computed:
-            unchanged += 1
-            continue
+# ── Backfill scraped_title_normalized (Step E.1, kept for reruns) ─────────────
+
+# Rows read per server-side cursor fetch and written per bulk UPDATE.
+BACKFILL_CHUNK = 2000
+
+_BACKFILL_SELECT = 'SELECT id, title, scraped_cinema, scraped_title_normalized FROM movies'
+_BACKFILL_UPDATE = """
+    UPDATE movies AS m
+    SET scraped_title_normalized = v.scraped_title_normalized
+    FROM (VALUES %s) AS v (id, scraped_title_normalized)
+    WHERE m.id = v.id
+"""
 
-        LOGGER.info('[%4d] %-60s → %r', movie.id, repr(movie.title), computed)
 
-        if not apply:
-            continue
+def _stream_backfill_rows(conn, refresh_all: bool, limit: int | None, chunk_size: int):
+    """Yield lists of (id, title, scraped_cinema, scraped_title_normalized), in id order.
 
-        session = get_session(engine)
+    Reads through a server-side (named) cursor, so only one chunk is ever held in
+    memory, and never touches the wide columns (embedding, synopsis).
+    """
+    sql = _BACKFILL_SELECT
+    if not refresh_all:
+        sql += ' WHERE scraped_title_normalized IS NULL'
+    sql += ' ORDER BY id'
+    params: tuple = ()
+    if limit:
+        sql += ' LIMIT %s'
+        params = (limit,)
+    with conn.cursor(name='backfill_normalized_titles') as cur:
+        cur.itersize = chunk_size
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+
+def _write_normalized_titles(conn, updates: list[tuple[int, str]]) -> tuple[int, int]:
+    """Write a chunk of (id, scraped_title_normalized) in one UPDATE; (updated, failed).
+
+    A failed chunk is rolled back and retried row by row.
+    """
+    def write(rows):
+        cur = conn.cursor()
+        execute_values(cur, _BACKFILL_UPDATE, rows, template='(%s::integer, %s::text)',
+                       page_size=len(rows))
+        conn.commit()
+
+    try:
+        write(updates)
+        return len(updates), 0
+    except psycopg2.Error:
+        conn.rollback()
+        LOGGER.exception('Bulk title update of %d movie(s) failed; retrying one by one', len(updates))
+    updated = failed = 0
+    for row in updates:
         try:
-            obj = session.get(Movie, movie.id)
-            obj.scraped_title_normalized = computed
-            session.commit()
+            write([row])
             updated += 1
-        except Exception:
-            session.rollback()
-            LOGGER.exception('Failed to update [%d] %r', movie.id, movie.title)
-        finally:
-            session.close()
+        except psycopg2.Error:
+            conn.rollback()
+            LOGGER.exception('Failed to update [%d] %r', *row)
+            failed += 1
+    return updated, failed
 
-    if apply:
-        LOGGER.info('Done — updated %d, unchanged %d, skipped %d', updated, unchanged, skipped)
-    elif refresh_all:
-        LOGGER.info('DRY-RUN — %d would change, %d unchanged, %d skipped',
-                    len(movies) - unchanged - skipped, unchanged, skipped)
+
+def backfill_normalized_titles(
+    apply: bool = False,
+    refresh_all: bool = False,
+    limit: int | None = None,
+    chunk_size: int = BACKFILL_CHUNK,
+) -> None:
+    """Compute and write scraped_title_normalized without making any API calls.
+
+    Streams the four columns it needs chunk_size rows at a time and writes each
+    chunk's changes with one UPDATE ... FROM (VALUES ...), on a second connection
+    so the read cursor survives the commits.
+    """
+    chunk_size = max(1, chunk_size)
+    scope = 'all movies' if refresh_all else 'movies missing scraped_title_normalized'
+    LOGGER.info('Scanning %s', scope)
+    if not apply:
+        LOGGER.info('DRY-RUN — no writes will occur')
+
+    engine = get_engine()
+    read_conn = engine.raw_connection()
+    write_conn = engine.raw_connection() if apply else None
+    scanned = changed = updated = failed = skipped = unchanged = 0
+    try:
+        for rows in _stream_backfill_rows(read_conn, refresh_all, limit, chunk_size):
+            scanned += len(rows)
+            updates = []
+            for movie_id, title, cinema, current in rows:
+                computed = _api_lookup_title(title or '', cinema or '')
+                if not computed:
+                    skipped += 1
+                    continue
+                if refresh_all and current == computed:
+                    unchanged += 1
+                    continue
+                LOGGER.info('[%4d] %-60s → %r', movie_id, repr(title), computed)
+                updates.append((movie_id, computed))
+            changed += len(updates)
+            if write_conn is not None and updates:
+                ok, bad = _write_normalized_titles(write_conn, updates)
+                updated += ok
+                failed += bad
+    finally:
+        read_conn.close()
+        if write_conn is not None:
+            write_conn.close()
+
+    if not scanned:
+        LOGGER.info('No movies to process')
+    elif apply:
+        LOGGER.info('Done — scanned %d, updated %d, unchanged %d, skipped %d, failed %d',
+                    scanned, updated, unchanged, skipped, failed)
+    else:
+        LOGGER.info('DRY-RUN — scanned %d, %d would change, %d unchanged, %d skipped',
+                    scanned, changed, unchanged, skipped)
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
@@ -430,8 +921,23 @@ def _build_parser() -> argparse.ArgumentParser:
                    help='Re-enrich all movies, ignoring enriched_at/release date check')
     p.add_argument('--limit', type=int, default=None,
                    help='Cap number of records processed')
-    p.add_argument('--sleep', type=float, default=0.1,
-                   help='Seconds between API calls (default: 0.1)')
+    p.add_argument('--sleep', type=float, default=0.0,
+                   help='Extra seconds each worker pauses after each API phase (default: 0; '
+                        'OMDB_RATE_PER_S / TMDB_RATE_PER_S already pace the calls)')
+    p.add_argument('--workers', type=int, default=ENRICH_WORKERS,
+                   help=f'Movies looked up concurrently (default: {ENRICH_WORKERS}; 1 = sequential)')
+    p.add_argument('--cache-mode', choices=CACHE_MODES, default=None,
+                   help="OMDb/TMDb response cache: use (default), refresh (ignore cached entries), "
+                        "only (offline replay, never call the APIs), off. Overrides ENRICH_HTTP_CACHE_MODE")
+    p.add_argument('--tier', choices=TIERS, default=None,
+                   help='Only run this refresh tier (with --refresh-all: run it for every movie, '
+                        'default full)')
+    p.add_argument('--time-budget', type=float, default=None, metavar='SECONDS',
+                   help='Stop starting new lookups after this many seconds (soonest screenings go first)')
+    p.add_argument('--write-batch', type=int, default=ENRICH_WRITE_BATCH,
+                   help=f'Enriched movies per bulk UPDATE (default: {ENRICH_WRITE_BATCH})')
+    p.add_argument('--retry-misses', action='store_true',
+                   help='Also look up movies still backing off after both APIs missed them')
     p.add_argument('--backfill-titles', action='store_true',
                    help='Only backfill scraped_title_normalized — no API calls')
     p.add_argument('--refresh-count', type=int, default=None, metavar='N',
@@ -454,6 +960,12 @@ def main(argv=None) -> None:
             limit=args.limit,
             sleep_s=args.sleep,
             backfill_count=args.refresh_count,
+            workers=args.workers,
+            cache_mode=args.cache_mode,
+            retry_misses=args.retry_misses,
+            write_batch=args.write_batch,
+            tier=args.tier,
+            time_budget_s=args.time_budget,
         )
 
 
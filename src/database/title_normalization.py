@@ -4,8 +4,13 @@ Pure string logic — no DB or environment dependencies — so it imports cleanl
 both the web-app context (``database.title_normalization``) and the scraper/script
 context (``src.database.title_normalization``).
 
+The same few hundred titles recur thousands of times per crawl (once per film
+item, then again in enrichment, dedup and backfill), so the public entry points
+are memoized in bounded LRU caches. normalize_title() returns every form in one
+call; the underscore helpers remain for callers that need a single form.
+
 Imported by:
-  - scrapers/pipelines.py            (_normalize_whitespace, _api_lookup_title, _strip_display_suffix)
+  - scrapers/pipelines.py            (normalize_title)
   - src/database/sync_enrichment.py  (_api_lookup_title)
   - scripts/dedup_movies.py          (_normalize_for_matching, _strip_display_suffix, _api_lookup_title)
 """
@@ -13,6 +18,12 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+# Distinct titles per cache. A full crawl sees well under a thousand; backfill and
+# dedup walk the whole movies table, which the bound keeps from growing unchecked.
+CACHE_SIZE = 8192
 
 # ── Whitelist regexes ──────────────────────────────────────────────────────────
 
@@ -39,9 +50,16 @@ _METROGRAPH_SELECTS_RE = re.compile(r'^.+?\bselects\s+', re.IGNORECASE)
 _METROGRAPH_PRECEDED_BY_RE = re.compile(r'\s+preceded\s+by\s+.+$', re.IGNORECASE)
 
 
+# Every suffix rule above is anchored at the end and ends in ")", "]" or "mm";
+# titles ending otherwise (nearly all of them) skip the three substitutions.
+_SUFFIX_ENDINGS = (')', ']', 'mm')
+
+
 def _normalize_whitespace(t: str) -> str:
     """Normalize unicode whitespace (e.g. \xa0 non-breaking space) to plain spaces."""
-    t = unicodedata.normalize('NFKC', t)
+    # ASCII text is already NFKC; skip the normalization pass for it.
+    if not t.isascii():
+        t = unicodedata.normalize('NFKC', t)
     return ' '.join(t.split())
 
 
@@ -50,15 +68,28 @@ def _is_all_caps_word(word: str) -> bool:
     return any(c.isupper() for c in word) and not any(c.islower() for c in word)
 
 
+@lru_cache(maxsize=CACHE_SIZE)
 def _strip_display_suffix(title: str) -> str:
     """Strip format suffix and normalize whitespace, preserving original casing."""
     t = _normalize_whitespace((title or '').strip())
+    if not t.lower().endswith(_SUFFIX_ENDINGS):
+        return t
     t = _PAREN_SUFFIX.sub('', t).strip()
     t = _BRACKET_SUFFIX.sub('', t).strip()
     t = _FORMAT_SUFFIX.sub('', t).strip()
     return t
 
 
+def _cinema_rules(cinema: str) -> str:
+    """The cinema-specific rule set _api_lookup_title applies; the cache key."""
+    upper = (cinema or '').upper()
+    if 'METROGRAPH' in upper:
+        return 'METROGRAPH'
+    if 'FILM FORUM' in upper:
+        return 'FILM FORUM'
+    return ''
+
+
 def _api_lookup_title(title: str, cinema: str = '') -> str:
     """Return title normalized for OMDb/TMDb API lookups.
 
@@ -70,14 +101,19 @@ def _api_lookup_title(title: str, cinema: str = '') -> str:
 
     Returns with original casing preserved (APIs are case-insensitive).
     """
+    return _api_lookup_cached(title, _cinema_rules(cinema))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _api_lookup_cached(title: str, cinema: str) -> str:
     # _strip_display_suffix handles whitespace normalization and suffix stripping —
     # those rules are not repeated here to avoid double-applying them.
     t = _strip_display_suffix(title)
     t = _PRESENTS_PREFIX_RE.sub('', t).strip()
-    if 'METROGRAPH' in cinema.upper():
+    if cinema == 'METROGRAPH':
         t = _METROGRAPH_SELECTS_RE.sub('', t).strip()
         t = _METROGRAPH_PRECEDED_BY_RE.sub('', t).strip()
-    if 'FILM FORUM' in cinema.upper():
+    if cinema == 'FILM FORUM':
         # Normalize curly apostrophes (U+2018/U+2019) scraped from Film Forum to
         # straight apostrophe so OMDb lookup matches (e.g. BERNSTEIN’S WALL)
         t = t.replace('’', "'").replace('‘', "'")
@@ -109,3 +145,45 @@ def _api_lookup_title(title: str, cinema: str = '') -> str:
 def _normalize_for_matching(title: str) -> str:
     """Apply all rules unconditionally for cross-cinema duplicate detection."""
     return _strip_display_suffix(title).lower()
+
+
+class TitleForms(NamedTuple):
+    """Every normalized form of one scraped title."""
+    title: str        # whitespace-normalized raw title
+    display: str      # _strip_display_suffix: stored movies.title
+    api_lookup: str   # _api_lookup_title(display): stored scraped_title_normalized
+    matching: str     # _normalize_for_matching: cross-cinema dedup key
+
+
+def normalize_title(raw_title: str, cinema: str = '') -> TitleForms:
+    """All normalized forms of raw_title, computed once per (title, cinema rule set)."""
+    return _normalize_cached(raw_title or '', _cinema_rules(cinema))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize_cached(raw_title: str, cinema: str) -> TitleForms:
+    title = _normalize_whitespace(raw_title)
+    display = _strip_display_suffix(title)
+    return TitleForms(
+        title=title,
+        display=display,
+        api_lookup=_api_lookup_cached(display, cinema),
+        matching=display.lower(),
+    )
+
+
+_CACHES = {
+    'normalize_title': _normalize_cached,
+    'strip_display_suffix': _strip_display_suffix,
+    'api_lookup_title': _api_lookup_cached,
+}
+
+
+def normalization_cache_info() -> dict[str, dict]:
+    """Hits, misses and size of each memo, e.g. for a run report."""
+    return {name: fn.cache_info()._asdict() for name, fn in _CACHES.items()}
+
+
+def clear_normalization_caches() -> None:
+    for fn in _CACHES.values():
+        fn.cache_clear()
@@ -0,0 +1,82 @@
+"""Shared work ordering for the embedding and enrichment syncs: most user-visible first.
+
+Users only ever see films with an upcoming showtime, and the sooner the screening
+the more it matters that the film is embedded (so it can be recommended) and
+enriched (so its card has ratings and a poster). Both syncs therefore order their
+candidates by
+
+  1. earliest upcoming showtime (films with none go last),
+  2. cinema coverage: distinct cinemas with upcoming showtimes, most first,
+  3. the sync's own tie-breakers, then id,
+
+so a run cut short by --limit, a time budget or an interruption has always
+covered the most visible films first.
+
+TimeBudget bounds a run's wall time: loops stop taking new work once it is spent
+and let work already in flight finish.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from sqlalchemy import func, select
+
+from .models import Movie, Showtime
+
+T = TypeVar('T')
+
+
+def upcoming_showtimes(now: datetime):
+    """Per-movie subquery: movie_id, next_show_time, cinema_count (future showtimes only)."""
+    return (
+        select(
+            Showtime.movie_id.label('movie_id'),
+            func.min(Showtime.show_time).label('next_show_time'),
+            func.count(func.distinct(Showtime.cinema)).label('cinema_count'),
+        )
+        .where(Showtime.show_time > now)
+        .group_by(Showtime.movie_id)
+        .subquery('upcoming')
+    )
+
+
+def by_priority(stmt, now: datetime | None = None, *tiebreakers):
+    """Order a select(Movie) statement by showtime priority, then `tiebreakers`, then id."""
+    upcoming = upcoming_showtimes(now or datetime.now(timezone.utc))
+    return (
+        stmt.outerjoin(upcoming, upcoming.c.movie_id == Movie.id)
+        .order_by(
+            upcoming.c.next_show_time.asc().nulls_last(),
+            upcoming.c.cinema_count.desc().nulls_last(),
+            *tiebreakers,
+            Movie.id,
+        )
+    )
+
+
+class TimeBudget:
+    """Wall-clock budget for one run; None or <= 0 seconds means unlimited."""
+
+    def __init__(self, seconds: float | None, clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self._clock = clock
+        self._start = clock()
+        self.cut = 0
+
+    def elapsed(self) -> float:
+        return self._clock() - self._start
+
+    def exhausted(self) -> bool:
+        return self.seconds is not None and self.elapsed() >= self.seconds
+
+    def take(self, items: Iterable[T]) -> Iterator[T]:
+        """Yield items until the budget is spent; `self.cut` counts those left behind."""
+        self.cut = 0
+        items = iter(items)
+        for item in items:
+            if self.exhausted():
+                self.cut = 1 + sum(1 for _ in items)
+                return
+            yield item
@@ -28,6 +28,24 @@ def _block_feedback_db_writes(monkeypatch):
     monkeypatch.setattr(_app_module, "insert_recommendation_feedback", MagicMock())
 
 
+class FakeClock:
+    """Manual clock for code that takes `clock=` / `sleep=`: sleeping advances `now`."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
 @pytest.fixture
 def client():
     flask_app.config["TESTING"] = True
@@ -0,0 +1,149 @@
+"""Unit tests for the --availability-only refresh path.
+
+Spiders are fed in-memory listing pages; AvailabilityPipeline runs against a mock
+connection with execute_values patched out, so no live Postgres is required.
+"""
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy.http import HtmlResponse, Request
+
+from scrapers.items import FilmItem, Showing
+from scrapers.pipelines import AvailabilityPipeline
+from scrapers.spiders.ifc_center_spider import IFCCenterSpider
+from scrapers.spiders.metrograph_spider import MetrographSpider
+
+METROGRAPH_LISTING = """
+<html><body>
+<div class="col-sm-12 homepage-in-theater-movie">
+  <h3 class="movie_title"><a href="/film/?vista_film_id=1">Stalker</a></h3>
+  <img src="https://metrograph.com/stalker.jpg"/>
+  <h5>Director: Andrei Tarkovsky</h5>
+  <h5>1979 / 161min / 35mm</h5>
+  <div class="showtimes">
+    <h5 class="sr-only">Sat April <span class="day-number">25</span></h5>
+    <div class="film_day"><a title="Buy Tickets" href="https://t.metrograph.com/1">7:00pm</a></div>
+    <h5 class="sr-only">Sun April <span class="day-number">26</span></h5>
+    <div class="film_day"><a title="Sold Out">3:00pm</a></div>
+  </div>
+</div>
+</body></html>
+"""
+
+IFC_LISTING = """
+<html><body>
+<div class="daily-schedule">
+  <h3>Sat Apr 25</h3>
+  <ul>
+    <li>
+      <div class="details"><h3><a href="https://www.ifccenter.com/films/stalker/">Stalker</a></h3></div>
+      <ul class="times"><li><a href="https://tix.ifccenter.com/1">7:00 pm</a></li></ul>
+    </li>
+  </ul>
+</div>
+</body></html>
+"""
+
+
+def _response(url, html):
+    return HtmlResponse(url=url, body=html, encoding='utf-8', request=Request(url))
+
+
+def test_metrograph_availability_mode_skips_detail_pages():
+    spider = MetrographSpider(availability_only=True)
+    out = list(spider.parse(_response('https://metrograph.com/film/', METROGRAPH_LISTING)))
+
+    (item,) = out
+    assert isinstance(item, FilmItem)
+    assert [s.ticket_link for s in item.showtimes] == ['https://t.metrograph.com/1', 'sold_out']
+    assert item.details_link == 'https://metrograph.com/film/?vista_film_id=1'
+    assert item.showtimes[0].show_time.month == 4 and item.showtimes[0].show_time.hour == 19
+
+
+def test_metrograph_full_mode_still_follows_detail_pages():
+    out = list(MetrographSpider().parse(_response('https://metrograph.com/film/', METROGRAPH_LISTING)))
+    assert len(out) == 1 and isinstance(out[0], Request)
+
+
+def test_ifc_availability_mode_skips_detail_pages():
+    spider = IFCCenterSpider(availability_only=True)
+    out = list(spider.parse(_response('https://www.ifccenter.com/', IFC_LISTING)))
+
+    assert len(out) == 1
+    (item,) = out
+    assert item.details_link == 'https://www.ifccenter.com/films/stalker/'
+    (showing,) = item.showtimes
+    assert showing.ticket_link == 'https://tix.ifccenter.com/1'
+    assert (showing.show_time.hour, showing.show_time.minute) == (19, 0)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    conn = MagicMock()
+    cur = MagicMock()
+    conn.cursor.return_value = cur
+    engine = MagicMock()
+    engine.raw_connection.return_value = conn
+    monkeypatch.setattr('scrapers.pipelines.get_engine', lambda: engine)
+    execute_values = MagicMock(return_value=[(0, 0)])
+    monkeypatch.setattr('scrapers.pipelines.execute_values', execute_values)
+
+    p = AvailabilityPipeline()
+    p.open_spider(MagicMock())
+    return p, conn, execute_values
+
+
+def test_pipeline_writes_one_bulk_update(pipeline):
+    p, conn, execute_values = pipeline
+    t = datetime.datetime(2026, 4, 25, 19, 0)
+    p.process_item(FilmItem('METROGRAPH', details_link='u1',
+                            showtimes=[Showing(t, None, 'sold_out')]), MagicMock())
+    p.process_item(FilmItem('METROGRAPH', details_link='u2',
+                            showtimes=[Showing(t, None, 'https://t/2')]), MagicMock())
+
+    p.close_spider(MagicMock())
+
+    execute_values.assert_called_once()
+    sql, rows = execute_values.call_args.args[1:3]
+    assert 'UPDATE showtimes' in sql
+    assert 'INSERT' not in sql and 'crawled_at' not in sql
+    assert execute_values.call_args.kwargs['fetch'] is True
+    assert set(rows) == {('METROGRAPH', 'u1', t, 'sold_out'), ('METROGRAPH', 'u2', t, 'https://t/2')}
+    conn.commit.assert_called_once()
+
+
+def test_pipeline_without_items_does_not_connect(pipeline):
+    p, conn, execute_values = pipeline
+    p.close_spider(MagicMock())
+    execute_values.assert_not_called()
+    conn.cursor.assert_not_called()
+
+
+def test_pipeline_ignores_trailing_slash_on_details_link(pipeline):
+    p, _, execute_values = pipeline
+    t = datetime.datetime(2026, 4, 25, 19, 0)
+    p.process_item(FilmItem('IFC CENTER', details_link='https://www.ifccenter.com/films/stalker/',
+                            showtimes=[Showing(t, None, 'https://tix/1')]), MagicMock())
+
+    p.close_spider(MagicMock())
+
+    sql, rows = execute_values.call_args.args[1:3]
+    assert rows == [('IFC CENTER', 'https://www.ifccenter.com/films/stalker', t, 'https://tix/1')]
+    assert "rtrim(s.details_link, '/') = v.details_link" in sql
+
+
+def test_pipeline_logs_unmatched_showtimes(pipeline):
+    p, _, execute_values = pipeline
+    execute_values.return_value = [(1, 2)]
+    t = datetime.datetime(2026, 4, 25, 19, 0)
+    for link in ('u1', 'u2', 'u3'):
+        p.process_item(FilmItem('METROGRAPH', details_link=link,
+                                showtimes=[Showing(t, None, 'sold_out')]), MagicMock())
+    spider = MagicMock()
+
+    p.close_spider(spider)
+
+    assert '1 ticket_link(s) changed' in spider.logger.info.call_args.args[0]
+    spider.logger.warning.assert_called_once()
+    assert '2 of 3 showtime(s) matched no stored row' in spider.logger.warning.call_args.args[0]
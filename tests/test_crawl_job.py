@@ -0,0 +1,138 @@
+"""Unit tests for resumable crawls (scrapers/crawl_job.py) and the pipeline's
+idempotency markers. Uses tmp_path for the job directory and a mock cursor."""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from scrapers.crawl_job import CrawlJob, item_marker, sweep_completed
+from scrapers.items import FilmItem
+from scrapers.pipelines import CinemaScraperPipeline
+
+SPIDERS = {"metrograph": ["METROGRAPH"], "angelika": ["ANGELIKA NEW YORK", "VILLAGE EAST"]}
+
+
+def _film(title="Nosferatu"):
+    item = FilmItem(cinema="METROGRAPH", title=title, year=1922, details_link=f"/{title}")
+    item.add(datetime(2030, 1, 1, 19, 0), "DCP", "https://tix/1")
+    return item
+
+
+def test_new_job_then_resume_keeps_run_start(tmp_path):
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    assert job.pending_spiders() == ["metrograph", "angelika"]
+    assert job.jobdir("metrograph") == str(job.path / "metrograph")
+
+    job.spider_closed("metrograph", "finished")
+    job.spider_closed("angelika", "shutdown")
+
+    resumed = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    assert resumed.run_id == job.run_id
+    assert resumed.started_at == job.started_at
+    assert resumed.pending_spiders() == ["angelika"]
+
+
+def test_completed_job_is_not_resumed(tmp_path):
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    for name in SPIDERS:
+        job.spider_closed(name, "finished")
+    (job.path / "metrograph").mkdir()
+
+    assert job.finish_if_complete()
+    assert not (job.path / "metrograph").exists()
+    fresh = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    assert fresh.run_id != job.run_id
+    assert fresh.pending_spiders() == list(SPIDERS)
+
+
+def test_cinema_is_sweepable_only_once_all_its_spiders_finished(tmp_path):
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    job.record_written("metrograph", {"METROGRAPH"})
+    job.record_written("angelika", {"VILLAGE EAST"})
+    job.spider_closed("metrograph", "finished")
+    job.spider_closed("angelika", "shutdown")
+
+    assert job.sweepable_cinemas() == {"METROGRAPH"}
+    job.mark_swept({"METROGRAPH"})
+    assert job.sweepable_cinemas() == set()
+    assert not job.finish_if_complete()
+
+    job.spider_closed("angelika", "finished")
+    assert job.sweepable_cinemas() == {"VILLAGE EAST"}
+
+
+def test_test_mode_cinemas_are_blocked_by_their_unprefixed_declaration(tmp_path):
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    job.record_written("angelika", {"TEST_VILLAGE EAST"})
+    job.spider_closed("angelika", "finished")
+    job.record_written("metrograph", {"TEST_METROGRAPH"})
+    assert job.sweepable_cinemas() == {"TEST_VILLAGE EAST"}
+
+
+def test_markers_round_trip_and_ignore_torn_lines(tmp_path):
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    job.add_marker("metrograph", "abc", 7)
+    with open(job.path / "metrograph.written", "a") as f:
+        f.write("deadbeef")  # crashed mid-write
+    assert job.load_markers("metrograph") == {"abc": 7}
+    assert job.load_markers("angelika") == {}
+
+
+def test_item_marker_changes_with_showtimes():
+    a, b = _film(), _film()
+    assert item_marker(a) == item_marker(b)
+    b.add(datetime(2030, 1, 2, 19, 0))
+    assert item_marker(a) != item_marker(b)
+
+
+def test_sweep_completed_uses_run_start_and_records_sweep(tmp_path):
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    job.record_written("metrograph", {"METROGRAPH"})
+    job.spider_closed("metrograph", "finished")
+    engine = MagicMock()
+    cur = engine.raw_connection.return_value.cursor.return_value
+    cur.fetchall.return_value = [("METROGRAPH", 2)]
+
+    assert sweep_completed(job, engine) == {"METROGRAPH": 2}
+    assert cur.execute.call_args.args[1] == (["METROGRAPH"], job.started_at)
+    assert job.sweepable_cinemas() == set()
+
+
+@pytest.fixture
+def job_pipeline(monkeypatch, tmp_path):
+    conn = MagicMock()
+    cur = MagicMock()
+    conn.cursor.return_value = cur
+    engine = MagicMock()
+    engine.raw_connection.return_value = conn
+    monkeypatch.setattr("scrapers.pipelines.get_engine", lambda: engine)
+    monkeypatch.setattr("scrapers.pipelines.upsert_movie", lambda cur, movie: 42)
+    monkeypatch.setattr("scrapers.pipelines.execute_values", MagicMock())
+
+    job = CrawlJob.start_or_resume(tmp_path, SPIDERS)
+    monkeypatch.setattr(CinemaScraperPipeline, "crawl_job", job)
+    spider = MagicMock()
+    spider.name = "metrograph"
+    return job, spider, conn
+
+
+def test_pipeline_skips_items_committed_by_an_earlier_attempt(job_pipeline):
+    job, spider, conn = job_pipeline
+
+    first = CinemaScraperPipeline()
+    first.open_spider(spider)
+    assert first.run_started_at == job.started_at
+    first.process_item(_film(), spider)
+    assert conn.commit.call_count == 1
+    first.close_spider(spider)
+
+    # No sweep while a job owns it; the written cinema is recorded instead.
+    assert job.manifest["spiders"]["metrograph"]["written_cinemas"] == ["METROGRAPH"]
+    assert "DELETE FROM showtimes" not in str(conn.cursor.return_value.execute.call_args_list)
+
+    resumed = CinemaScraperPipeline()
+    resumed.open_spider(spider)
+    resumed.process_item(_film(), spider)
+    resumed.process_item(_film("Vampyr"), spider)
+    assert conn.commit.call_count == 2
+    assert resumed.written_cinemas == {"METROGRAPH"}
@@ -0,0 +1,106 @@
+"""Unit tests for the ingest run report (src/database/crawl_report.py) and the
+Scrapy extension that feeds it (scrapers/instrumentation.py).
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy.http import Request
+
+from scrapers.instrumentation import CrawlInstrumentation
+from src.database.crawl_report import REPORT, RunReport
+
+
+@pytest.fixture(autouse=True)
+def _fresh_report():
+    REPORT.reset('full')
+    yield
+    REPORT.reset('full')
+
+
+def test_timing_summary_and_histogram():
+    report = RunReport()
+    for ms in (5, 20, 20, 80, 3000):
+        report.observe('x', ms / 1000)
+
+    summary = report.timing_summary('x')
+
+    assert summary['count'] == 5
+    assert summary['p50_ms'] == 20
+    assert summary['max_ms'] == 3000
+    assert summary['histogram_ms']['le_10'] == 1
+    assert summary['histogram_ms']['le_25'] == 2
+    assert summary['histogram_ms']['le_100'] == 1
+    assert summary['histogram_ms']['le_5000'] == 1
+    assert sum(summary['histogram_ms'].values()) == 5
+
+
+def test_timed_decorator_records_each_call():
+    report = RunReport()
+
+    @report.timed('call')
+    def f(x):
+        return x * 2
+
+    assert f(2) == 4 and f(3) == 6
+    assert report.timing_summary('call')['count'] == 2
+
+
+def test_timer_records_even_when_body_raises():
+    report = RunReport()
+    with pytest.raises(ValueError):
+        with report.timer('boom'):
+            raise ValueError
+    assert report.timing_summary('boom')['count'] == 1
+
+
+def test_report_is_json_serializable(tmp_path):
+    report = RunReport('pipelined')
+    report.observe('embed.api_batch', 0.2)
+    report.incr('embed.movies', 16)
+    report.finish()
+
+    data = json.loads(report.write(tmp_path / 'r.json').read_text())
+
+    assert data['mode'] == 'pipelined'
+    assert data['counters'] == {'embed.movies': 16}
+    assert data['timings']['embed.api_batch']['count'] == 1
+
+
+def test_persist_inserts_one_crawl_runs_row():
+    report = RunReport()
+    engine = MagicMock()
+    cur = engine.raw_connection.return_value.cursor.return_value
+
+    report.persist(engine)
+
+    sql, params = cur.execute.call_args.args
+    assert 'INSERT INTO crawl_runs' in sql
+    assert params[2] == 'full'
+    assert json.loads(params[4])['mode'] == 'full'
+    engine.raw_connection.return_value.commit.assert_called_once()
+
+
+def test_extension_records_latency_and_spider_summary():
+    stats = MagicMock()
+    stats.get_stats.return_value = {
+        'item_scraped_count': 10,
+        'downloader/request_count': 3,
+        'downloader/response_count': 3,
+        'downloader/response_status_count/200': 2,
+        'downloader/response_status_count/304': 1,
+    }
+    ext = CrawlInstrumentation(stats)
+    spider = MagicMock()
+    spider.name = 'metrograph'
+
+    ext.spider_opened(spider)
+    for latency in (0.1, 0.2, 0.3):
+        ext.response_received(MagicMock(), Request('https://x', meta={'download_latency': latency}), spider)
+    ext.spider_closed(spider, 'finished')
+
+    summary = REPORT.as_dict()['spiders']['metrograph']
+    assert summary['requests'] == 3
+    assert summary['status_counts'] == {'200': 2, '304': 1}
+    assert summary['items'] == 10
+    assert summary['request_latency']['count'] == 3
@@ -0,0 +1,156 @@
+"""Unit tests for the film-detail page cache (scrapers/detail_cache.py).
+
+The cache is attached by hand instead of through from_crawler, so nothing here
+loads from or flushes to the DB.
+"""
+import datetime
+from datetime import timedelta, timezone
+
+import pytest
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+from sqlalchemy.exc import OperationalError
+
+import scrapers.detail_cache as dc
+from scrapers.detail_cache import DetailCache, DetailEntry
+from scrapers.items import FilmItem
+from scrapers.spiders.film_forum_spider import FilmForumSpider
+
+URL = 'https://filmforum.org/film/reunion'
+SHOWTIMES = [(datetime.date(2026, 4, 20), '7:30'), (datetime.date(2026, 4, 21), '12:00')]
+
+REUNION_HTML = """
+<html><body>
+  <h2 class="main-title">Reunion</h2>
+  <div class="copy">
+    <p><strong>U.K., 1989<br/>Directed by Jerry Schatzberg<br/>Approx. 110 min.</strong></p>
+    <p>A lawyer returns to Stuttgart.</p>
+  </div>
+</body></html>
+"""
+
+CACHED_METADATA = {
+    'title': 'Reunion',
+    'details_link': URL,
+    'image_url': None,
+    'ticket_link': 'https://my.filmforum.org/events/reunion',
+    'director': 'Jerry Schatzberg',
+    'year': '1989',
+    'runtime': 110,
+    'format': 'UNKNOWN',
+    'synopsis': 'Cached synopsis.',
+}
+
+
+def _entry(age: timedelta, etag='"abc"', last_modified=None) -> DetailEntry:
+    return DetailEntry(
+        url=URL,
+        cinema='FILM FORUM',
+        metadata=dict(CACHED_METADATA),
+        fetched_at=datetime.datetime.now(timezone.utc) - age,
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+
+@pytest.fixture
+def spider():
+    sp = FilmForumSpider()
+    sp.detail_cache = DetailCache(freshness_days=14)
+    return sp
+
+
+def _response(status=200, body=REUNION_HTML, headers=None, meta=None):
+    request = Request(URL, meta={'showtimes': SHOWTIMES, 'detail_url': URL, **(meta or {})})
+    return HtmlResponse(URL, status=status, body=body, encoding='utf-8',
+                        headers=headers or {}, request=request)
+
+
+def test_fresh_entry_yields_items_without_request(spider):
+    spider.detail_cache.entries[URL] = _entry(timedelta(days=2))
+
+    out = list(spider.follow_detail(URL, {'showtimes': SHOWTIMES}))
+
+    (item,) = out
+    assert isinstance(item, FilmItem)
+    assert len(item.showtimes) == 2
+    assert item.synopsis == 'Cached synopsis.'
+    assert item.showtimes[0].show_time == datetime.datetime(2026, 4, 20, 19, 30)
+
+
+def test_stale_entry_sends_conditional_request(spider):
+    spider.detail_cache.entries[URL] = _entry(
+        timedelta(days=30), last_modified='Mon, 06 Apr 2026 10:00:00 GMT')
+
+    (req,) = spider.follow_detail(URL, {'showtimes': SHOWTIMES})
+
+    assert isinstance(req, Request)
+    assert req.headers.get('If-None-Match') == b'"abc"'
+    assert req.headers.get('If-Modified-Since') == b'Mon, 06 Apr 2026 10:00:00 GMT'
+    assert req.meta['handle_httpstatus_list'] == [304]
+
+
+def test_uncached_url_sends_plain_request(spider):
+    (req,) = spider.follow_detail(URL, {'showtimes': SHOWTIMES})
+
+    assert 'If-None-Match' not in req.headers
+    assert 'handle_httpstatus_list' not in req.meta
+
+
+def test_not_modified_reuses_cached_metadata(spider):
+    entry = _entry(timedelta(days=30))
+    spider.detail_cache.entries[URL] = entry
+
+    items = list(spider.parse_film(_response(status=304, body='')))
+
+    assert [i.synopsis for i in items] == ['Cached synopsis.']
+    assert len(items[0].showtimes) == 2
+    assert entry.is_fresh(spider.detail_cache.freshness)
+    assert URL in spider.detail_cache._dirty
+
+
+def test_full_response_is_parsed_and_stored_with_validators(spider):
+    response = _response(headers={'ETag': '"v2"', 'Last-Modified': 'Tue, 07 Apr 2026 GMT'})
+
+    items = list(spider.parse_film(response))
+
+    assert 'A lawyer returns to Stuttgart.' in items[0].synopsis
+    stored = spider.detail_cache.get(URL)
+    assert stored.etag == '"v2"'
+    assert stored.last_modified == 'Tue, 07 Apr 2026 GMT'
+    assert stored.metadata['director'] == 'Jerry Schatzberg'
+    assert stored.cinema == 'FILM FORUM'
+
+
+def test_spider_without_cache_parses_normally():
+    items = list(FilmForumSpider().parse_film(_response()))
+    assert items[0].runtime == 110
+
+
+def test_spider_can_cap_freshness_window():
+    assert DetailCache.from_settings(Settings({'DETAIL_CACHE_FRESHNESS_DAYS': 14})).freshness == timedelta(days=14)
+    capped = DetailCache.from_settings(Settings({'DETAIL_CACHE_FRESHNESS_DAYS': 14}),
+                                       FilmForumSpider.detail_cache_max_freshness_days)
+    assert capped.freshness == timedelta(days=1)
+    refresh = DetailCache.from_settings(Settings({'DETAIL_CACHE_FRESHNESS_DAYS': 0}), 1)
+    assert refresh.freshness == timedelta(0)   # --refresh-details still wins
+
+
+def test_film_forum_ticket_link_is_not_served_from_a_day_old_entry(spider):
+    spider.detail_cache = DetailCache(freshness_days=FilmForumSpider.detail_cache_max_freshness_days)
+    spider.detail_cache.entries[URL] = _entry(timedelta(days=2))
+
+    [request] = list(spider.follow_detail(URL, {'showtimes': SHOWTIMES}))
+
+    assert isinstance(request, Request)
+
+
+def test_unreachable_database_falls_back_to_uncached_crawl(spider, monkeypatch):
+    def unreachable():
+        raise OperationalError('connect', {}, Exception('could not connect to server'))
+
+    monkeypatch.setattr(dc, 'get_engine', unreachable)
+    spider.detail_cache.put(URL, 'FILM FORUM', dict(CACHED_METADATA))
+
+    spider._open_detail_cache(spider)     # logged, not raised
+    spider._close_detail_cache(spider)
@@ -1,12 +1,15 @@
 """Unit tests for DryRunCollectorPipeline (the --dry-run collector).
 
-No network or DB: items are plain dicts and the spider/engine is mocked, matching the
+No network or DB: items are bare FilmItems and the spider/engine is mocked, matching the
 "mock engines/cursors" convention in AGENTS.md.
 """
+import datetime
+import json
 from unittest.mock import MagicMock
 
 import pytest
 
+from scrapers.items import FilmItem
 from scrapers.pipelines import DryRunCollectorPipeline
 
 
@@ -24,13 +27,13 @@ class FakeSpider:
 
 @pytest.fixture
 def collector():
-    """A reset collector at limit 3, plus a helper to feed showtime items."""
+    """A reset collector at limit 3, plus a helper to feed film items."""
     DryRunCollectorPipeline.reset(3)
     pipe = DryRunCollectorPipeline()
 
     def feed(spider, cinema, title, n=1):
         for _ in range(n):
-            pipe.process_item({'cinema': cinema, 'title': title}, spider)
+            pipe.process_item(FilmItem(cinema, title), spider)
 
     return feed
 
@@ -48,7 +51,7 @@ def test_collects_up_to_limit_then_stops(collector):
 
 
 def test_extra_showtimes_for_kept_movie_are_collected(collector):
-    """The limit caps distinct movies, not showtimes — a kept film keeps accruing rows."""
+    """The limit caps distinct movies, not items — a kept film keeps accruing rows."""
     spider = FakeSpider('film_forum', ['FILM FORUM'])
     collector(spider, 'FILM FORUM', 'Film A', n=5)
 
@@ -117,7 +120,7 @@ def test_reset_clears_state_between_runs(collector):
 
     spider2 = FakeSpider('metrograph', ['METROGRAPH'])
     DryRunCollectorPipeline().process_item(
-        {'cinema': 'METROGRAPH', 'title': 'Fresh Film'}, spider2
+        FilmItem('METROGRAPH', 'Fresh Film'), spider2
     )
     assert spider2.closed == []
     assert _titles('METROGRAPH') == {'Fresh Film'}
@@ -130,3 +133,40 @@ def test_titles_are_whitespace_normalized(collector):
     collector(spider, 'FILM FORUM', 'REUNION\xa0')
 
     assert _titles('FILM FORUM') == {'REUNION'}
+
+
+def test_stream_mode_appends_jsonl_instead_of_keeping_items(tmp_path):
+    path = tmp_path / 'dry_run.jsonl'
+    DryRunCollectorPipeline.reset(2, stream_path=path)
+    pipe = DryRunCollectorPipeline()
+    spider = FakeSpider('metrograph', ['METROGRAPH'])
+    try:
+        for i in range(4):
+            item = FilmItem('METROGRAPH', f'Film {i}')
+            item.add(datetime.datetime(2026, 4, 25, 19, i))
+            pipe.process_item(item, spider)
+
+        # Flushed per line, so readable before the crawl ends.
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line['title'] for line in lines] == ['Film 0', 'Film 1']
+        assert lines[0]['showtimes'] == ['2026-04-25 19:00:00']
+        assert DryRunCollectorPipeline.items == []
+    finally:
+        DryRunCollectorPipeline.close_stream()
+
+    summary = json.loads(path.read_text().splitlines()[-1])
+    assert summary == {'type': 'summary', 'n_movies_per_cinema': 2,
+                       'cinemas': {'METROGRAPH': {'movies': 2, 'showtimes': 2}}}
+    assert spider.closed == ['dry_run_limit']
+
+
+def test_record_keeps_per_film_format_and_lists_each_showing(collector):
+    item = FilmItem('ANGELIKA', 'Film A')
+    item.add(datetime.datetime(2026, 4, 25, 19, 0), format='IMAX')
+    item.add(datetime.datetime(2026, 4, 25, 21, 0), format='35mm', special_attributes='Q&A')
+    DryRunCollectorPipeline().process_item(item, FakeSpider('angelika', ['ANGELIKA']))
+
+    (record,) = DryRunCollectorPipeline.items
+    assert (record['format'], record['special_attributes']) == ('IMAX', None)
+    assert record['showtimes'] == ['2026-04-25 19:00:00', '2026-04-25 21:00:00']
+    assert [(s['format'], s['special_attributes']) for s in record['showings']] == [('IMAX', None), ('35mm', 'Q&A')]
@@ -0,0 +1,397 @@
+"""Unit tests for the concurrent enrichment engine (src/database/enrichment_engine.py)
+and its use in sync_enrichment. API calls and sessions are mocked."""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import src.database.sync_enrichment as se
+from src.database.enrichment_engine import TokenBucket, ordered_map
+from src.database.enrichment_writer import EnrichmentWriter
+
+
+def test_token_bucket_allows_burst_then_paces_to_rate(clock):
+    bucket = TokenBucket(rate=10, burst=5, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(15)]
+
+    assert waits[:5] == [0.0] * 5
+    assert all(w > 0 for w in waits[5:])
+    # 5 burst tokens, then 10 more at 10/s.
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_token_bucket_disabled_with_non_positive_rate():
+    bucket = TokenBucket(rate=0)
+    assert [bucket.acquire() for _ in range(100)] == [0.0] * 100
+
+
+def test_token_bucket_is_shared_safely_across_threads():
+    bucket = TokenBucket(rate=200, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(10)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 40 tokens at 200/s with no burst take at least ~0.195 s.
+    assert time.monotonic() - start >= 0.18
+
+
+def test_ordered_map_keeps_input_order_and_yields_exceptions():
+    def fn(i):
+        time.sleep(0.01 * (5 - i % 5))  # later items finish first
+        if i == 3:
+            raise ValueError('boom')
+        return i * i
+
+    results = list(ordered_map(fn, range(10), workers=4))
+
+    assert [item for item, _ in results] == list(range(10))
+    assert isinstance(results[3][1], ValueError)
+    assert [r for i, r in results if i != 3] == [i * i for i in range(10) if i != 3]
+
+
+def test_ordered_map_bounds_in_flight_work():
+    submitted = []
+    lock = threading.Lock()
+    high_water = 0
+
+    def items():
+        for i in range(50):
+            submitted.append(i)
+            yield i
+
+    consumed = 0
+    for _ in ordered_map(lambda i: i, items(), workers=2, max_in_flight=4):
+        consumed += 1
+        with lock:
+            high_water = max(high_water, len(submitted) - consumed)
+    assert high_water <= 4
+
+
+def test_ordered_map_inline_when_single_worker():
+    thread_names = list(ordered_map(lambda _: threading.current_thread().name, range(3), workers=1))
+    assert {name for _, name in thread_names} == {threading.current_thread().name}
+
+
+# ── sync_enrichment ──────────────────────────────────────────────────────────
+
+def _movie(i, title, **enrichment):
+    fields = dict(enriched_at=None, imdb_id=None, tmdb_id=None, tmdb_release_date=None,
+                  ratings_refreshed_at=None, metadata_refreshed_at=None)
+    return SimpleNamespace(id=i, title=title, scraped_title_normalized=title, year=2000 + i,
+                           **{**fields, **enrichment})
+
+
+@pytest.fixture
+def mocked_apis(monkeypatch):
+    monkeypatch.setattr(se, '_validate_env', lambda: None)
+    monkeypatch.setitem(se._LIMITERS, 'omdb', TokenBucket(0))
+    monkeypatch.setitem(se._LIMITERS, 'tmdb', TokenBucket(0))
+
+    def omdb(title, year, fresh=False):
+        time.sleep(0.02)
+        return None if title.startswith('Unknown') else {'imdbID': f'tt{year}', 'imdbRating': '7.5'}
+
+    def find(imdb_id, fresh=False):
+        time.sleep(0.02)
+        return int(imdb_id[2:])
+
+    def search(title, year, fresh=False):
+        return None
+
+    def details(tmdb_id, fresh=False):
+        time.sleep(0.02)
+        return {'genres': [{'name': 'Drama'}], 'original_title': f'T{tmdb_id}'}
+
+    monkeypatch.setattr(se, '_call_omdb', omdb)
+    monkeypatch.setattr(se, '_call_tmdb_find', find)
+    monkeypatch.setattr(se, '_call_tmdb_search', search)
+    monkeypatch.setattr(se, '_call_tmdb_details', details)
+
+    written = []
+
+    class FakeWriter(EnrichmentWriter):
+        def flush(self):
+            rows, self._pending = self._pending, []
+            written.extend({'id': movie_id, **fields} for movie_id, fields in rows)
+            self.written += len(rows)
+
+    monkeypatch.setattr(se, 'EnrichmentWriter', FakeWriter)
+    monkeypatch.setattr(se, 'get_engine', MagicMock())
+    monkeypatch.setattr(se, 'get_session', MagicMock())
+    return written
+
+
+def test_sync_enrichment_writes_results_in_candidate_order(monkeypatch, mocked_apis):
+    movies = [_movie(i, f'Film {i}') for i in range(1, 21)] + [_movie(30, 'Unknown film')]
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: movies)
+
+    start = time.monotonic()
+    se.sync_enrichment(apply=True, workers=10)
+    elapsed = time.monotonic() - start
+
+    assert [w['id'] for w in mocked_apis] == list(range(1, 21))
+    assert mocked_apis[0]['imdb_id'] == 'tt2001'
+    assert mocked_apis[0]['tmdb_id'] == 2001
+    assert mocked_apis[0]['tmdb_original_title'] == 'T2001'
+    # 20 sequential lookups would take >= 1.2 s of simulated latency.
+    assert elapsed < 0.6
+
+
+def test_lookup_error_is_counted_not_raised(monkeypatch, mocked_apis):
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: [_movie(1, 'Film')])
+    monkeypatch.setattr(se, '_lookup', MagicMock(side_effect=RuntimeError('boom')))
+
+    se.sync_enrichment(apply=True, workers=2)
+
+    assert mocked_apis == []
+
+
+# ── both-miss back-off ───────────────────────────────────────────────────────
+
+def test_miss_backoff_doubles_and_caps(monkeypatch):
+    monkeypatch.setattr(se, 'ENRICH_MISS_BACKOFF_DAYS', 1.0)
+    monkeypatch.setattr(se, 'ENRICH_MISS_MAX_BACKOFF_DAYS', 30.0)
+    assert [se._miss_backoff(n).days for n in (1, 2, 3, 5, 6, 20)] == [1, 2, 4, 16, 30, 30]
+
+
+def _miss_session(prev=None):
+    session = MagicMock()
+    session.execute.return_value.first.return_value = prev
+    return session
+
+
+def test_record_miss_counts_attempts_per_lookup_title():
+    candidate = se._Candidate(id=1, title='Shorts Program', lookup='shorts program', year=None)
+    result = se._LookupResult(lookups=[{'api': 'omdb', 'title': 'shorts program', 'year': None}])
+    now = se.datetime(2026, 1, 1, tzinfo=se.timezone.utc)
+
+    assert se._record_miss(_miss_session(), candidate, result, now) == 1
+    same = SimpleNamespace(attempts=3, lookup_title='shorts program')
+    session = _miss_session(same)
+    assert se._record_miss(session, candidate, result, now) == 4
+    params = session.execute.call_args.args[1]
+    assert params['retry_after'] == now + se._miss_backoff(4)
+    assert '"api": "omdb"' in params['lookups']
+
+    renamed = SimpleNamespace(attempts=3, lookup_title='metrograph presents shorts program')
+    assert se._record_miss(_miss_session(renamed), candidate, result, now) == 1
+
+
+def test_both_miss_is_recorded_unless_lookup_errored(monkeypatch, mocked_apis):
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: [_movie(1, 'Unknown'), _movie(2, 'Unknown 2')])
+    recorded = []
+    monkeypatch.setattr(se, '_record_miss', lambda session, c, r, now: recorded.append((c.id, r.lookups)) or 1)
+    calls = iter([None, RuntimeError('timeout')])
+
+    def omdb(title, year, fresh=False):
+        outcome = next(calls)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(se, '_call_omdb', omdb)
+
+    se.sync_enrichment(apply=True, workers=1)
+
+    assert [movie_id for movie_id, _ in recorded] == [1]
+    assert [l['api'] for l in recorded[0][1]] == ['omdb', 'tmdb_search']
+
+
+def test_candidate_query_skips_movies_backing_off():
+    from sqlalchemy.dialects import postgresql
+
+    session = MagicMock()
+    se._fetch_enrichment_movies(session, refresh_all=False, limit=None)
+    sql = str(session.scalars.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert 'NOT (EXISTS (SELECT * \nFROM enrichment_misses' in sql
+    assert 'coalesce(nullif(movies.scraped_title_normalized' in sql
+
+    se._fetch_enrichment_movies(session, refresh_all=False, limit=None, retry_misses=True)
+    sql = str(session.scalars.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert 'enrichment_misses' not in sql
+
+
+# ── refresh tiers ────────────────────────────────────────────────────────────
+
+NOW = se.datetime(2026, 6, 1, 12, tzinfo=se.timezone.utc)
+
+
+def _ago(days):
+    return NOW.replace(tzinfo=None) - se.timedelta(days=days)
+
+
+@pytest.mark.parametrize('enrichment, expected', [
+    ({}, ('full',)),
+    # identified, recent release, enriched two days ago: only ratings are stale
+    (dict(enriched_at=_ago(2), imdb_id='tt1', tmdb_id=1, tmdb_release_date=NOW.date()), ('ratings',)),
+    # catalogue title: ratings left alone, metadata stale after 30 days
+    (dict(enriched_at=_ago(40), imdb_id='tt1', tmdb_id=1, tmdb_release_date=se.date(1985, 6, 1)), ('metadata',)),
+    (dict(enriched_at=_ago(40), imdb_id='tt1', tmdb_id=1), ('ratings', 'metadata')),
+    (dict(enriched_at=_ago(40), imdb_id='tt1', tmdb_id=1, ratings_refreshed_at=_ago(0.5),
+          metadata_refreshed_at=_ago(3)), ()),
+    # TMDb never matched: identity re-resolved weekly, ratings refreshed meanwhile
+    (dict(enriched_at=_ago(10), imdb_id='tt1'), ('full',)),
+    (dict(enriched_at=_ago(2), imdb_id='tt1'), ('ratings',)),
+])
+def test_due_tiers(enrichment, expected):
+    assert se._due_tiers(_movie(1, 'Ran', **enrichment), NOW) == expected
+
+
+def test_due_tiers_refresh_all_and_only():
+    fresh = _movie(1, 'Ran', enriched_at=_ago(0), imdb_id='tt1', tmdb_id=None)
+    assert se._due_tiers(fresh, NOW, refresh_all=True) == ('full',)
+    assert se._due_tiers(fresh, NOW, refresh_all=True, only='ratings') == ('ratings',)
+    assert se._due_tiers(fresh, NOW, refresh_all=True, only='metadata') == ()
+    stale = _movie(1, 'Ran', enriched_at=_ago(40), imdb_id='tt1', tmdb_id=1)
+    assert se._due_tiers(stale, NOW, only='metadata') == ('metadata',)
+
+
+def test_cheap_tiers_skip_identity_lookups(monkeypatch, mocked_apis):
+    movie = _movie(5, 'Ran', enriched_at=_ago(40), imdb_id='tt0089881', tmdb_id=11645)
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: [movie])
+    by_id = MagicMock(return_value={'imdbID': 'tt0089881', 'imdbRating': '8.2'})
+    monkeypatch.setattr(se, '_call_omdb_by_id', by_id)
+    for name in ('_call_omdb', '_call_tmdb_find', '_call_tmdb_search'):
+        monkeypatch.setattr(se, name, MagicMock(side_effect=AssertionError(name)))
+
+    se.sync_enrichment(apply=True, workers=1)
+
+    by_id.assert_called_once_with('tt0089881', fresh=True)
+    [written] = mocked_apis
+    assert written['imdb_rating'] == 8.2
+    assert written['tmdb_original_title'] == 'T11645'
+    assert {'ratings_refreshed_at', 'metadata_refreshed_at'} <= written.keys()
+    assert 'enriched_at' not in written
+
+
+# ── deduplicated work ────────────────────────────────────────────────────────
+
+def test_plan_work_groups_identical_lookups():
+    full = [se._Candidate(1, 'Ran', 'Ran', '1985'), se._Candidate(2, 'RAN', 'ran', '1985'),
+            se._Candidate(3, 'Ran', 'Ran', None)]
+    cheap = [se._Candidate(4, 'Ran', 'Ran', '1985', ('ratings',), 'tt0089881', 11645),
+             se._Candidate(5, 'Ran [35mm]', 'Ran', None, ('ratings',), 'tt0089881', None),
+             se._Candidate(6, 'Ran', 'Ran', '1985', ('ratings', 'metadata'), 'tt0089881', 11645)]
+
+    groups = se._plan_work(full + cheap)
+
+    assert [[c.id for c in g] for g in groups] == [[1, 2], [3], [4, 5], [6]]
+
+
+def test_duplicate_rows_share_one_lookup(monkeypatch, mocked_apis):
+    movies = [_movie(1, 'Film 1'), _movie(2, 'Film 1'), _movie(3, 'Film 3')]
+    for m in movies:
+        m.year = 2001
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: movies)
+    omdb = MagicMock(return_value={'imdbID': 'tt2001', 'imdbRating': '7.0'})
+    monkeypatch.setattr(se, '_call_omdb', omdb)
+
+    se.sync_enrichment(apply=True, workers=2)
+
+    assert omdb.call_count == 2
+    assert [w['id'] for w in mocked_apis] == [1, 2, 3]
+    assert mocked_apis[0]['tmdb_id'] == mocked_apis[1]['tmdb_id'] == 2001
+
+
+def test_time_budget_defers_remaining_groups(monkeypatch, mocked_apis):
+    movies = [_movie(i, f'Film {i}') for i in range(1, 6)]
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: movies)
+
+    # Each lookup sleeps ~60 ms, so only the first fits a 30 ms budget.
+    se.sync_enrichment(apply=True, workers=1, time_budget_s=0.03)
+
+    assert [w['id'] for w in mocked_apis] == [1]
+
+
+# ── title backfill ───────────────────────────────────────────────────────────
+
+
+class _NamedCursor:
+    def __init__(self, rows):
+        self.rows, self.executed = list(rows), None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, sql, params):
+        self.executed = (sql, params)
+
+    def fetchmany(self, n):
+        chunk, self.rows = self.rows[:n], self.rows[n:]
+        return chunk
+
+
+def _backfill_engine(monkeypatch, rows):
+    reader, writer = MagicMock(), MagicMock()
+    cursor = _NamedCursor(rows)
+    reader.cursor.return_value = cursor
+    engine = MagicMock()
+    engine.raw_connection.side_effect = [reader, writer]
+    monkeypatch.setattr(se, 'get_engine', lambda: engine)
+    writes = []
+    monkeypatch.setattr(se, 'execute_values',
+                        lambda cur, sql, values, template, page_size: writes.append(list(values)))
+    monkeypatch.setattr(se, '_api_lookup_title', lambda title, cinema: title.lower())
+    return cursor, writer, writes
+
+
+def test_backfill_titles_streams_and_writes_one_update_per_chunk(monkeypatch):
+    rows = [(i, f'Film {i}', 'ifc', None) for i in range(1, 6)] + [(6, '', 'ifc', None)]
+    cursor, writer, writes = _backfill_engine(monkeypatch, rows)
+
+    se.backfill_normalized_titles(apply=True, chunk_size=2)
+
+    sql, params = cursor.executed
+    assert sql.startswith('SELECT id, title, scraped_cinema, scraped_title_normalized FROM movies')
+    assert 'WHERE scraped_title_normalized IS NULL' in sql and params == ()
+    assert writes == [[(1, 'film 1'), (2, 'film 2')], [(3, 'film 3'), (4, 'film 4')], [(5, 'film 5')]]
+    assert writer.commit.call_count == 3
+
+
+def test_backfill_titles_refresh_all_skips_unchanged_and_dry_run_writes_nothing(monkeypatch):
+    rows = [(1, 'Film 1', 'ifc', 'film 1'), (2, 'Film 2', 'ifc', 'old')]
+    cursor, writer, writes = _backfill_engine(monkeypatch, rows)
+
+    se.backfill_normalized_titles(apply=False, refresh_all=True, limit=10)
+
+    assert 'WHERE' not in cursor.executed[0] and cursor.executed[1] == (10,)
+    assert writes == []
+
+
+def test_backfill_titles_retries_failed_chunk_row_by_row(monkeypatch):
+    _, writer, _ = _backfill_engine(monkeypatch, [(1, 'A', '', None), (2, 'B', '', None)])
+    attempts = []
+
+    def execute_values(cur, sql, values, template, page_size):
+        attempts.append(len(values))
+        if any(movie_id == 2 for movie_id, _ in values):
+            raise se.psycopg2.DataError('bad')
+
+    monkeypatch.setattr(se, 'execute_values', execute_values)
+
+    se.backfill_normalized_titles(apply=True)
+
+    assert attempts == [2, 1, 1]
+    assert writer.commit.call_count == 1
+    assert writer.rollback.call_count == 2
+
+
+def test_movies_with_a_miss_record_are_looked_up_fresh(monkeypatch, mocked_apis):
+    movies = [_movie(1, 'Film 1'), _movie(2, 'Film 2')]
+    monkeypatch.setattr(se, '_fetch_enrichment_movies', lambda *a, **k: movies)
+    monkeypatch.setattr(se, '_missed_ids', lambda session, ids: {1})
+    seen = {}
+    monkeypatch.setattr(se, '_call_omdb',
+                        lambda title, year, fresh=False: seen.setdefault(title, fresh) and None)
+
+    se.sync_enrichment(apply=False, workers=1)
+
+    assert seen == {'Film 1': True, 'Film 2': False}
@@ -0,0 +1,75 @@
+"""Unit tests for batched enrichment writes (src/database/enrichment_writer.py).
+The psycopg2 connection and execute_values are mocked."""
+from datetime import date
+from unittest.mock import MagicMock
+
+import psycopg2
+import pytest
+
+import src.database.enrichment_writer as ew
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ew, 'execute_values',
+                        lambda cur, sql, values, template, page_size: calls.append((sql, template, values)))
+    return calls
+
+
+def test_update_groups_rows_by_column_set_and_clears_misses(captured):
+    cur = MagicMock()
+    rows = [
+        (1, {'imdb_id': 'tt1', 'imdb_rating': 7.5}),
+        (2, {'tmdb_id': 9, 'tmdb_genres': [], 'tmdb_release_date': date(2020, 1, 1)}),
+        (3, {'imdb_rating': 6.0, 'imdb_id': 'tt3'}),
+    ]
+
+    ew.update_enrichment(cur, rows)
+
+    assert len(captured) == 2
+    sql, template, values = captured[0]
+    assert 'SET imdb_id = v.imdb_id, imdb_rating = v.imdb_rating' in sql
+    assert 'AS v (id, imdb_id, imdb_rating)' in sql
+    assert 'tmdb' not in sql
+    assert template == '(%s::integer, %s::text, %s::numeric)'
+    assert values == [(1, 'tt1', 7.5), (3, 'tt3', 6.0)]
+    assert captured[1][1] == '(%s::integer, %s::integer, %s::text[], %s::date)'
+    cur.execute.assert_called_once_with(
+        'DELETE FROM enrichment_misses WHERE movie_id = ANY(%s)', ([1, 2, 3],))
+
+
+def test_update_rejects_non_enrichment_columns(captured):
+    with pytest.raises(ValueError):
+        ew.update_enrichment(MagicMock(), [(1, {'embedding': [0.1]})])
+    assert captured == []
+
+
+def test_writer_flushes_every_batch_and_on_exit(captured):
+    engine = MagicMock()
+    with ew.EnrichmentWriter(engine, batch_size=2) as writer:
+        for i in range(5):
+            writer.add(i, {'imdb_rating': 7.0})
+
+    assert writer.written == 5
+    assert [len(values) for _, _, values in captured] == [2, 2, 1]
+    assert all(v[-1] is not None for _, _, values in captured for v in values)   # enriched_at stamped
+    assert engine.raw_connection.return_value.commit.call_count == 3
+
+
+def test_failed_batch_is_retried_row_by_row(monkeypatch):
+    def execute_values(cur, sql, values, template, page_size):
+        if any(v[0] == 2 for v in values):
+            raise psycopg2.DataError('numeric field overflow')
+
+    monkeypatch.setattr(ew, 'execute_values', execute_values)
+    engine = MagicMock()
+    writer = ew.EnrichmentWriter(engine, batch_size=10)
+    for i in (1, 2, 3):
+        writer.add(i, {'imdb_rating': 7.0})
+    writer.flush()
+
+    assert (writer.written, writer.failed) == (2, 1)
+    conn = engine.raw_connection.return_value
+    assert conn.rollback.call_count == 2
+    conn.close.assert_called_once()
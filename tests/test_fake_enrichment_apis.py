@@ -0,0 +1,90 @@
+"""Tests for the local OMDb/TMDb stand-in (benchmarks/fake_enrichment_apis.py),
+driven through sync_enrichment's real lookup path with the base URLs pointed at it."""
+import time
+
+import pytest
+import requests
+
+import src.database.sync_enrichment as se
+from benchmarks.fake_enrichment_apis import FakeEnrichmentAPIs
+from src.database import http_client
+from src.database.enrichment_engine import TokenBucket
+
+
+@pytest.fixture
+def point_at(monkeypatch):
+    monkeypatch.setattr(http_client, '_session', http_client.build_session(retries=2, backoff_s=0))
+    monkeypatch.setattr(se._HTTP_CACHE, 'mode', 'off')
+    monkeypatch.setitem(se._LIMITERS, 'omdb', TokenBucket(0))
+    monkeypatch.setitem(se._LIMITERS, 'tmdb', TokenBucket(0))
+
+    def point(server):
+        monkeypatch.setattr(se, 'OMDB_BASE_URL', server.omdb_url)
+        monkeypatch.setattr(se, 'TMDB_BASE_URL', server.tmdb_url)
+        return server
+
+    return point
+
+
+def _candidate(title, year='1999'):
+    return se._Candidate(id=1, title=title, lookup=title, year=year)
+
+
+def test_full_lookup_round_trips_through_stand_in(point_at):
+    with point_at(FakeEnrichmentAPIs(miss_rate=0)) as server:
+        first = se._lookup(_candidate('Some Film'))
+        again = se._lookup(_candidate('Some Film'))
+
+    fields = first.fields
+    assert fields['imdb_id'].startswith('tt') and fields['imdb_rating'] is not None
+    assert fields['tmdb_id'] == int(fields['imdb_id'][2:])
+    assert fields['tmdb_genres'] and fields['tmdb_trailer_url'] and fields['tmdb_title_zh']
+    assert again.fields == fields
+    assert server.stats['omdb'] == server.stats['tmdb_find'] == server.stats['tmdb_details'] == 2
+
+
+def test_cheap_tiers_use_id_endpoints(point_at):
+    with point_at(FakeEnrichmentAPIs(miss_rate=0)) as server:
+        result = se._lookup(se._Candidate(id=1, title='X', lookup='X', year=None,
+                                          tiers=('ratings', 'metadata'),
+                                          imdb_id='tt1234567', tmdb_id=1234567))
+
+    assert result.fields['imdb_rating'] is not None and result.fields['tmdb_genres']
+    assert (server.stats['omdb_by_id'], server.stats['tmdb_details']) == (1, 1)
+
+
+def test_missed_title_is_a_both_miss(point_at):
+    with point_at(FakeEnrichmentAPIs(miss_rate=1)):
+        result = se._lookup(_candidate('Nobody Knows This'))
+
+    assert result.fields == {} and not result.omdb_hit
+
+
+def test_rate_limit_answers_429_with_retry_after():
+    with FakeEnrichmentAPIs(rate_limit_per_s=2, retry_after_s=7) as server:
+        statuses = [requests.get(f'{server.tmdb_url}/search/movie', params={'query': 'a'}, timeout=5)
+                    for _ in range(6)]
+
+    assert [r.status_code for r in statuses].count(429) >= 1
+    limited = next(r for r in statuses if r.status_code == 429)
+    assert limited.headers['Retry-After'] == '7'
+
+
+def test_injected_errors_surface_after_retries(point_at):
+    with point_at(FakeEnrichmentAPIs(error_rate=1)) as server:
+        with pytest.raises(requests.HTTPError):
+            se._call_omdb('Some Film', '1999')
+
+    assert server.stats['errors'] == 3   # 1 try + 2 retries
+
+
+def test_keep_alive_requests_add_no_latency_of_their_own():
+    with FakeEnrichmentAPIs(latency_s=0) as server, requests.Session() as session:
+        session.get(f'{server.omdb_url}?t=warmup', timeout=5)
+        start = time.monotonic()
+        for i in range(10):
+            session.get(f'{server.omdb_url}?t=film{i}', timeout=5)
+        elapsed = time.monotonic() - start
+
+    # A Nagle / delayed-ACK stall costs ~40 ms per request on a reused connection.
+    assert elapsed < 0.2
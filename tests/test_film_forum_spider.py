@@ -6,6 +6,7 @@ edge cases documented in AGENTS.md ("Scraper edge cases"). Each Case block
 below pins the page shape of a real film that once broke the parser.
 """
 import datetime
+from dataclasses import asdict
 
 import pytest
 from scrapy.http import HtmlResponse, Request
@@ -37,7 +38,7 @@ def _parse_film(html: str, url: str = 'https://filmforum.org/film/test',
     response = _make_response(html, url, meta={'showtimes': showtimes})
     items = list(FilmForumSpider().parse_film(response))
     assert items, "parse_film yielded nothing"
-    return items[0]
+    return asdict(items[0])
 
 
 def _p_selector(html: str):
@@ -0,0 +1,88 @@
+"""Unit tests for the film-grouped item model (scrapers/items.py): one FilmItem
+per film from the spiders, one movie upsert plus one showtimes statement per
+film in CinemaScraperPipeline. The DB is a mock cursor.
+"""
+import datetime
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy.http import Request, TextResponse
+
+from scrapers.items import FilmItem, Showing
+from scrapers.pipelines import CinemaScraperPipeline
+from scrapers.spiders.angelika_spider import AngelikaSpider
+
+T1 = datetime.datetime(2026, 4, 25, 19, 0)
+T2 = datetime.datetime(2026, 4, 26, 15, 0)
+
+
+def test_film_item_is_slotted_and_a_scrapy_item():
+    from itemadapter import ItemAdapter
+
+    item = FilmItem('METROGRAPH', 'Stalker')
+    item.add(T1, '35MM', 'https://t/1')
+
+    assert not hasattr(item, '__dict__')
+    assert ItemAdapter.is_item(item)
+    assert item.showtimes == [Showing(T1, '35MM', 'https://t/1', None)]
+
+
+def test_angelika_groups_showtypes_into_one_item():
+    film = {
+        'name': 'Stalker (1979)',
+        'director': 'Andrei Tarkovsky',
+        'movieSlug': 'stalker',
+        'showdates': [{'showtypes': [
+            {'type': '35mm', 'showtimes': [{'date_time': '2026-04-25T19:00:00-04'}]},
+            {'type': 'Q&A to follow', 'showtimes': [{'date_time': '2026-04-26T15:00:00-04', 'soldout': True}]},
+        ]}],
+    }
+    request = Request('https://api/films', meta={'cinema': 'ANGELIKA NEW YORK', 'cinema_slug': 'nyc'})
+    response = TextResponse('https://api/films', body=json.dumps([film]), encoding='utf-8', request=request)
+
+    (item,) = AngelikaSpider().parse(response)
+
+    assert item.year == 1979
+    assert item.showtimes == [
+        Showing(T1, '35MM', 'https://angelikafilmcenter.com/nyc/movies/details/stalker#showTime', None),
+        Showing(T2, 'UNKNOWN', 'sold_out', 'Q&A TO FOLLOW'),
+    ]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    conn = MagicMock()
+    cur = MagicMock()
+    cur.fetchone.return_value = (42,)
+    conn.cursor.return_value = cur
+    engine = MagicMock()
+    engine.raw_connection.return_value = conn
+    monkeypatch.setattr('scrapers.pipelines.get_engine', lambda: engine)
+    execute_values = MagicMock()
+    monkeypatch.setattr('scrapers.pipelines.execute_values', execute_values)
+
+    p = CinemaScraperPipeline()
+    p.open_spider(MagicMock())
+    return p, conn, cur, execute_values
+
+
+def test_pipeline_writes_film_once_and_showtimes_in_one_statement(pipeline):
+    p, conn, cur, execute_values = pipeline
+    item = FilmItem('IFC CENTER', 'Stalker', details_link='https://ifc/stalker', showtimes=[
+        Showing(T1, 'DCP', 'https://t/1'),
+        Showing(T2, 'DCP', 'https://t/2'),
+        Showing(T1, 'DCP', 'sold_out'),  # repeated key: last one wins
+    ])
+
+    p.process_item(item, MagicMock())
+
+    movie_sql = [c.args[0] for c in cur.execute.call_args_list]
+    assert len(movie_sql) == 1 and 'UPDATE movies' in movie_sql[0]
+    execute_values.assert_called_once()
+    sql, rows = execute_values.call_args.args[1:3]
+    assert 'INSERT INTO showtimes' in sql
+    assert [(r[3], r[4], r[5]) for r in rows] == [(T1, 'Saturday', 'sold_out'), (T2, 'Sunday', 'https://t/2')]
+    assert all(r[0] == 42 and r[14] == 'IFC CENTER' for r in rows)
+    conn.commit.assert_called_once()
+    assert p.written_cinemas == {'IFC CENTER'}
@@ -0,0 +1,150 @@
+"""Unit tests for the OMDb/TMDb response cache (src/database/http_cache.py) and its
+use by sync_enrichment._get_json. No network access."""
+from unittest.mock import MagicMock
+
+import pytest
+
+import src.database.sync_enrichment as se
+from src.database.enrichment_engine import TokenBucket
+from src.database.http_cache import DEFAULT_TTLS, CacheMiss, ResponseCache, request_key
+
+URL = 'https://api.themoviedb.org/3/movie/42'
+
+
+def _cache(tmp_path, clock, **kwargs):
+    return ResponseCache(tmp_path / 'http.sqlite', clock=clock, **kwargs)
+
+
+def test_key_ignores_api_keys_and_param_order():
+    a, _ = request_key('omdb', 'http://www.omdbapi.com/', {'t': 'Ran', 'y': '1985', 'apikey': 'k1'})
+    b, canonical = request_key('omdb', 'http://www.omdbapi.com/', {'apikey': 'k2', 'y': 1985, 't': 'Ran'})
+    assert a == b
+    assert 'apikey' not in canonical
+    assert request_key('omdb', 'http://www.omdbapi.com/', {'t': 'Ran'})[0] != a
+
+
+def test_round_trip_survives_reopen(tmp_path, clock):
+    cache = _cache(tmp_path, clock)
+    assert cache.get('tmdb_details', URL, {'api_key': 'k'}) is None
+    cache.put('tmdb_details', URL, {'api_key': 'k'}, {'id': 42, 'title': 'Ran'})
+    cache.close()
+
+    assert _cache(tmp_path, clock).get('tmdb_details', URL, {'api_key': 'other'}) == {'id': 42, 'title': 'Ran'}
+
+
+def test_ttl_is_per_endpoint(tmp_path, clock):
+    cache = _cache(tmp_path, clock)
+    cache.put('omdb', URL, {}, {'imdbRating': '8.2'})
+    cache.put('tmdb_details', URL, {}, {'id': 42})
+
+    clock.now += DEFAULT_TTLS['omdb'] + 1
+
+    assert cache.get('omdb', URL, {}) is None
+    assert cache.get('tmdb_details', URL, {}) == {'id': 42}
+
+
+def test_eviction_drops_least_recently_used(tmp_path, clock):
+    cache = _cache(tmp_path, clock, max_bytes=3000)
+    body = {'overview': 'x' * 900}
+    for i in range(3):
+        cache.put('tmdb_details', f'{URL}{i}', {}, body)
+        clock.now += 1
+    cache.get('tmdb_details', f'{URL}0', {})   # 0 is now more recent than 1
+    clock.now += 1
+
+    cache.put('tmdb_details', f'{URL}3', {}, body)
+
+    assert cache.get('tmdb_details', f'{URL}1', {}) is None
+    assert cache.get('tmdb_details', f'{URL}0', {}) == body
+    assert cache.get('tmdb_details', f'{URL}3', {}) == body
+    assert sum(s['bytes'] for s in cache.stats().values()) <= 3000
+
+
+def test_modes(tmp_path, clock):
+    cache = _cache(tmp_path, clock)
+    cache.put('omdb', URL, {}, {'a': 1})
+
+    cache.mode = 'refresh'
+    assert cache.get('omdb', URL, {}) is None
+    cache.put('omdb', URL, {}, {'a': 2})
+
+    cache.mode = 'only'
+    assert cache.get('omdb', URL, {}) == {'a': 2}
+    with pytest.raises(CacheMiss):
+        cache.get('omdb', URL + '/other', {})
+    cache.put('omdb', URL + '/other', {}, {'a': 3})
+
+    cache.mode = 'off'
+    assert cache.get('omdb', URL, {}) is None
+
+    with pytest.raises(ValueError):
+        ResponseCache(tmp_path / 'x.sqlite', mode='sometimes')
+
+
+def test_get_json_skips_network_and_rate_limit_on_hit(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(se, '_HTTP_CACHE', _cache(tmp_path, clock))
+    bucket = MagicMock(spec=TokenBucket)
+    bucket.acquire.return_value = 0.0
+    monkeypatch.setitem(se._LIMITERS, 'tmdb', bucket)
+    response = MagicMock()
+    response.json.return_value = {'movie_results': [{'id': 7}]}
+    get = MagicMock(return_value=response)
+    monkeypatch.setattr(se.http_client, 'get', get)
+
+    assert se._call_tmdb_find('tt0089881') == 7
+    assert se._call_tmdb_find('tt0089881') == 7
+
+    assert get.call_count == 1
+    assert bucket.acquire.call_count == 1
+
+
+def test_due_cheap_tiers_refetch_despite_cached_entries(tmp_path, clock, monkeypatch):
+    cache = _cache(tmp_path, clock)
+    monkeypatch.setattr(se, '_HTTP_CACHE', cache)
+    monkeypatch.setitem(se._LIMITERS, 'omdb', TokenBucket(0))
+    monkeypatch.setitem(se._LIMITERS, 'tmdb', TokenBucket(0))
+    omdb_params = {'i': 'tt0089881', 'apikey': se.OMDB_KEY}
+    details_url = f'{se.TMDB_BASE_URL}/movie/11645'
+    details_params = {'append_to_response': 'videos,translations', 'api_key': se.TMDB_KEY}
+    cache.put('omdb', se.OMDB_BASE_URL, omdb_params, {'imdbID': 'tt0089881', 'imdbRating': '7.9'})
+    cache.put('tmdb_details', details_url, details_params, {'original_title': 'Old'})
+    clock.now += 86400   # ratings tier due again; both entries still inside their TTLs
+
+    def get(url, params, timeout):
+        response = MagicMock()
+        response.json.return_value = ({'original_title': 'Ran'} if 'movie' in url
+                                      else {'imdbID': 'tt0089881', 'imdbRating': '8.2'})
+        return response
+
+    monkeypatch.setattr(se.http_client, 'get', MagicMock(side_effect=get))
+    candidate = se._Candidate(id=1, title='Ran', lookup='Ran', year='1985',
+                              tiers=('ratings', 'metadata'), imdb_id='tt0089881', tmdb_id=11645)
+
+    result = se._lookup(candidate)
+
+    assert se.http_client.get.call_count == 2
+    assert result.fields['imdb_rating'] == 8.2
+    assert result.fields['tmdb_original_title'] == 'Ran'
+    assert cache.get('omdb', se.OMDB_BASE_URL, omdb_params)['imdbRating'] == '8.2'   # cache refreshed too
+
+
+def test_miss_retry_inside_ttl_asks_the_apis_again(tmp_path, clock, monkeypatch):
+    cache = _cache(tmp_path, clock)
+    monkeypatch.setattr(se, '_HTTP_CACHE', cache)
+    monkeypatch.setitem(se._LIMITERS, 'omdb', TokenBucket(0))
+    monkeypatch.setitem(se._LIMITERS, 'tmdb', TokenBucket(0))
+    cache.put('omdb', se.OMDB_BASE_URL, {'t': 'Ran', 'y': '1985', 'apikey': se.OMDB_KEY},
+              {'Response': 'False', 'Error': 'Movie not found!'})
+    cache.put('tmdb_search', f'{se.TMDB_BASE_URL}/search/movie',
+              {'query': 'Ran', 'year': '1985', 'api_key': se.TMDB_KEY}, {'results': []})
+    clock.now += 86400   # first back-off over; both cached misses still inside their TTLs
+    get = MagicMock()
+    get.return_value.json.return_value = {'Response': 'False', 'results': []}
+    monkeypatch.setattr(se.http_client, 'get', get)
+    candidate = se._Candidate(id=1, title='Ran', lookup='Ran', year='1985')
+
+    se._lookup(candidate)
+    assert get.call_count == 0            # a first lookup may replay the cache
+
+    se._lookup(se.replace(candidate, fresh=True))
+    assert get.call_count == 2            # a retry asks OMDb and TMDb again
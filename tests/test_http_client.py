@@ -0,0 +1,113 @@
+"""Unit tests for the shared pooled HTTP client (src/database/http_client.py),
+against a throwaway local HTTP server."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.database import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # path -> list of (status, headers) served in turn; the last one repeats.
+    script: dict = {}
+    hits: dict = {}
+    peers: set = set()
+
+    def do_GET(self):
+        _Handler.hits[self.path] = _Handler.hits.get(self.path, 0) + 1
+        _Handler.peers.add(self.client_address)
+        steps = _Handler.script.get(self.path, [(200, {})])
+        status, headers = steps[min(_Handler.hits[self.path], len(steps)) - 1]
+        body = b'{"ok": true}'
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.script, _Handler.hits, _Handler.peers = {}, {}, set()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(http_client, '_session', http_client.build_session(retries=3, backoff_s=0))
+    http_client.reset_metrics()
+    yield http_client
+    http_client.reset_metrics()
+
+
+def test_retries_5xx_then_succeeds_and_counts_retries(server, client):
+    _Handler.script['/flaky'] = [(503, {}), (502, {}), (200, {})]
+
+    resp = client.get(f'{server}/flaky', timeout=5)
+
+    assert resp.status_code == 200
+    assert _Handler.hits['/flaky'] == 3
+    metrics = client.host_metrics()[server.split('//')[1]]
+    assert metrics['requests'] == 1
+    assert metrics['retries'] == 2
+    assert metrics['errors'] == 0
+
+
+def test_gives_up_and_returns_last_response(server, client):
+    _Handler.script['/down'] = [(500, {})]
+
+    resp = client.get(f'{server}/down', timeout=5)
+
+    assert resp.status_code == 500
+    assert _Handler.hits['/down'] == 4   # 1 try + 3 retries
+    assert client.host_metrics()[server.split('//')[1]]['errors'] == 1
+
+
+def test_honours_retry_after_up_to_cap(server, client, monkeypatch):
+    monkeypatch.setattr(http_client.CappedRetry, 'max_retry_after', 0.3)
+    _Handler.script['/limited'] = [(429, {'Retry-After': '3600'}), (200, {})]
+
+    start = time.monotonic()
+    resp = client.get(f'{server}/limited', timeout=5)
+    elapsed = time.monotonic() - start
+
+    assert resp.status_code == 200
+    assert 0.3 <= elapsed < 2
+
+
+def test_does_not_retry_client_errors(server, client):
+    _Handler.script['/missing'] = [(404, {})]
+    assert client.get(f'{server}/missing', timeout=5).status_code == 404
+    assert _Handler.hits['/missing'] == 1
+
+
+def test_reuses_pooled_connections(server, client):
+    for _ in range(5):
+        client.get(f'{server}/ok', timeout=5)
+    assert len(_Handler.peers) == 1
+
+
+def test_does_not_resend_posts(server, client):
+    _Handler.script['/generate'] = [(503, {}), (200, {})]
+
+    resp = client.post(f'{server}/generate', json={'prompt': 'hi'}, timeout=5)
+
+    assert resp.status_code == 503
+    assert _Handler.hits['/generate'] == 1
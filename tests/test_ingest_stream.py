@@ -0,0 +1,80 @@
+"""Unit tests for the streaming ingest (scrapers/ingest_stream.py).
+
+Stage handlers are plain recorders, so no OpenAI, OMDb/TMDb or DB access happens.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from scrapers.ingest_stream import IngestStream
+from scrapers.items import FilmItem
+from scrapers.pipelines import CinemaScraperPipeline
+
+
+def _recorder():
+    batches = []
+    return batches, batches.append
+
+
+def test_every_stage_sees_each_movie_once():
+    embed, embed_fn = _recorder()
+    enrich, enrich_fn = _recorder()
+    stream = IngestStream({'embed': embed_fn, 'enrich': enrich_fn}, batch_size=4, max_wait_s=0.01)
+    stream.start()
+    for movie_id in [1, 2, 1, 3, 2, 4, 5]:
+        stream.publish(movie_id)
+    stream.close()
+
+    assert sorted(i for b in embed for i in b) == [1, 2, 3, 4, 5]
+    assert sorted(i for b in enrich for i in b) == [1, 2, 3, 4, 5]
+    assert all(len(b) <= 4 for b in embed)
+    assert stream.processed == {'embed': 5, 'enrich': 5}
+
+
+def test_failed_batch_does_not_stop_the_stage():
+    seen = []
+
+    def flaky(ids):
+        if 1 in ids:
+            raise RuntimeError("API down")
+        seen.extend(ids)
+
+    stream = IngestStream({'embed': flaky}, batch_size=1, max_wait_s=0.01)
+    stream.start()
+    for movie_id in [1, 2, 3]:
+        stream.publish(movie_id)
+    stream.close()
+
+    assert seen == [2, 3]
+    assert stream.failed_batches == {'embed': 1}
+
+
+def test_close_without_publish_returns():
+    batches, fn = _recorder()
+    stream = IngestStream({'embed': fn}, max_wait_s=0.01)
+    stream.start()
+    stream.close()
+    assert batches == []
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    conn = MagicMock()
+    cur = MagicMock()
+    cur.fetchone.return_value = (42,)
+    conn.cursor.return_value = cur
+    engine = MagicMock()
+    engine.raw_connection.return_value = conn
+    monkeypatch.setattr("scrapers.pipelines.get_engine", lambda: engine)
+    sink = MagicMock()
+    monkeypatch.setattr(CinemaScraperPipeline, "movie_sink", sink)
+
+    p = CinemaScraperPipeline()
+    p.open_spider(MagicMock())
+    return p, sink
+
+
+def test_pipeline_publishes_committed_movie_id(pipeline):
+    p, sink = pipeline
+    p.process_item(FilmItem('IFC CENTER', 'Stalker'), MagicMock())
+    sink.assert_called_once_with(42)
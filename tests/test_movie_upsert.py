@@ -0,0 +1,158 @@
+"""Tests for movie resolution (src/database/movie_upsert.py).
+
+The first group runs against a mock cursor. The `postgres` group runs the real
+statements against a local database named by TEST_DATABASE_URL, e.g.
+
+    docker run --rm -p 5433:5432 -e POSTGRES_PASSWORD=pg postgres:17
+    TEST_DATABASE_URL=postgresql://postgres:pg@localhost:5433/postgres pytest -m postgres
+
+and is skipped when that variable is unset or the server is unreachable. Each
+test works on a TEMP `movies` table (with the production unique index), which
+shadows any real one for that connection only and vanishes on disconnect.
+"""
+import os
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import psycopg2
+import pytest
+
+from src.database import movie_upsert
+from src.database.movie_upsert import upsert_movie, upsert_movies
+
+NOW = datetime(2026, 4, 25, tzinfo=timezone.utc)
+
+
+def _movie(title, year, **fields):
+    return {'title': title, 'year': year, 'updated_at': NOW, **fields}
+
+
+# ---------------------------------------------------------------------------
+# Mock cursor
+# ---------------------------------------------------------------------------
+
+def test_batch_is_one_on_conflict_statement(monkeypatch):
+    execute_values = MagicMock(return_value=[(1, 'stalker', 1979), (2, 'mirror', 1975)])
+    monkeypatch.setattr(movie_upsert, 'execute_values', execute_values)
+    cur = MagicMock()
+
+    ids = upsert_movies(cur, [_movie('Stalker', 1979), _movie('Mirror', '1975'), _movie(' STALKER', 1979)])
+
+    assert ids == [1, 2, 1]
+    execute_values.assert_called_once()
+    sql, rows = execute_values.call_args.args[1:3]
+    assert 'ON CONFLICT ((lower(trim(title))), year)' in sql
+    assert len(rows) == 2  # duplicate identity collapsed before the statement
+    cur.execute.assert_not_called()
+
+
+def test_null_year_uses_update_then_insert(monkeypatch):
+    execute_values = MagicMock()
+    monkeypatch.setattr(movie_upsert, 'execute_values', execute_values)
+    cur = MagicMock()
+    cur.fetchone.side_effect = [None, (7,)]
+
+    assert upsert_movie(cur, _movie('Stalker', None)) == 7
+
+    execute_values.assert_not_called()
+    update_sql, insert_sql = (c.args[0] for c in cur.execute.call_args_list)
+    assert 'year IS NULL' in update_sql
+    assert 'INSERT INTO movies' in insert_sql
+
+
+@pytest.mark.parametrize('year', ['', 'TBA', ' ', '19 79'])
+def test_malformed_year_is_written_as_null(monkeypatch, year):
+    execute_values = MagicMock()
+    monkeypatch.setattr(movie_upsert, 'execute_values', execute_values)
+    cur = MagicMock()
+    cur.fetchone.side_effect = [(7,)]
+
+    assert upsert_movie(cur, _movie('Stalker', year)) == 7
+
+    execute_values.assert_not_called()    # the null-year path, not a ValueError
+    values = cur.execute.call_args.args[1]
+    assert values[movie_upsert.MOVIE_COLUMNS.index('year')] is None
+
+
+def test_numeric_year_string_is_written_as_int(monkeypatch):
+    execute_values = MagicMock(return_value=[(1, 'stalker', 1979)])
+    monkeypatch.setattr(movie_upsert, 'execute_values', execute_values)
+
+    assert upsert_movie(MagicMock(), _movie('Stalker', ' 1979 ')) == 1
+    [row] = execute_values.call_args.args[2]
+    assert row[movie_upsert.MOVIE_COLUMNS.index('year')] == 1979
+
+
+# ---------------------------------------------------------------------------
+# Local Postgres
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def pg_cur():
+    url = os.getenv('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('TEST_DATABASE_URL not set')
+    try:
+        conn = psycopg2.connect(url, connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f'Postgres unavailable: {e}')
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TEMP TABLE movies (
+            id serial PRIMARY KEY,
+            title varchar(255) NOT NULL,
+            year integer,
+            created_at timestamp without time zone DEFAULT now() NOT NULL,
+            updated_at timestamp without time zone NOT NULL,
+            scraped_synopsis text,
+            scraped_director1 varchar(255),
+            scraped_cinema text,
+            scraped_image_url text,
+            scraped_details_link text,
+            scraped_title_normalized text
+        );
+        CREATE UNIQUE INDEX uq_idx_movies_title_year ON movies (lower(TRIM(BOTH FROM title)), year);
+    """)
+    yield cur
+    conn.rollback()
+    conn.close()
+
+
+def _count(cur):
+    cur.execute('SELECT count(*) FROM movies')
+    return cur.fetchone()[0]
+
+
+@pytest.mark.postgres
+def test_pg_second_upsert_updates_the_same_row(pg_cur):
+    first = upsert_movie(pg_cur, _movie('Stalker', 1979, scraped_synopsis='old'))
+    second = upsert_movie(pg_cur, _movie('  stalker', '1979', scraped_synopsis='new'))
+
+    assert first == second
+    assert _count(pg_cur) == 1
+    pg_cur.execute('SELECT title, scraped_synopsis FROM movies WHERE id = %s', (first,))
+    assert pg_cur.fetchone() == ('  stalker', 'new')
+
+
+@pytest.mark.postgres
+def test_pg_batch_returns_ids_in_input_order(pg_cur):
+    existing = upsert_movie(pg_cur, _movie('Mirror', 1975))
+
+    ids = upsert_movies(pg_cur, [
+        _movie('Stalker', 1979),
+        _movie('MIRROR', 1975),
+        _movie('Solaris', 1972),
+        _movie('Stalker', 1979, scraped_cinema='IFC CENTER'),
+    ])
+
+    assert ids[1] == existing
+    assert ids[0] == ids[3]
+    assert len(set(ids)) == 3
+    assert _count(pg_cur) == 3
+
+
+@pytest.mark.postgres
+def test_pg_null_year_is_not_duplicated_across_runs(pg_cur):
+    ids = [upsert_movie(pg_cur, _movie('Untitled Short Program', None)) for _ in range(3)]
+    assert len(set(ids)) == 1
+    assert _count(pg_cur) == 1
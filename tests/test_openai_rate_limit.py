@@ -0,0 +1,57 @@
+"""Unit tests for header-driven OpenAI throttling (src/database/openai_rate_limit.py)."""
+import threading
+
+import pytest
+
+from src.database.openai_rate_limit import RateLimitGate, parse_reset
+
+
+@pytest.mark.parametrize('value, seconds', [
+    ('20ms', 0.02), ('1s', 1.0), ('6m0s', 360.0), ('1h2m3.5s', 3723.5), ('2', 2.0), (None, None), ('soon', None),
+])
+def test_parse_reset(value, seconds):
+    assert parse_reset(value) == (pytest.approx(seconds) if seconds is not None else None)
+
+
+def test_unknown_budget_never_waits(clock):
+    gate = RateLimitGate(clock=clock, sleep=clock.sleep)
+    assert [gate.wait(10_000) for _ in range(5)] == [0.0] * 5
+
+
+def test_waits_for_reset_once_requests_run_out(clock):
+    gate = RateLimitGate(clock=clock, sleep=clock.sleep)
+    gate.update({'x-ratelimit-remaining-requests': '2', 'x-ratelimit-reset-requests': '3s'})
+
+    waits = [gate.wait() for _ in range(3)]
+
+    assert waits == [0.0, 0.0, pytest.approx(3.0)]
+    assert clock.now == pytest.approx(3.0)
+
+
+def test_reserves_tokens_across_callers(clock):
+    gate = RateLimitGate(clock=clock, sleep=clock.sleep)
+    gate.update({'x-ratelimit-remaining-requests': '100', 'x-ratelimit-reset-requests': '1s',
+                 'x-ratelimit-remaining-tokens': '1000', 'x-ratelimit-reset-tokens': '500ms'})
+
+    assert gate.wait(600) == 0.0
+    assert gate.wait(600) == pytest.approx(0.5)
+
+
+def test_pause_holds_every_caller(clock):
+    gate = RateLimitGate(clock=clock, sleep=clock.sleep)
+    gate.pause(2.0)
+    assert gate.wait() == pytest.approx(2.0)
+    assert gate.wait() == 0.0
+
+
+def test_concurrent_callers_do_not_overdraw():
+    gate = RateLimitGate()
+    gate.update({'x-ratelimit-remaining-requests': '5', 'x-ratelimit-reset-requests': '200ms'})
+    waits = []
+    threads = [threading.Thread(target=lambda: waits.append(gate.wait())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(1 for w in waits if w == 0.0) == 5
@@ -11,8 +11,7 @@ import pytest
 from scrapers.pipelines import CinemaScraperPipeline
 
 
-@pytest.fixture
-def pipeline(monkeypatch):
+def _pipeline(monkeypatch, **kwargs):
     """A pipeline wired to a mock connection/cursor via a patched get_engine()."""
     conn = MagicMock()
     cur = MagicMock()
@@ -21,30 +20,48 @@ def pipeline(monkeypatch):
     engine.raw_connection.return_value = conn
     monkeypatch.setattr("scrapers.pipelines.get_engine", lambda: engine)
 
-    p = CinemaScraperPipeline()
+    p = CinemaScraperPipeline(**kwargs)
     p.open_spider(MagicMock())
     return p, conn, cur
 
 
+@pytest.fixture
+def pipeline(monkeypatch):
+    return _pipeline(monkeypatch)
+
+
 def _delete_calls(cur):
     return [c for c in cur.execute.call_args_list if "DELETE FROM showtimes" in c.args[0]]
 
 
-def test_sweep_deletes_future_rows_for_written_cinemas(pipeline):
+def test_sweep_deletes_future_rows_for_written_cinemas_in_one_statement(pipeline):
     p, conn, cur = pipeline
-    p.written_cinemas = {"IFC CENTER", "METROGRAPH"}
+    p.written_cinemas = {"METROGRAPH", "IFC CENTER"}
+    cur.fetchall.return_value = [("IFC CENTER", 3)]
+
+    counts = p._sweep_stale_showtimes(MagicMock())
+
+    (delete,) = _delete_calls(cur)
+    sql, params = delete.args
+    # Every written cinema in one set-based statement, scoped to future rows
+    # untouched by this run.
+    assert "cinema = ANY(%s)" in sql
+    assert "crawled_at < %s" in sql
+    assert "show_time > now()" in sql
+    assert "showtimes_archive" not in sql
+    assert params == (["IFC CENTER", "METROGRAPH"], p.run_started_at)
+    assert counts == {"IFC CENTER": 3}
+    conn.commit.assert_called_once()
+
+
+def test_close_spider_sweeps_then_closes(pipeline):
+    p, conn, cur = pipeline
+    p.written_cinemas = {"IFC CENTER"}
+    cur.fetchall.return_value = []
 
     p.close_spider(MagicMock())
 
-    deletes = _delete_calls(cur)
-    assert len(deletes) == 2
-    swept = {c.args[1][0] for c in deletes}
-    assert swept == {"IFC CENTER", "METROGRAPH"}
-    # Every delete is scoped to future rows untouched by this run.
-    for c in deletes:
-        assert "crawled_at < %s" in c.args[0]
-        assert "show_time > now()" in c.args[0]
-        assert c.args[1][1] == p.run_started_at
+    assert len(_delete_calls(cur)) == 1
     conn.close.assert_called_once()
 
 
@@ -55,6 +72,23 @@ def test_no_sweep_for_cinema_without_successful_write(pipeline):
     assert _delete_calls(cur) == []
 
 
+def test_archive_mode_moves_rows_in_the_same_statement(monkeypatch):
+    p, conn, cur = _pipeline(monkeypatch, sweep_mode="archive")
+    p.written_cinemas = {"IFC CENTER"}
+    cur.fetchall.return_value = [("IFC CENTER", 2)]
+
+    assert p._sweep_stale_showtimes(MagicMock()) == {"IFC CENTER": 2}
+
+    (delete,) = _delete_calls(cur)
+    assert "INSERT INTO showtimes_archive" in delete.args[0]
+    conn.commit.assert_called_once()
+
+
+def test_unknown_sweep_mode_is_rejected():
+    with pytest.raises(ValueError):
+        CinemaScraperPipeline(sweep_mode="soft")
+
+
 def test_sweep_error_rolls_back_and_still_closes(pipeline):
     p, conn, cur = pipeline
     p.written_cinemas = {"IFC CENTER"}
@@ -0,0 +1,70 @@
+"""Unit tests for the HTTP record/replay middleware (scrapers/recording.py) and
+the synthetic pages the parse benchmarks run on (benchmarks/spider_pages.py).
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from benchmarks.bench_spider_parse import SYNTHETIC, SPIDERS, _response
+from scrapers.recording import HttpRecordingMiddleware, build_response, iter_recordings
+
+
+def _middleware(mode, tmp_path):
+    crawler = get_crawler(settings_dict={'HTTP_RECORDING_MODE': mode, 'HTTP_RECORDING_DIR': str(tmp_path)})
+    return HttpRecordingMiddleware.from_crawler(crawler)
+
+
+def _spider(name='metrograph'):
+    spider = MagicMock()
+    spider.name = name
+    return spider
+
+
+def test_middleware_disabled_without_mode():
+    with pytest.raises(NotConfigured):
+        HttpRecordingMiddleware.from_crawler(get_crawler())
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    spider = _spider()
+    request = Request('https://metrograph.com/film/?vista_film_id=1', meta={'title': 'Stalker', 'n': 1})
+    response = HtmlResponse(
+        url=request.url, status=200, body=b'<html><h1>Stalker</h1></html>',
+        headers={'Content-Type': 'text/html', 'Content-Encoding': 'gzip'}, request=request,
+    )
+
+    assert _middleware('record', tmp_path).process_response(request, response, spider) is response
+
+    replayed = _middleware('replay', tmp_path).process_request(request, spider)
+    assert isinstance(replayed, HtmlResponse)
+    assert replayed.body == response.body
+    assert replayed.css('h1::text').get() == 'Stalker'
+    assert b'Content-Encoding' not in replayed.headers
+
+    (record,) = iter_recordings(tmp_path, 'metrograph')
+    assert record['meta'] == {'title': 'Stalker', 'n': 1}
+    assert record['callback'] == 'parse'
+
+
+def test_replay_miss_is_ignored(tmp_path):
+    mw = _middleware('replay', tmp_path)
+    with pytest.raises(IgnoreRequest):
+        mw.process_request(Request('https://example.com/never-recorded'), _spider())
+
+
+def test_build_response_picks_text_response_for_json():
+    record = {'url': 'https://x/api', 'status': 200,
+              'headers': {'Content-Type': ['application/json']}, 'body': b'{"a": 1}'}
+    assert build_response(record).json() == {'a': 1}
+
+
+@pytest.mark.parametrize('case', sorted(SYNTHETIC))
+def test_synthetic_pages_parse(case):
+    spider_name, callback = case
+    page, meta = SYNTHETIC[case]
+    response = _response('https://bench.invalid/', page(3), meta(3), json_body=spider_name == 'angelika')
+    outputs = list(getattr(SPIDERS[spider_name](), callback)(response))
+    assert outputs
@@ -0,0 +1,137 @@
+"""Unit tests for the per-spider crawl scheduler (scrapers/scheduler.py).
+
+Drives CrawlScheduler.tick() with a fake clock and fake processes; nothing is
+spawned."""
+import argparse
+import random
+
+import pytest
+from scrapy.settings import Settings
+
+from scrapers.scheduler import CrawlScheduler, _cadences, _runner_command, parse_interval
+
+
+class FakeProcess:
+    def __init__(self):
+        self.returncode = None
+        self.terminated = False
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.terminated = True
+        self.returncode = -15
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(cadences, **kwargs):
+    clock = Clock()
+    procs = {}
+
+    def launch(name):
+        procs[name] = FakeProcess()
+        return procs[name]
+
+    s = CrawlScheduler(cadences, launch, clock=clock, rng=random.Random(0), **kwargs)
+    return s, clock, procs
+
+
+@pytest.mark.parametrize("text,seconds", [("90", 90), ("30m", 1800), ("1h", 3600), ("1.5d", 129600)])
+def test_parse_interval(text, seconds):
+    assert parse_interval(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "1w", "-5m", "0"])
+def test_parse_interval_rejects_garbage(text):
+    with pytest.raises(ValueError):
+        parse_interval(text)
+
+
+def test_each_spider_runs_on_its_own_cadence():
+    s, clock, procs = _scheduler({"angelika": 3600, "film_forum": 86400}, jitter=0.0, max_concurrent=2)
+
+    assert sorted(s.tick()) == ["angelika", "film_forum"]
+    procs["angelika"].returncode = 0
+    procs["film_forum"].returncode = 0
+
+    clock.now += 3600
+    assert s.tick() == ["angelika"]
+    procs["angelika"].returncode = 0
+
+    clock.now += 86400 - 3600
+    assert sorted(s.tick()) == ["angelika", "film_forum"]
+
+
+def test_concurrency_limit_queues_the_most_overdue_spider():
+    s, clock, procs = _scheduler({"a": 60, "b": 60, "c": 60}, jitter=0.0, max_concurrent=1)
+    s.schedules["c"].next_due = clock.now - 30  # most overdue
+
+    assert s.tick() == ["c"]
+    assert s.tick() == []  # c is still running
+    procs["c"].returncode = 0
+    assert len(s.tick()) == 1
+    assert s.schedules["c"].runs == 1
+
+
+def test_spider_is_not_started_while_its_previous_run_is_alive():
+    s, clock, procs = _scheduler({"angelika": 60}, jitter=0.0)
+    assert s.tick() == ["angelika"]
+    clock.now += 600  # overran several intervals
+    assert s.tick() == []
+    procs["angelika"].returncode = 1
+    assert s.tick() == ["angelika"]
+    assert s.schedules["angelika"].failures == 1
+
+
+def test_jitter_spreads_first_runs_and_bounds_later_ones():
+    s, clock, _ = _scheduler({name: 1000 for name in "abcdef"}, jitter=0.2, max_concurrent=6)
+    first = [sch.next_due - clock.now for sch in s.schedules.values()]
+    assert all(0 <= d < 200 for d in first)
+    assert len(set(first)) > 1
+
+    clock.now += 200
+    s.tick()
+    for sch in s.schedules.values():
+        assert 800 <= sch.next_due - clock.now <= 1200
+
+
+def test_stop_terminates_running_crawls():
+    s, _, procs = _scheduler({"angelika": 60}, jitter=0.0)
+    s.tick()
+    s.stop()
+    assert procs["angelika"].terminated
+    assert s.running() == []
+
+
+def test_runner_command_is_a_pipelined_single_spider_run():
+    args = argparse.Namespace(job_dir="data/jobs", persist_report=True, profile="polite")
+    cmd = _runner_command("angelika", args)
+    assert cmd[cmd.index("--spiders") + 1] == "angelika"
+    assert "--pipelined" in cmd
+    assert cmd[cmd.index("--job-dir") + 1].endswith("jobs/angelika")
+    assert "--persist-report" in cmd
+    assert cmd[cmd.index("--profile") + 1] == "polite"
+
+
+def test_cadences_for_selected_spiders():
+    settings = Settings({"CRAWL_SCHEDULE": {"angelika": 3600, "metrograph": 7200}})
+    args = argparse.Namespace(every=["film_forum=1d"], spiders=["angelika", "film_forum"])
+    assert _cadences(args, settings) == {"angelika": 3600.0, "film_forum": 86400.0}
+
+
+def test_spider_without_a_cadence_is_a_clear_error():
+    settings = Settings({"CRAWL_SCHEDULE": {"angelika": 3600}})
+    args = argparse.Namespace(every=[], spiders=["angelika", "nitehawk"])
+    with pytest.raises(SystemExit, match="nitehawk"):
+        _cadences(args, settings)
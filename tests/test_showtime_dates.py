@@ -0,0 +1,46 @@
+"""Unit tests for the Metrograph calendar label parser (scrapers/showtime_dates.py)."""
+from datetime import date, datetime
+
+import pytest
+
+from scrapers.showtime_dates import _parse_parts, parse_showtime
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.mark.parametrize('date_text, day_number, time_text, expected', [
+    ('Sat October', '25', '7:00pm', datetime(2026, 10, 25, 19, 0)),
+    ('Saturday October', '25', '7:00 PM', datetime(2026, 10, 25, 19, 0)),
+    ('Oct', '25', '12:15am', datetime(2026, 10, 25, 0, 15)),
+    ('October', '25', '12:30pm', datetime(2026, 10, 25, 12, 30)),
+    ('Sun Nov 2', None, '11:45 a.m.', datetime(2026, 11, 2, 11, 45)),
+    # Months before the current one belong to next year.
+    ('Fri January', '8', '9:10pm', datetime(2027, 1, 8, 21, 10)),
+])
+def test_parses_observed_formats(date_text, day_number, time_text, expected):
+    assert parse_showtime(date_text, day_number, time_text, TODAY) == expected
+
+
+@pytest.mark.parametrize('date_text, day_number, time_text', [
+    ('Sat Octember', '25', '7:00pm'),
+    ('Sat October', '25', '19:00'),
+    ('Sat October', '25', '13:00pm'),
+    ('Sat November', '31', '7:00pm'),
+    ('Sat October', None, '7:00pm'),
+    (None, '25', '7:00pm'),
+])
+def test_unparseable_labels_return_none(date_text, day_number, time_text):
+    assert parse_showtime(date_text, day_number, time_text, TODAY) is None
+
+
+def test_leap_day_resolves_against_the_target_year():
+    # strptime parses into 1900, which has no Feb 29; the target year here does.
+    assert parse_showtime('Tue February', '29', '7:00pm', date(2027, 11, 1)) == datetime(2028, 2, 29, 19, 0)
+
+
+def test_repeated_labels_hit_the_memo():
+    _parse_parts.cache_clear()
+    for _ in range(5):
+        parse_showtime('Sat October', '25', '7:00pm', TODAY)
+    info = _parse_parts.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
@@ -0,0 +1,126 @@
+"""Unit tests for the concurrent embedding sync (src/database/sync_embeddings.py).
+The OpenAI client and the session are mocked."""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import openai
+import pytest
+
+import src.database.sync_embeddings as emb
+from src.database.openai_rate_limit import RateLimitGate
+from src.database.work_priority import TimeBudget
+
+
+def _movie(i):
+    return SimpleNamespace(id=i, title=f'Film {i}', year=2000, scraped_director1=None,
+                           scraped_synopsis=f'Synopsis {i}', embedding=None,
+                           embedding_model=None, embedding_source_hash=None, embedded_at=None)
+
+
+class FakeEmbeddings:
+    """Stands in for client.embeddings.with_raw_response: sleeps, then echoes each input's id."""
+
+    def __init__(self, latency=0.05, failures=()):
+        self.latency = latency
+        self.failures = list(failures)
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.with_raw_response = self
+
+    def create(self, model, input):
+        with self._lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        data = [SimpleNamespace(embedding=[float(text.split()[2])] * emb.EMBEDDING_DIM) for text in input]
+        return SimpleNamespace(headers={'x-ratelimit-remaining-requests': '1000',
+                                        'x-ratelimit-reset-requests': '1s'},
+                               parse=lambda: SimpleNamespace(data=data))
+
+
+@pytest.fixture
+def run(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    session = MagicMock()
+    monkeypatch.setattr(emb, 'get_session', lambda: session)
+    monkeypatch.setattr(emb, '_GATE', RateLimitGate())
+
+    def run(movies, embeddings, **kwargs):
+        monkeypatch.setattr(emb, '_fetch_movies', lambda *a, **k: movies)
+        monkeypatch.setattr(emb, '_create_client', lambda: SimpleNamespace(embeddings=embeddings))
+        emb.sync_embeddings(**kwargs)
+        return session
+
+    run.session = session
+    return run
+
+
+def test_batches_run_concurrently_and_commit_in_order(run):
+    movies = [_movie(i) for i in range(1, 41)]
+    embeddings = FakeEmbeddings(latency=0.05)
+
+    session = run(movies, embeddings, batch_size=4, concurrency=5)
+
+    assert 1 < embeddings.max_in_flight <= 5
+    assert [m.embedding[0] for m in movies] == [float(m.id) for m in movies]
+    assert all(m.embedding_source_hash and m.embedding_model == emb.EMBEDDING_MODEL for m in movies)
+    assert session.commit.call_count == 10
+
+
+def test_concurrency_one_is_sequential(run):
+    embeddings = FakeEmbeddings(latency=0)
+    run([_movie(i) for i in range(1, 6)], embeddings, batch_size=2, concurrency=1)
+    assert embeddings.max_in_flight == 1
+
+
+def test_rate_limited_batch_waits_and_retries(run):
+    response = httpx.Response(429, headers={'retry-after-ms': '50'},
+                              request=httpx.Request('POST', 'https://api.openai.com/v1/embeddings'))
+    embeddings = FakeEmbeddings(latency=0, failures=[openai.RateLimitError('slow down', response=response, body=None)])
+    movies = [_movie(i) for i in range(1, 3)]
+
+    start = time.monotonic()
+    run(movies, embeddings, batch_size=2, concurrency=2)
+
+    assert time.monotonic() - start >= 0.05
+    assert all(m.embedding is not None for m in movies)
+
+
+def test_api_failure_rolls_back_and_raises(run):
+    embeddings = FakeEmbeddings(latency=0, failures=[RuntimeError('boom')])
+    with pytest.raises(RuntimeError):
+        run([_movie(1)], embeddings)
+    run.session.rollback.assert_called_once()
+    run.session.commit.assert_not_called()
+
+
+def test_calls_share_the_process_gate(run, monkeypatch):
+    seen = []
+    generate = emb._generate_embeddings
+    monkeypatch.setattr(emb, '_generate_embeddings',
+                        lambda client, payloads, gate: seen.append(gate) or generate(client, payloads, gate))
+
+    run([_movie(1)], FakeEmbeddings(latency=0))
+    run([_movie(2)], FakeEmbeddings(latency=0))
+
+    assert seen == [emb._GATE, emb._GATE]
+
+
+def test_shared_budget_caps_later_calls(run, clock):
+    budget = TimeBudget(10, clock=clock)
+    embeddings = FakeEmbeddings(latency=0)
+    first, second = [_movie(1)], [_movie(2)]
+
+    run(first, embeddings, budget=budget)
+    clock.now = 11
+    run(second, embeddings, budget=budget)
+
+    assert first[0].embedding is not None and second[0].embedding is None
+    assert budget.cut == 1
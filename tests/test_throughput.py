@@ -0,0 +1,71 @@
+"""Unit tests for throughput profiles (scrapers/throughput.py)."""
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy import Request
+from scrapy.settings import Settings
+
+from scrapers import settings as project_settings
+from scrapers.throughput import (
+    PROFILES, BudgetedRetryMiddleware, ThroughputProfile, profile_settings,
+)
+
+
+def _settings(**overrides):
+    s = Settings()
+    s.setmodule(project_settings, priority='project')
+    s.setdict(overrides, priority='project')
+    return s
+
+
+def test_profile_merges_spider_overrides_over_base():
+    merged = profile_settings('default', 'metrograph')
+    assert merged['CONCURRENT_REQUESTS_PER_DOMAIN'] == 1
+    assert merged['DOWNLOAD_DELAY'] == 1.0
+    assert merged['RETRY_BUDGET'] == PROFILES['default']['settings']['RETRY_BUDGET']
+    assert profile_settings('default', 'film_forum') == PROFILES['default']['settings']
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        profile_settings('reckless', 'metrograph')
+
+
+@pytest.mark.parametrize('profile', list(PROFILES))
+def test_every_profile_sets_every_key(profile):
+    assert set(PROFILES[profile]['settings']) == set(PROFILES['default']['settings'])
+
+
+def test_addon_wins_over_spider_custom_settings_and_swaps_retry_middleware():
+    s = _settings(THROUGHPUT_PROFILE='polite')
+    # As a spider's custom_settings would, including a replaced middleware dict.
+    s.setdict({
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 8,
+        'DOWNLOADER_MIDDLEWARES': {'scrapers.recording.HttpRecordingMiddleware': 50},
+    }, priority='spider')
+
+    ThroughputProfile('angelika').update_settings(s)
+
+    assert s.getint('CONCURRENT_REQUESTS_PER_DOMAIN') == 1
+    assert s.getbool('AUTOTHROTTLE_ENABLED')
+    middlewares = s.getdict('DOWNLOADER_MIDDLEWARES')
+    assert middlewares['scrapy.downloadermiddlewares.retry.RetryMiddleware'] is None
+    assert middlewares['scrapers.throughput.BudgetedRetryMiddleware'] == 550
+    assert middlewares['scrapers.recording.HttpRecordingMiddleware'] == 50
+
+
+def test_addon_without_profile_changes_nothing():
+    s = _settings(THROUGHPUT_PROFILE=None)
+    ThroughputProfile('angelika').update_settings(s)
+    assert 'scrapers.throughput.BudgetedRetryMiddleware' not in s.getdict('DOWNLOADER_MIDDLEWARES')
+
+
+def test_retry_budget_caps_retries_across_requests():
+    stats = MagicMock()
+    mw = BudgetedRetryMiddleware(_settings(RETRY_TIMES=5, RETRY_BUDGET=2), stats)
+    spider = MagicMock()
+
+    retries = [mw._retry(Request(f'https://x/{i}'), 'timeout', spider) for i in range(4)]
+
+    assert [r is not None for r in retries] == [True, True, False, False]
+    stats.inc_value.assert_any_call('retry/budget_exhausted', spider=spider)
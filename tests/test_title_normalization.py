@@ -0,0 +1,48 @@
+"""Unit tests for the memoized normalization API in src/database/title_normalization.py."""
+import pytest
+
+from src.database.title_normalization import (
+    TitleForms,
+    _api_lookup_title,
+    _normalize_for_matching,
+    _strip_display_suffix,
+    clear_normalization_caches,
+    normalization_cache_info,
+    normalize_title,
+)
+
+
+@pytest.mark.parametrize('raw, cinema, expected', [
+    ('Vertigo\xa0 [35mm]', 'IFC CENTER', TitleForms('Vertigo [35mm]', 'Vertigo', 'Vertigo', 'vertigo')),
+    ('Criterion selects Ran in 35mm', 'METROGRAPH', TitleForms(
+        'Criterion selects Ran in 35mm', 'Criterion selects Ran', 'Ran', 'criterion selects ran')),
+    ("Spike Lee's CROOKLYN (Open Captioning)", 'FILM FORUM', TitleForms(
+        "Spike Lee's CROOKLYN (Open Captioning)", "Spike Lee's CROOKLYN", 'CROOKLYN', "spike lee's crooklyn")),
+    ('ﬁlm noir', '', TitleForms('film noir', 'film noir', 'film noir', 'film noir')),
+    (None, 'METROGRAPH', TitleForms('', '', '', '')),
+])
+def test_normalize_title_returns_every_form(raw, cinema, expected):
+    assert normalize_title(raw, cinema) == expected
+
+
+@pytest.mark.parametrize('raw', [
+    'Shorts [DCP] in 70mm', 'Ran (Open Captioning) [35mm]', 'Metrograph presents: Ran preceded by Meshes',
+])
+@pytest.mark.parametrize('cinema', ['', 'TEST_METROGRAPH', 'FILM FORUM'])
+def test_normalize_title_agrees_with_single_form_helpers(raw, cinema):
+    forms = normalize_title(raw, cinema)
+    assert forms.display == _strip_display_suffix(raw)
+    assert forms.api_lookup == _api_lookup_title(forms.display, cinema)
+    assert forms.matching == _normalize_for_matching(raw)
+
+
+def test_cache_is_keyed_on_cinema_rule_set_not_name():
+    clear_normalization_caches()
+    normalize_title('Ran', 'METROGRAPH')
+    normalize_title('Ran', 'TEST_METROGRAPH')
+    normalize_title('Ran', 'IFC CENTER')
+    normalize_title('Ran', 'ANGELIKA NEW YORK')
+
+    info = normalization_cache_info()['normalize_title']
+    assert (info['misses'], info['hits']) == (2, 2)
+    assert info['maxsize'] is not None
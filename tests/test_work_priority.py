@@ -0,0 +1,52 @@
+"""Unit tests for the shared work ordering and time budget (src/database/work_priority.py)."""
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import Movie
+from src.database.work_priority import TimeBudget, by_priority
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_orders_by_next_showtime_then_coverage_then_tiebreakers():
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    sql = _sql(by_priority(select(Movie), now, Movie.enriched_at.asc().nulls_first()))
+
+    assert 'LEFT OUTER JOIN' in sql
+    assert 'showtimes.show_time > %(show_time_1)s' in sql
+    order_by = sql.split('ORDER BY')[1]
+    assert order_by.index('upcoming.next_show_time ASC NULLS LAST') \
+        < order_by.index('upcoming.cinema_count DESC NULLS LAST') \
+        < order_by.index('movies.enriched_at ASC NULLS FIRST') \
+        < order_by.index('movies.id')
+
+
+def test_keeps_existing_filters():
+    stmt = by_priority(select(Movie).where(Movie.embedding.is_(None)))
+    assert 'movies.embedding IS NULL' in _sql(stmt)
+
+
+def test_budget_stops_taking_once_spent_and_counts_the_rest(clock):
+    budget = TimeBudget(10, clock=clock)
+    taken = []
+    for item in budget.take(range(6)):
+        taken.append(item)
+        clock.now += 4
+
+    assert taken == [0, 1, 2]
+    assert budget.cut == 3
+    assert budget.exhausted()
+
+
+def test_no_budget_means_unlimited(clock):
+    for seconds in (None, 0):
+        clock.now = 0.0
+        budget = TimeBudget(seconds, clock=clock)
+        clock.now = 1e9
+        assert list(budget.take(range(4))) == [0, 1, 2, 3]
+        assert budget.cut == 0
+        assert not budget.exhausted()